@@ -0,0 +1,44 @@
+"""Compares the JSON backends on a deck of realistic size.
+
+The deck has 200 slides, each with three charts of 20 series by 12
+categories and a text field. Run with `python benchmarks/bench_backends.py`.
+"""
+
+import timeit
+
+import numpy as np
+
+from thinkcell import Thinkcell
+from thinkcell.backends import available_backends
+
+TEMPLATE = "template.pptx"
+
+
+def build(backend, slides=200, series=20, categories=12):
+    rng = np.random.default_rng(0)
+    tc = Thinkcell(backend=backend)
+    for slide in range(slides):
+        tc.add_template(TEMPLATE)
+        tc.add_textfield(TEMPLATE, "Title", f"Slide {slide}")
+        for chart in range(3):
+            values = rng.random((series, categories)).round(2).tolist()
+            tc.add_chart(
+                TEMPLATE,
+                f"Chart{chart}",
+                [f"Category {i}" for i in range(categories)],
+                [[f"Series {i}"] + row for i, row in enumerate(values)],
+            )
+    return tc
+
+
+def main():
+    print(f"{'backend':>8} {'to_bytes (ms)':>14} {'size (kB)':>10}")
+    for backend in available_backends():
+        tc = build(backend)
+        seconds = min(timeit.repeat(tc.to_bytes, number=5, repeat=3)) / 5
+        size = len(tc.to_bytes()) / 1000
+        print(f"{backend:>8} {seconds * 1000:>14.1f} {size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
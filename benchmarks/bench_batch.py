@@ -0,0 +1,65 @@
+"""Measures the throughput of `thinkcell.batch.generate` per worker count.
+
+Run with `python benchmarks/bench_batch.py`.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from thinkcell.batch import generate
+
+TEMPLATE = "template.pptx"
+
+
+def make_jobs(directory, clients, slides=10):
+    rng = np.random.default_rng(0)
+    columns = ["Company"] + [f"Year {i}" for i in range(12)]
+    jobs = []
+    for client in range(clients):
+        dataframe = pd.DataFrame(rng.random((20, 12)), columns=columns[1:])
+        dataframe.insert(0, "Company", [f"Company {i}" for i in range(20)])
+        jobs.append(
+            {
+                "filename": os.path.join(directory, f"client-{client}.ppttc"),
+                "templates": [
+                    {
+                        "template": TEMPLATE,
+                        "charts": [
+                            {"chart_name": f"Chart{i}", "dataframe": dataframe}
+                            for i in range(3)
+                        ],
+                        "textfields": [
+                            {"field_name": "Title", "text": f"Client {client}"}
+                        ],
+                    }
+                    for _ in range(slides)
+                ],
+            }
+        )
+    return jobs
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = make_jobs(directory, 200)
+        print(f"{'workers':>8} {'decks/s':>10} {'scaling':>8}")
+        baseline = None
+        for count in workers:
+            start = time.perf_counter()
+            results = generate(jobs, workers=count)
+            throughput = len(jobs) / (time.perf_counter() - start)
+            assert all(result.ok for result in results)
+            baseline = baseline or throughput
+            print(
+                f"{count:>8} {throughput:>10.1f} {throughput / baseline:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compares `add_chart_from_dataframe` with the former `values.tolist()` path.
+
+The former path converted every cell with `Thinkcell.transform_input` into
+the dictionaries written to the file, as `add_chart` did before the charts
+were kept as tables. Run with `python benchmarks/bench_dataframe.py`.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from thinkcell import Thinkcell
+
+TEMPLATE = "template.pptx"
+
+
+def make_dataframe(rows, columns):
+    rng = np.random.default_rng(0)
+    data = {"Series": [f"Series {i}" for i in range(rows)]}
+    for j in range(columns):
+        if j % 3 == 0:
+            data[f"int {j}"] = rng.integers(0, 1000, rows)
+        elif j % 3 == 1:
+            data[f"float {j}"] = rng.random(rows)
+        else:
+            data[f"date {j}"] = pd.date_range("2000-01-01", periods=rows)
+    return pd.DataFrame(data)
+
+
+def tolist_path(dataframe):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    table = [[None] + [tc.transform_input(c) for c in dataframe.columns[1:]]]
+    table.append([])
+    for row in dataframe.values.tolist():
+        table.append([tc.transform_input(element) for element in row])
+    return {"name": "Chart", "table": table}
+
+
+def column_path(dataframe):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    tc.add_chart_from_dataframe(TEMPLATE, "Chart", dataframe)
+
+
+def main():
+    print(
+        f"{'cells':>10} {'tolist (ms)':>12} {'columns (ms)':>13} {'speedup':>8}"
+    )
+    for rows, columns in [
+        (3, 3),
+        (5, 19),
+        (10, 10),
+        (20, 20),
+        (100, 30),
+        (1000, 100),
+        (5000, 100),
+    ]:
+        dataframe = make_dataframe(rows, columns)
+        number = max(1, 20000 // (rows * columns))
+        before = min(
+            timeit.repeat(
+                lambda: tolist_path(dataframe), number=number, repeat=3
+            )
+        )
+        after = min(
+            timeit.repeat(
+                lambda: column_path(dataframe), number=number, repeat=3
+            )
+        )
+        print(
+            f"{rows * columns:>10} {before / number * 1000:>12.2f} "
+            f"{after / number * 1000:>13.2f} {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Compares reading charts from files with the pandas round trip.
+
+`add_chart_from_csv` is compared with `pandas.read_csv` followed by
+`add_chart_from_dataframe`, and, when `pyarrow` is installed,
+`add_chart_from_parquet` with `pandas.read_parquet`. Every path reads the
+file and builds the chart, and reports its best time, and the growth of
+the peak resident memory of a new process that only runs that path once,
+so that the memory allocated by pandas and Arrow outside of Python is
+counted too. The charts are encoded in the same way afterwards, so
+encoding is left out. Run with `python benchmarks/bench_files.py`.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from thinkcell import Thinkcell
+
+TEMPLATE = "template.pptx"
+
+
+def make_dataframe(rows, columns):
+    rng = np.random.default_rng(0)
+    data = {"Series": [f"Series {i}" for i in range(rows)]}
+    for j in range(columns):
+        if j % 3 == 0:
+            data[f"int {j}"] = rng.integers(0, 100000, rows)
+        elif j % 3 == 1:
+            data[f"float {j}"] = rng.random(rows).round(4)
+        else:
+            data[f"date {j}"] = pd.date_range("2000-01-01", periods=rows)
+    return pd.DataFrame(data)
+
+
+def csv_path(filename):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    tc.add_chart_from_csv(TEMPLATE, "Chart", filename)
+    return tc
+
+
+def pandas_csv_path(filename):
+    dataframe = pd.read_csv(filename)
+    dates = [column for column in dataframe if column.startswith("date")]
+    dataframe[dates] = dataframe[dates].apply(pd.to_datetime)
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    tc.add_chart_from_dataframe(TEMPLATE, "Chart", dataframe)
+    return tc
+
+
+def parquet_path(filename):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    tc.add_chart_from_parquet(TEMPLATE, "Chart", filename)
+    return tc
+
+
+def pandas_parquet_path(filename):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    tc.add_chart_from_dataframe(TEMPLATE, "Chart", pd.read_parquet(filename))
+    return tc
+
+
+def peak_memory(path, filename):
+    """Runs `path` once in this process, returns the growth of its peak."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        pass
+
+    before = max_rss()
+    path(filename)
+    return max_rss() - before
+
+
+def max_rss():
+    """Returns the peak resident memory of this process, in bytes."""
+    # On Linux, ru_maxrss keeps the peak of the parent across fork and exec,
+    # while VmHWM starts again with the new process.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path, filename):
+    seconds = min(timeit.repeat(lambda: path(filename), number=1, repeat=3))
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import bench_files; "
+        "print(bench_files.peak_memory("
+        "getattr(bench_files, sys.argv[2]), sys.argv[3]))"
+    )
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            code,
+            os.path.dirname(os.path.abspath(__file__)),
+            path.__name__,
+            filename,
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.getcwd()),
+    ).stdout
+    return seconds, int(output)
+
+
+def main():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pyarrow = None
+        print("pyarrow is not installed, skipping the Parquet paths.")
+
+    print(
+        f"{'rows':>8} {'MB':>6} {'path':>16} {'time (ms)':>10} "
+        f"{'peak (MB)':>10}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for rows, columns in [(20000, 30), (100000, 30)]:
+            dataframe = make_dataframe(rows, columns)
+            paths = [
+                ("csv", ".csv", csv_path),
+                ("pandas csv", ".csv", pandas_csv_path),
+            ]
+            csv_file = os.path.join(directory, f"{rows}.csv")
+            dataframe.to_csv(csv_file, index=False)
+            if pyarrow is not None:
+                dataframe.to_parquet(
+                    os.path.join(directory, f"{rows}.parquet")
+                )
+                paths += [
+                    ("parquet", ".parquet", parquet_path),
+                    ("pandas parquet", ".parquet", pandas_parquet_path),
+                ]
+
+            for name, extension, path in paths:
+                filename = os.path.join(directory, f"{rows}{extension}")
+                size = os.path.getsize(filename) / 1e6
+                seconds, peak = measure(path, filename)
+                print(
+                    f"{rows:>8} {size:>6.1f} {name:>16} "
+                    f"{seconds * 1000:>10.1f} {peak / 1e6:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
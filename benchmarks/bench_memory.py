@@ -0,0 +1,70 @@
+"""Measures the memory used per cell by the tables of a Thinkcell object.
+
+The compact tables stored by `Thinkcell` are compared with the expanded
+`charts` view, which is how the data used to be stored. Run with
+`python benchmarks/bench_memory.py`.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from thinkcell import Thinkcell
+
+TEMPLATE = "template.pptx"
+
+
+def make_data(rows, columns):
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 100000, (rows, columns)).tolist()
+    return [[f"Series {i}"] + row for i, row in enumerate(values)]
+
+
+def traced(function):
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def build_from_rows(data):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    fill = ["#70AD47" for _ in data]
+    tc.add_chart(TEMPLATE, "Chart", list(range(len(data[0]) - 1)), data, fill)
+    return tc
+
+
+def build_from_dataframe(dataframe):
+    tc = Thinkcell()
+    tc.add_template(TEMPLATE)
+    fill = ["#70AD47" for _ in dataframe.index]
+    tc.add_chart_from_dataframe(TEMPLATE, "Chart", dataframe, fill)
+    return tc
+
+
+def main():
+    print(
+        f"{'source':>10} {'cells':>8} {'expanded (B/cell)':>18} "
+        f"{'compact (B/cell)':>17}"
+    )
+    for rows, columns in [(100, 100), (1000, 100)]:
+        cells = rows * (columns + 1)
+        data = make_data(rows, columns)
+        dataframe = pd.DataFrame(data)
+        for source, build in [
+            ("rows", lambda: build_from_rows(data)),
+            ("dataframe", lambda: build_from_dataframe(dataframe)),
+        ]:
+            tc, compact = traced(build)
+            _, expanded = traced(lambda: tc.charts)
+            print(
+                f"{source:>10} {cells:>8} {expanded / cells:>18.1f} "
+                f"{compact / cells:>17.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Load test of the rendering server.
+
+Starts `python -m thinkcell serve` in a subprocess, then sends decks from
+several client threads, each keeping its connection open, and reports the
+requests per second and the 50th and 99th percentile latencies of
+`/render`, which builds every deck, and of `/layouts/<name>/render`, which
+renders a compiled layout. For comparison, it also times running a Python
+process per deck, which pays the start-up and imports every time. Run with
+`python benchmarks/bench_server.py`.
+"""
+
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SLIDES = 4
+CHARTS = 3
+REQUESTS = 200
+CLIENTS = [1, 4, 16]
+
+
+def make_deck(number):
+    categories = [f"Category {j}" for j in range(12)]
+    templates = []
+    for slide in range(SLIDES):
+        charts = [
+            {
+                "chart_name": f"Chart {chart}",
+                "categories": categories,
+                "data": [
+                    [f"Series {i}"]
+                    + [
+                        (number + slide * i + chart * j) % 97
+                        for j in range(12)
+                    ]
+                    for i in range(10)
+                ],
+            }
+            for chart in range(CHARTS)
+        ]
+        templates.append(
+            {
+                "template": f"template {slide}.pptx",
+                "charts": charts,
+                "textfields": [
+                    {"field_name": "Title", "text": f"Client {number}"}
+                ],
+            }
+        )
+    return {"templates": templates}
+
+
+def make_data(number):
+    deck = make_deck(number)
+    return {
+        "data": [
+            [slide, chart["chart_name"], [row[1:] for row in chart["data"]]]
+            for slide, page in enumerate(deck["templates"])
+            for chart in page["charts"]
+        ]
+        + [
+            [slide, "Title", f"Client {number}"]
+            for slide in range(len(deck["templates"]))
+        ]
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port):
+    for _ in range(100):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            connection.request("GET", "/health")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("The server did not start.")
+
+
+def client(port, path, bodies):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    latencies = []
+    for body in bodies:
+        start = time.perf_counter()
+        connection.request("POST", path, body=body)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200, response.status
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    return latencies
+
+
+def load(port, path, bodies, clients):
+    per_client = [bodies[i::clients] for i in range(clients)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(
+            executor.map(
+                client, [port] * clients, [path] * clients, per_client
+            )
+        )
+    seconds = time.perf_counter() - start
+    latencies = sorted(latency for result in results for latency in result)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / seconds, statistics.median(latencies), p99
+
+
+def per_process(count):
+    code = (
+        "import json, sys; from thinkcell.batch import build; "
+        "build(json.load(sys.stdin)).to_bytes()"
+    )
+    deck = json.dumps(make_deck(0)).encode()
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run([sys.executable, "-c", code], input=deck, check=True)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "thinkcell",
+            "serve",
+            "-q",
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+        env=dict(os.environ, PYTHONPATH=os.getcwd()),
+    )
+    try:
+        wait_for(port)
+        decks = [json.dumps(make_deck(i)).encode() for i in range(REQUESTS)]
+        data = [json.dumps(make_data(i)).encode() for i in range(REQUESTS)]
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("PUT", "/layouts/client", body=decks[0])
+        connection.getresponse().read()
+
+        print(
+            f"{'endpoint':>24} {'clients':>8} {'req/s':>8} "
+            f"{'p50 (ms)':>9} {'p99 (ms)':>9}"
+        )
+        for path, bodies in [
+            ("/render", decks),
+            ("/layouts/client/render", data),
+        ]:
+            for clients in CLIENTS:
+                rate, p50, p99 = load(port, path, bodies, clients)
+                print(
+                    f"{path:>24} {clients:>8} {rate:>8.0f} "
+                    f"{p50 * 1000:>9.2f} {p99 * 1000:>9.2f}"
+                )
+    finally:
+        server.terminate()
+        server.wait()
+    print(f"{'one process per deck':>24} {1:>8} {per_process(10):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measures how building a deck with `SlideBuilder` scales with threads.
+
+Every slide fetches the data of its charts from a simulated service, which
+waits `latency` seconds per chart, and adds the charts to its builder. The
+deck is built with 1 to 16 threads, and checked to be identical to the one
+built by a single thread. With no latency the work is only the conversion
+of the data, which holds the GIL, so the threads do not make it faster. Run
+with `python benchmarks/bench_threads.py`.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from thinkcell import Thinkcell
+
+TEMPLATE = "template.pptx"
+SLIDES = 64
+CHARTS = 5
+
+
+def fetch(slide, chart, latency):
+    time.sleep(latency)
+    categories = [f"Category {j}" for j in range(12)]
+    data = [
+        [f"Series {i}"] + [slide * i + chart * j for j in range(12)]
+        for i in range(20)
+    ]
+    return categories, data
+
+
+def fill_slide(builder, slide, latency):
+    for chart in range(CHARTS):
+        categories, data = fetch(slide, chart, latency)
+        builder.add_chart(f"Chart {chart}", categories, data)
+    builder.add_textfield("Title", f"Slide {slide}")
+
+
+def build(workers, latency):
+    tc = Thinkcell()
+    builders = [tc.add_slide(TEMPLATE) for _ in range(SLIDES)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(
+            executor.map(
+                fill_slide, builders, range(SLIDES), [latency] * SLIDES
+            )
+        )
+    return tc.to_bytes()
+
+
+def main():
+    print(
+        f"{'latency (ms)':>12} {'threads':>8} {'slides/s':>10} {'speedup':>8}"
+    )
+    for latency in [0.0, 0.005]:
+        expected = build(1, latency)
+        baseline = None
+        for workers in [1, 2, 4, 8, 16]:
+            start = time.perf_counter()
+            deck = build(workers, latency)
+            seconds = time.perf_counter() - start
+            assert deck == expected, "the deck depends on the threads"
+            baseline = baseline or seconds
+            print(
+                f"{latency * 1000:>12.0f} {workers:>8} "
+                f"{SLIDES / seconds:>10.1f} {baseline / seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""Benchmark suite for every public entry point of `Thinkcell`.
+
+Every case is run on synthetic data over a grid of sizes (rows, columns,
+charts, repeated templates) and data types, and reports its best time and
+its peak memory. Reports can be saved and compared with a baseline:
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --baseline baseline.json
+
+The comparison exits with status 1 when a case is slower, or uses more
+memory, than the baseline by more than the tolerance. Use `--quick` for a
+smaller grid and `-k` to select cases by name.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from thinkcell import Thinkcell
+from thinkcell.fills import FillRules
+
+TEMPLATE = "template.pptx"
+DTYPES = ["int", "float", "str", "datetime", "mixed"]
+WORKDIR = tempfile.gettempdir()
+
+
+def make_value(dtype, i, j):
+    if dtype == "int":
+        return (i * 31 + j * 17) % 1000
+    if dtype == "float":
+        return (i * 31 + j * 17) % 1000 / 7
+    if dtype == "str":
+        return f"cell {i} {j}"
+    return datetime(2000, 1, 1) + timedelta(days=i + j)
+
+
+def make_rows(rows, columns, dtype):
+    """Returns the categories and rows of a chart for `add_chart`.
+
+    With the "mixed" dtype, the columns cycle through the other dtypes.
+    """
+    kinds = [
+        DTYPES[j % 4] if dtype == "mixed" else dtype for j in range(columns)
+    ]
+    categories = [f"Category {j}" for j in range(columns)]
+    data = [
+        [f"Series {i}"]
+        + [make_value(kind, i, j) for j, kind in enumerate(kinds)]
+        for i in range(rows)
+    ]
+    return categories, data
+
+
+def make_dataframe(rows, columns, dtype):
+    """Returns a DataFrame for `add_chart_from_dataframe`."""
+    categories, data = make_rows(rows, columns, dtype)
+    return pd.DataFrame(data, columns=["Series"] + categories)
+
+
+def make_array(rows, columns, dtype):
+    """Returns the categories and data of `make_rows` as NumPy arrays.
+
+    The series are numbered rather than named, so that the array keeps the
+    dtype of its cells.
+    """
+    categories, data = make_rows(rows, columns, dtype)
+    data = [
+        [str(i) if dtype == "str" else i] + row[1:]
+        for i, row in enumerate(data)
+    ]
+    return np.array(categories), np.array(data)
+
+
+def make_deck(templates, charts, rows, columns, dtype, **kwargs):
+    """Returns a Thinkcell object with `charts` charts per template."""
+    categories, data = make_rows(rows, columns, dtype)
+    tc = Thinkcell(**kwargs)
+    for _ in range(templates):
+        template = tc.add_template(TEMPLATE)
+        tc.add_textfield(template, "Title", "A great slide")
+        for chart in range(charts):
+            tc.add_chart(template, f"Chart{chart}", categories, data)
+    return tc
+
+
+def case_transform_input(rows, columns, dtype):
+    _, data = make_rows(rows, columns, dtype)
+    cells = [cell for row in data for cell in row]
+
+    def run():
+        for cell in cells:
+            Thinkcell.transform_input(cell)
+
+    return run
+
+
+def case_verify_template(templates):
+    names = [f"template {i}.pptx" for i in range(templates)]
+
+    def run():
+        for name in names:
+            Thinkcell.verify_template(name)
+
+    return run
+
+
+def case_add_template(templates):
+    def run():
+        tc = Thinkcell()
+        for _ in range(templates):
+            tc.add_template(TEMPLATE)
+
+    return run
+
+
+def case_add_chart(rows, columns, dtype):
+    categories, data = make_rows(rows, columns, dtype)
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart(TEMPLATE, "Chart", categories, data)
+
+    return run
+
+
+def case_add_chart_array(rows, columns, dtype):
+    categories, data = make_array(rows, columns, dtype)
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart(TEMPLATE, "Chart", categories, data)
+
+    return run
+
+
+def case_add_chart_fill_rules(rows, columns, dtype):
+    categories, data = make_rows(rows, columns, dtype)
+    rules = FillRules().below(100, "#C00000").top(0.1, "#00B050")
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart(TEMPLATE, "Chart", categories, data, fill=rules)
+        return tc.to_bytes()
+
+    return run
+
+
+def case_add_chart_from_dataframe(rows, columns, dtype):
+    dataframe = make_dataframe(rows, columns, dtype)
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart_from_dataframe(TEMPLATE, "Chart", dataframe)
+
+    return run
+
+
+def case_add_chart_from_sparse_dataframe(rows, columns, dtype):
+    dataframe = make_dataframe(rows, columns, dtype)
+    numbers = dataframe.columns[1:]
+    dataframe[numbers] = dataframe[numbers].mask(
+        (dataframe[numbers] % 5 < 2).to_numpy()
+    )
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart_from_dataframe(TEMPLATE, "Chart", dataframe)
+        return tc.to_bytes()
+
+    return run
+
+
+def case_add_chart_from_long_dataframe(rows, columns, dtype):
+    wide = make_dataframe(rows, columns, dtype)
+    dataframe = wide.melt(id_vars="Series", var_name="Category")
+
+    def run():
+        tc = Thinkcell()
+        tc.add_template(TEMPLATE)
+        tc.add_chart_from_long_dataframe(
+            TEMPLATE,
+            "Chart",
+            dataframe,
+            series="Series",
+            category="Category",
+            value="value",
+        )
+        return tc.to_bytes()
+
+    return run
+
+
+def case_add_textfield(templates):
+    def run():
+        tc = Thinkcell()
+        for _ in range(templates):
+            template = tc.add_template(TEMPLATE)
+            tc.add_textfield(template, "Title", "A great slide")
+
+    return run
+
+
+def case_build_deck(templates, charts, rows, columns, dtype):
+    return lambda: make_deck(templates, charts, rows, columns, dtype)
+
+
+def case_charts(templates, charts, rows, columns, dtype):
+    tc = make_deck(templates, charts, rows, columns, dtype)
+    return lambda: tc.charts
+
+
+def case_to_bytes(templates, charts, rows, columns, dtype):
+    tc = make_deck(templates, charts, rows, columns, dtype)
+    return tc.to_bytes
+
+
+def case_save_ppttc(templates, charts, rows, columns, dtype):
+    tc = make_deck(templates, charts, rows, columns, dtype)
+    filename = os.path.join(WORKDIR, "deck.ppttc")
+    return lambda: tc.save_ppttc(filename)
+
+
+def case_open_stream(templates, charts, rows, columns, dtype):
+    categories, data = make_rows(rows, columns, dtype)
+    filename = os.path.join(WORKDIR, "stream.ppttc")
+
+    def run():
+        with Thinkcell.open_stream(filename) as tc:
+            for _ in range(templates):
+                tc.add_template(TEMPLATE)
+                for chart in range(charts):
+                    tc.add_chart(TEMPLATE, f"Chart{chart}", categories, data)
+
+    return run
+
+
+def case_replace_chart(templates, charts, rows, columns, dtype):
+    tc = make_deck(templates, charts, rows, columns, dtype)
+    categories, data = make_rows(rows, columns, dtype)
+
+    def run():
+        tc.replace_chart(TEMPLATE, "Chart0", categories, data)
+
+    return run
+
+
+def case_render_skeleton(templates, charts, rows, columns, dtype):
+    skeleton = make_deck(templates, charts, rows, columns, dtype).compile()
+    _, data = make_rows(rows, columns, dtype)
+    values = [row[1:] for row in data]
+    data_by_chart = {
+        (slide, f"Chart{chart}"): values
+        for slide in range(templates)
+        for chart in range(charts)
+    }
+    return lambda: skeleton.render(data_by_chart)
+
+
+def grid(quick):
+    """Yields the name, parameters and setup of every case."""
+    rows = [10, 100] if quick else [10, 100, 1000]
+    columns = [10] if quick else [10, 50]
+    templates = [1, 10] if quick else [1, 10, 100]
+    charts = [1, 5] if quick else [1, 5, 20]
+    dtypes = ["float", "datetime"] if quick else DTYPES
+
+    for r, c, dtype in itertools.product(rows, columns, dtypes):
+        params = {"rows": r, "columns": c, "dtype": dtype}
+        yield "transform_input", params, case_transform_input
+        yield "add_chart", params, case_add_chart
+        if dtype in ("int", "float"):
+            yield "add_chart_fill_rules", params, case_add_chart_fill_rules
+        yield "add_chart_from_dataframe", params, case_add_chart_from_dataframe
+        if dtype in ("int", "float", "str"):
+            yield "add_chart_array", params, case_add_chart_array
+        if dtype == "float":
+            yield "add_chart_from_sparse_dataframe", params, (
+                case_add_chart_from_sparse_dataframe
+            )
+            yield "add_chart_from_long_dataframe", params, (
+                case_add_chart_from_long_dataframe
+            )
+
+    for t in templates:
+        params = {"templates": t}
+        yield "verify_template", params, case_verify_template
+        yield "add_template", params, case_add_template
+        yield "add_textfield", params, case_add_textfield
+
+    deck_cases = [
+        ("build_deck", case_build_deck),
+        ("charts", case_charts),
+        ("to_bytes", case_to_bytes),
+        ("save_ppttc", case_save_ppttc),
+        ("open_stream", case_open_stream),
+        ("replace_chart", case_replace_chart),
+        ("render_skeleton", case_render_skeleton),
+    ]
+    for t, n, dtype in itertools.product(templates, charts, dtypes):
+        params = {
+            "templates": t,
+            "charts": n,
+            "rows": 20,
+            "columns": 10,
+            "dtype": dtype,
+        }
+        for name, setup in deck_cases:
+            yield name, params, setup
+
+
+def case_id(name, params):
+    return name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def measure(run, min_time=0.2, repeat=3):
+    """Returns the best time of one call and the peak memory of `run`."""
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timeit.timeit(run, number=number)
+        if elapsed >= min_time or number >= 10**6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    times = [elapsed] + timeit.repeat(run, number=number, repeat=repeat - 1)
+    seconds = min(times) / number
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def run_suite(quick=False, keyword=None, min_time=0.2):
+    global WORKDIR
+
+    with tempfile.TemporaryDirectory() as WORKDIR:
+        return _run_suite(quick, keyword, min_time)
+
+
+def _run_suite(quick, keyword, min_time):
+    report = {}
+    for name, params, setup in grid(quick):
+        identifier = case_id(name, params)
+        if keyword and keyword not in identifier:
+            continue
+        report[identifier] = measure(setup(**params), min_time=min_time)
+        result = report[identifier]
+        print(
+            f"{identifier:<80} {result['seconds'] * 1000:>10.3f} ms "
+            f"{result['peak_bytes'] / 1024:>10.1f} KiB",
+            file=sys.stderr,
+        )
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Lists the cases of `report` that regressed against `baseline`."""
+    regressions = []
+    for identifier, result in sorted(report.items()):
+        if identifier not in baseline:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            before, after = baseline[identifier][metric], result[metric]
+            if before and after / before > 1 + tolerance:
+                regressions.append((identifier, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller grid")
+    parser.add_argument("-k", dest="keyword", help="only run matching cases")
+    parser.add_argument("--save", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="compare with this JSON report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum seconds per timing repeat (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.quick, args.keyword, args.min_time)
+
+    if args.save:
+        with open(args.save, "w") as outfile:
+            json.dump(report, outfile, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as infile:
+            baseline = json.load(infile)
+        regressions = compare(report, baseline, args.tolerance)
+        for identifier, metric, before, after in regressions:
+            print(
+                f"REGRESSION {identifier} {metric}: {before:.6g} -> "
+                f"{after:.6g} ({after / before:.2f}x)"
+            )
+        print(
+            f"{len(regressions)} regressions in "
+            f"{len(set(report) & set(baseline))} compared cases."
+        )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
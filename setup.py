@@ -15,6 +15,7 @@ setuptools.setup(
     licence="MIT",
     url="https://github.com/duarteocarmo/think-cell",
     packages=setuptools.find_packages(),
+    entry_points={"console_scripts": ["thinkcell=thinkcell.cli:main"]},
     classifiers=[
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
@@ -0,0 +1,72 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from thinkcell import Thinkcell
+
+CATEGORIES = ["alpha", "bravo", "charlie"]
+
+
+def _build_deck(
+    slides=1,
+    values=None,
+    titles=None,
+    fill=None,
+    dataframe=False,
+    tc=None,
+    **kwargs,
+):
+    """Fills a Thinkcell object with one chart and one title per slide.
+
+    By default, the slides use three templates in turn and have one to four
+    series, so that they have different sizes, and their cells mix integers,
+    floats and dates. The titles contain non-ASCII characters and a slash.
+
+    Parameters
+    ----------
+    slides : int
+        The number of slides, when `values` is not given.
+    values : list
+        The data of the chart of every slide, one row of values per series,
+        without the series names.
+    titles : list
+        The title of every slide.
+    fill : list
+        The fill of the series, cut to the number of series of every chart.
+    dataframe : bool
+        Also adds a chart from a DataFrame, "Frame", to every slide.
+    tc : Thinkcell
+        The object to fill, which can be a stream. A new object is created
+        with `kwargs` by default.
+    """
+    if tc is None:
+        tc = Thinkcell(**kwargs)
+    if values is None:
+        values = [
+            [[i, j + 0.5, datetime(2012, 9, 16 + j)] for j in range(i % 4 + 1)]
+            for i in range(slides)
+        ]
+    if titles is None:
+        titles = [f"Slide {i}: Ünïcode/" for i in range(len(values))]
+    for slide, (rows, title) in enumerate(zip(values, titles)):
+        template = tc.add_template(f"template-{slide % 3}.pptx")
+        tc.add_chart(
+            template,
+            "Chart",
+            CATEGORIES[: len(rows[0])],
+            [[f"Series {i}"] + list(row) for i, row in enumerate(rows)],
+            fill=None if fill is None else fill[: len(rows)],
+        )
+        tc.add_textfield(template, "Title", title)
+        if dataframe:
+            tc.add_chart_from_dataframe(
+                template,
+                "Frame",
+                pd.DataFrame(columns=["Company", "Ads"], data=[["A", 1]]),
+            )
+    return tc
+
+
+@pytest.fixture
+def build_deck():
+    """Returns the function building the decks of the tests."""
+    return _build_deck
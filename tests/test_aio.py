@@ -0,0 +1,125 @@
+import asyncio
+import io
+import json
+import os
+import threading
+import pytest
+from thinkcell.aio import AsyncRunner, generate_async
+from thinkcell.backends import Backend
+
+
+def run(coroutine):
+    """Runs `coroutine` in a new event loop, as `asyncio.run` of Python 3.7."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def blocking_backend(started, release):
+    """A backend that blocks while encoding until `release` is set."""
+
+    def dumps(obj):
+        if "name" in obj:
+            started.set()
+            release.wait(5)
+        return json.dumps(obj).encode()
+
+    return Backend("blocking", dumps, b", ")
+
+
+class TestAsync(object):
+    def test_save_ppttc_async(self, build_deck, tmp_path):
+        filename = str(tmp_path / "async.ppttc")
+        tc = build_deck()
+        assert run(tc.save_ppttc_async(filename)) == True
+        with open(filename, "rb") as infile:
+            assert infile.read() == tc.to_bytes()
+
+    def test_save_ppttc_async_file_object(self, build_deck):
+        tc, buffer = build_deck(), io.BytesIO()
+        run(tc.save_ppttc_async(buffer))
+        assert buffer.getvalue() == tc.to_bytes()
+
+    def test_save_ppttc_async_skip_unchanged(self, build_deck, tmp_path):
+        filename = str(tmp_path / "async.ppttc")
+        tc = build_deck()
+
+        async def save_twice():
+            first = await tc.save_ppttc_async(filename, skip_unchanged=True)
+            second = await tc.save_ppttc_async(filename, skip_unchanged=True)
+            return first, second
+
+        assert run(save_twice()) == (True, False)
+
+    def test_save_ppttc_async_bad_file(self, build_deck):
+        with pytest.raises(ValueError) as e_info:
+            run(build_deck().save_ppttc_async("async.pptx"))
+
+    def test_cancel_running(self, build_deck, tmp_path):
+        filename = tmp_path / "cancelled.ppttc"
+        filename.write_bytes(b"previous")
+        started, release = threading.Event(), threading.Event()
+        tc = build_deck(backend=blocking_backend(started, release))
+
+        async def cancel():
+            task = asyncio.ensure_future(tc.save_ppttc_async(str(filename)))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            await asyncio.sleep(0.01)
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        run(cancel())
+        assert os.listdir(tmp_path) == ["cancelled.ppttc"]
+        assert filename.read_bytes() == b"previous"
+
+    def test_cancel_pending(self, build_deck, tmp_path):
+        runner = AsyncRunner(max_workers=1)
+        filename = tmp_path / "pending.ppttc"
+        release = threading.Event()
+
+        async def cancel():
+            busy = asyncio.ensure_future(
+                runner.run(lambda cancel: release.wait(5))
+            )
+            task = asyncio.ensure_future(
+                build_deck().save_ppttc_async(str(filename), runner=runner)
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+            await busy
+
+        run(cancel())
+        runner.shutdown()
+        assert os.listdir(tmp_path) == []
+
+    def test_runner_bad_workers(self):
+        with pytest.raises(ValueError) as e_info:
+            AsyncRunner(max_workers=0)
+
+    def test_generate_async(self, tmp_path):
+        jobs = [
+            {
+                "filename": str(tmp_path / f"client-{client}.ppttc"),
+                "templates": [
+                    {
+                        "template": "example.pptx",
+                        "textfields": [
+                            {"field_name": "Title", "text": f"{client}"}
+                        ],
+                    }
+                ],
+            }
+            for client in range(5)
+        ]
+        jobs.append({"filename": "bad.pptx", "templates": []})
+        results = run(generate_async(jobs, runner=AsyncRunner(2)))
+        assert [result.ok for result in results] == [True] * 5 + [False]
+        assert len(os.listdir(tmp_path)) == 5
@@ -0,0 +1,64 @@
+import io
+import json
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.backends import Backend, available_backends, get_backend
+
+
+class TestBackends(object):
+    def test_available_backends(self):
+        assert available_backends()[-1] == "json"
+
+    def test_get_backend_auto(self):
+        assert get_backend().name == available_backends()[0]
+        assert get_backend("auto") is get_backend()
+
+    def test_get_backend_instance(self):
+        backend = get_backend("json")
+        assert get_backend(backend) is backend
+
+    def test_get_backend_bad(self):
+        with pytest.raises(ValueError) as e_info:
+            get_backend("yaml")
+
+    def test_json_backend_identical_to_json_dump(self, build_deck):
+        tc = build_deck(3, backend="json")
+        assert tc.to_bytes() == json.dumps(tc.charts).encode()
+
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_backends_same_document(self, build_deck, backend):
+        tc = build_deck(3, backend=backend)
+        assert json.loads(tc.to_bytes()) == tc.charts
+
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_backends_large_integers(self, backend):
+        tc = Thinkcell(backend=backend)
+        tc.add_template("example.pptx")
+        tc.add_chart("example.pptx", "Chart", ["Ünïcode"], [["x", 10**20]])
+        tc.add_chart("example.pptx", "Other", ["alpha"], [["y", -(2**64)]])
+        assert json.loads(tc.to_bytes()) == tc.charts
+        assert tc.charts[0]["data"][0]["table"][2][1] == {"number": 10**20}
+
+    def test_custom_backend(self, build_deck):
+        backend = Backend(
+            "indent", lambda obj: json.dumps(obj, indent=1).encode(), b","
+        )
+        tc = build_deck(3, backend=backend)
+        assert json.loads(tc.to_bytes()) == tc.charts
+
+    def test_to_bytes_no_data(self):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell().to_bytes()
+
+    def test_save_ppttc_file_object(self, build_deck):
+        tc = build_deck(3)
+        buffer = io.BytesIO()
+        assert tc.save_ppttc(buffer) == True
+        assert buffer.getvalue() == tc.to_bytes()
+
+    def test_save_ppttc_same_as_to_bytes(self, build_deck, tmp_path):
+        tc = build_deck(3, backend="json")
+        filename = str(tmp_path / "test.ppttc")
+        tc.save_ppttc(filename)
+        with open(filename, "rb") as infile:
+            assert infile.read() == tc.to_bytes()
@@ -0,0 +1,90 @@
+import os
+import pandas as pd
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.batch import Result, build, generate
+
+
+def make_job(filename, client):
+    return {
+        "filename": filename,
+        "templates": [
+            {
+                "template": "example.pptx",
+                "charts": [
+                    {
+                        "chart_name": "Chart1",
+                        "dataframe": pd.DataFrame(
+                            columns=["Company", "Ads", "Revenue"],
+                            data=[["Amazon", client, 11], ["Slack", 8, 2]],
+                        ),
+                    },
+                    {
+                        "chart_name": "Chart2",
+                        "categories": ["Goals"],
+                        "data": [["Chelsea", client]],
+                        "fill": ["#70AD47"],
+                    },
+                ],
+                "textfields": [
+                    {"field_name": "Title", "text": f"Client {client}"}
+                ],
+            }
+        ],
+    }
+
+
+class TestBatch(object):
+    def test_build(self):
+        job = make_job("client.ppttc", 1)
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_dataframe(
+            "example.pptx",
+            "Chart1",
+            job["templates"][0]["charts"][0]["dataframe"],
+        )
+        tc.add_chart(
+            "example.pptx", "Chart2", ["Goals"], [["Chelsea", 1]], ["#70AD47"]
+        )
+        tc.add_textfield("example.pptx", "Title", "Client 1")
+        assert build(job).charts == tc.charts
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_generate(self, tmp_path, workers):
+        jobs = [
+            make_job(str(tmp_path / f"client-{i}.ppttc"), i) for i in range(5)
+        ]
+        results = generate(jobs, workers=workers, chunksize=2)
+        assert results == [
+            Result(job["filename"], True, None, True) for job in jobs
+        ]
+        for i, job in enumerate(jobs):
+            with open(job["filename"], "rb") as infile:
+                assert infile.read() == build(jobs[i]).to_bytes()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_generate_error(self, tmp_path, workers):
+        jobs = [
+            make_job(str(tmp_path / "good.ppttc"), 1),
+            make_job(str(tmp_path / "bad.docx"), 2),
+        ]
+        good, bad = generate(jobs, workers=workers)
+        assert good.ok
+        assert not bad.ok
+        assert bad.error.startswith("ValueError")
+        assert not os.path.exists(str(tmp_path / "bad.docx"))
+
+    def test_generate_no_workers(self):
+        with pytest.raises(ValueError) as e_info:
+            generate([], workers=0)
+
+    def test_generate_skip_unchanged(self, tmp_path):
+        jobs = [
+            make_job(str(tmp_path / f"client-{i}.ppttc"), i) for i in range(3)
+        ]
+        generate(jobs, workers=1, skip_unchanged=True)
+        jobs[1] = make_job(jobs[1]["filename"], 10)
+        results = generate(jobs, workers=1, skip_unchanged=True)
+        assert [result.written for result in results] == [False, True, False]
+        assert all(result.ok for result in results)
@@ -0,0 +1,90 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.cache import TableCache
+from thinkcell.stats import Stats
+
+TEMPLATES = ["first.pptx", "second.pptx"]
+
+
+def fill_slide(slide, number, delay=0.0):
+    """Fills a slide with charts that depend on its number."""
+    rng = random.Random(number)
+    for chart in range(5):
+        time.sleep(delay * rng.random())
+        slide.add_chart(
+            chart_name=f"Chart {chart}",
+            categories=["alpha", "bravo", "charlie"],
+            data=[
+                [f"series {i}"] + [rng.randint(0, 3) for _ in range(3)]
+                for i in range(4)
+            ],
+        )
+    slide.add_chart_from_dataframe(
+        "Frame",
+        pd.DataFrame({"Company": ["a", "b"], "Revenue": [number, 1.5]}),
+    )
+    slide.add_textfield("Title", f"Slide {number}")
+
+
+def build_deck(slides, workers, delay=0.0, **kwargs):
+    tc = Thinkcell(**kwargs)
+    builders = [tc.add_slide(TEMPLATES[i % 2]) for i in range(slides)]
+    numbers = list(range(slides))
+    if workers == 1:
+        for builder, number in zip(builders, numbers):
+            fill_slide(builder, number, delay)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fill_slide, builders, numbers, [delay] * slides))
+    return tc
+
+
+class TestSlideBuilder(object):
+    def test_add_slide(self):
+        tc = Thinkcell()
+        first = tc.add_slide("first.pptx")
+        second = tc.add_slide("first.pptx")
+        second.add_textfield("Title", "second")
+        first.add_textfield("Title", "first")
+        first.replace_textfield("Title", "First")
+        assert (first.handle, second.handle) == (0, 1)
+        assert [page["data"][0]["table"] for page in tc.charts] == [
+            [[{"string": "First"}]],
+            [[{"string": "second"}]],
+        ]
+
+    def test_stress_same_as_sequential(self):
+        expected = build_deck(64, workers=1).to_bytes()
+        stats = Stats()
+        tc = build_deck(
+            64, workers=8, delay=0.001, cache=TableCache(16), stats=stats
+        )
+        assert tc.to_bytes() == expected
+        assert stats.counters["charts"] == 64 * 6
+        assert stats.counters["textfields"] == 64
+
+    def test_concurrent_add_slide(self):
+        tc = Thinkcell()
+
+        def add(number):
+            slide = tc.add_slide("first.pptx")
+            slide.add_textfield("Title", f"Slide {number}")
+            return slide.handle, number
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            handles = dict(executor.map(add, range(200)))
+        assert sorted(handles) == list(range(200))
+        for handle, number in handles.items():
+            table = tc.charts[handle]["data"][0]["table"]
+            assert table == [[{"string": f"Slide {number}"}]]
+
+    def test_stream_add_slide(self, tmp_path):
+        filename = str(tmp_path / "stream.ppttc")
+        with Thinkcell.open_stream(filename) as tc:
+            tc.add_template("first.pptx")
+            with pytest.raises(ValueError) as e_info:
+                tc.add_slide("first.pptx")
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.cache import (
+    TableCache,
+    dataframe_key,
+    long_dataframe_key,
+    rows_key,
+)
+
+
+def make_dataframe():
+    return pd.DataFrame(
+        columns=["Company", "Ads", "Revenue"],
+        data=[["Amazon", 1, 11.5], ["Slack", 8, 2.0]],
+    )
+
+
+class TestTableCache(object):
+    def test_cache_hit(self):
+        tc = Thinkcell(cache=4)
+        first = tc.add_template("example.pptx")
+        second = tc.add_template("example.pptx")
+        for template in (first, second):
+            tc.add_chart_from_dataframe(template, "Chart1", make_dataframe())
+        assert tc.cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "size": 1,
+            "maxsize": 4,
+        }
+        tables = [page["data"][0].table for page in tc._pages]
+        assert tables[0] is tables[1]
+        assert tc.charts[0]["data"] == tc.charts[1]["data"]
+
+    def test_cache_same_output(self):
+        cached, uncached = Thinkcell(cache=4), Thinkcell()
+        for tc in (cached, uncached):
+            for _ in range(2):
+                tc.add_template("example.pptx")
+                tc.add_chart(
+                    "example.pptx", "Chart1", ["Ads"], [["Amazon", 1]]
+                )
+        assert cached.cache.hits == 1
+        assert cached.to_bytes() == uncached.to_bytes()
+
+    def test_cache_shared(self):
+        cache = TableCache()
+        for _ in range(3):
+            tc = Thinkcell(cache=cache)
+            tc.add_template("example.pptx")
+            tc.add_chart("example.pptx", "Chart1", ["Ads"], [["Amazon", 1]])
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_cache_eviction(self):
+        cache = TableCache(maxsize=2)
+        for key in [b"a", b"b", b"a", b"c", b"b"]:
+            cache.get(key, object)
+        assert cache.stats()["size"] == 2
+        assert (cache.hits, cache.misses) == (1, 4)
+
+    def test_cache_clear(self):
+        cache = TableCache()
+        cache.get(b"a", object)
+        cache.clear()
+        assert cache.stats() == {
+            "hits": 0,
+            "misses": 0,
+            "size": 0,
+            "maxsize": 128,
+        }
+
+    def test_cache_bad_size(self):
+        with pytest.raises(ValueError) as e_info:
+            TableCache(0)
+
+    def test_cache_bool(self):
+        assert Thinkcell(cache=True).cache.maxsize == TableCache().maxsize
+        assert Thinkcell(cache=False).cache is None
+        cache = TableCache()
+        assert Thinkcell(cache=cache).cache is cache
+
+    def test_rows_key(self):
+        assert rows_key(["a"], [["x", 1]]) == rows_key(["a"], [["x", 1]])
+        assert rows_key(["a"], [["x", 1]]) != rows_key(["a"], [["x", 1.0]])
+        assert rows_key(["a"], [["x", 1]]) != rows_key(
+            ["a"], [["x", 1]], ["#FFFFFF"]
+        )
+        assert rows_key(["a"], [["x", 1]]) != rows_key(
+            ["a"], [["x", 1]], missing="zero"
+        )
+
+    def test_rows_key_array(self):
+        data = np.zeros((100, 100))
+        changed = data.copy()
+        changed[50, 50] = 1
+        assert rows_key(["a"], data) == rows_key(["a"], data.copy())
+        assert rows_key(["a"], data) != rows_key(["a"], changed)
+        assert rows_key(["a"], data) != rows_key(["a"], data.astype(int))
+
+    def test_rows_key_list_of_arrays(self):
+        row = np.arange(3000.0)
+        changed = row.copy()
+        changed[1500] = -1
+        assert rows_key(["a"], [row]) == rows_key(["a"], [row.copy()])
+        assert rows_key(["a"], [row]) != rows_key(["a"], [changed])
+        assert rows_key(["a"], [row]) != rows_key(["a"], [pd.Series(changed)])
+
+        tc = Thinkcell(cache=4)
+        categories = [f"c{j}" for j in range(2999)]
+        for data in (row, changed):
+            tc.add_template("example.pptx")
+            tc.add_chart("example.pptx", "Chart1", categories, [data])
+        assert tc.cache.hits == 0
+        tables = [page["data"][0].table for page in tc._pages]
+        assert tables[0] is not tables[1]
+
+    def test_dataframe_key(self):
+        dataframe = make_dataframe()
+        assert dataframe_key(dataframe) == dataframe_key(make_dataframe())
+        dataframe.iloc[0, 1] = 2
+        assert dataframe_key(dataframe) != dataframe_key(make_dataframe())
+        objects = pd.DataFrame({"a": ["x", 1]}, dtype=object)
+        strings = pd.DataFrame({"a": ["x", "1"]}, dtype=object)
+        assert dataframe_key(objects) != dataframe_key(strings)
+
+    def test_long_dataframe_key(self):
+        dataframe = pd.DataFrame(
+            {"s": ["a", "b"], "c": ["x", "x"], "v": [1, 2], "other": [3, 4]}
+        )
+        columns, options = ("s", "c", "v"), ("sum", None, None)
+        key = long_dataframe_key(dataframe, columns, options)
+        changed = dataframe.assign(other=[5, 6])
+        assert long_dataframe_key(changed, columns, options) == key
+        assert long_dataframe_key(dataframe, columns, ("mean", None, 1)) != key
+        assert (
+            long_dataframe_key(dataframe, columns, (sum, None, None)) is None
+        )
+
+    def test_cache_fill_copied(self):
+        tc = Thinkcell(cache=4)
+        tc.add_template("example.pptx")
+        fill = ["#70AD47"]
+        tc.add_chart("example.pptx", "Chart1", ["Ads"], [["Amazon", 1]], fill)
+        fill[0] = "#000000"
+        tc.add_chart("example.pptx", "Chart1", ["Ads"], [["Amazon", 1]], fill)
+        data = tc.charts[0]["data"]
+        assert data[0]["table"][2][0]["fill"] == "#70AD47"
+        assert data[1]["table"][2][0]["fill"] == "#000000"
@@ -0,0 +1,146 @@
+import json
+import subprocess
+import sys
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.cli import load_manifest, main
+
+
+def write_manifest(tmp_path, decks, name="manifest.json"):
+    (tmp_path / "data").mkdir(exist_ok=True)
+    (tmp_path / "data" / "chart.csv").write_text(
+        "Company,Ads,Revenue\nAmazon,1,11\nSlack,8,2\n"
+    )
+    (tmp_path / "data" / "chart.json").write_text(
+        json.dumps(
+            {"categories": ["Ads", "Revenue"], "data": [["Zoom", 4, 2]]}
+        )
+    )
+    manifest = tmp_path / name
+    if name.endswith(".json"):
+        manifest.write_text(json.dumps({"decks": decks}))
+    else:
+        yaml = pytest.importorskip("yaml")
+        manifest.write_text(yaml.safe_dump({"decks": decks}))
+    return str(manifest)
+
+
+def deck(filename, title="Client"):
+    return {
+        "filename": filename,
+        "templates": [
+            {
+                "template": "example.pptx",
+                "charts": [
+                    {"chart_name": "Chart1", "csv": "data/chart.csv"},
+                    {"chart_name": "Chart2", "json": "data/chart.json"},
+                ],
+                "textfields": [{"field_name": "Title", "text": title}],
+            }
+        ],
+    }
+
+
+def expected_bytes(title="Client"):
+    tc = Thinkcell()
+    tc.add_template("example.pptx")
+    tc.add_chart(
+        "example.pptx",
+        "Chart1",
+        ["Ads", "Revenue"],
+        [["Amazon", 1, 11], ["Slack", 8, 2]],
+    )
+    tc.add_chart(
+        "example.pptx", "Chart2", ["Ads", "Revenue"], [["Zoom", 4, 2]]
+    )
+    tc.add_textfield("example.pptx", "Title", title)
+    return tc.to_bytes()
+
+
+class TestCli(object):
+    def test_build(self, tmp_path, capsys):
+        manifest = write_manifest(tmp_path, [deck("out/deck.ppttc")])
+        (tmp_path / "out").mkdir()
+        assert main(["build", manifest]) == 0
+        assert (tmp_path / "out" / "deck.ppttc").read_bytes() == (
+            expected_bytes()
+        )
+        assert "Built 1 of 1 decks" in capsys.readouterr().out
+
+    def test_build_yaml_workers(self, tmp_path):
+        decks = [deck(f"deck-{i}.ppttc", f"Client {i}") for i in range(4)]
+        manifest = write_manifest(tmp_path, decks, "manifest.yaml")
+        assert main(["build", manifest, "--workers", "2", "-q"]) == 0
+        for i in range(4):
+            content = (tmp_path / f"deck-{i}.ppttc").read_bytes()
+            assert content == expected_bytes(f"Client {i}")
+
+    def test_build_no_stream_skip_unchanged(self, tmp_path, capsys):
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc")])
+        assert main(["build", manifest, "--no-stream"]) == 0
+        assert main(["build", manifest, "--skip-unchanged"]) == 0
+        assert "(0 written)" in capsys.readouterr().out
+        assert (tmp_path / "deck.ppttc").read_bytes() == expected_bytes()
+
+    def test_build_profile(self, tmp_path, capsys):
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc")])
+        assert main(["build", manifest, "--profile"]) == 0
+        out = capsys.readouterr().out
+        for line in ["transform", "encode", "wall", "charts", "textfields"]:
+            assert line in out
+
+    def test_build_failed_deck(self, tmp_path, capsys):
+        broken = deck("broken.ppttc")
+        broken["templates"][0]["charts"][0]["csv"] = "data/missing.csv"
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc"), broken])
+        assert main(["build", manifest]) == 1
+        assert "broken.ppttc" in capsys.readouterr().err
+        assert not (tmp_path / "broken.ppttc").exists()
+        assert (tmp_path / "deck.ppttc").exists()
+
+    def test_build_failed_deck_keeps_previous(self, tmp_path, capsys):
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc")])
+        assert main(["build", manifest, "-q"]) == 0
+        (tmp_path / "data" / "chart.csv").write_text("Company,Ads\nAmazon,x")
+        (tmp_path / "data" / "chart.json").unlink()
+        assert main(["build", manifest, "-q"]) == 1
+        assert (tmp_path / "deck.ppttc").read_bytes() == expected_bytes()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_no_command(self, capsys):
+        with pytest.raises(SystemExit) as e_info:
+            main([])
+        assert e_info.value.code == 2
+        assert "command" in capsys.readouterr().err
+
+    def test_build_bad_manifest(self, tmp_path, capsys):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"jobs": []}))
+        assert main(["build", str(manifest)]) == 2
+        assert main(["build", str(tmp_path / "missing.json")]) == 2
+
+    def test_load_manifest_paths(self, tmp_path):
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc")])
+        job = load_manifest(manifest)[0]
+        assert job["filename"] == str(tmp_path / "deck.ppttc")
+        chart = job["templates"][0]["charts"][0]
+        assert chart["csv"] == str(tmp_path / "data" / "chart.csv")
+        assert job["templates"][0]["template"] == "example.pptx"
+
+    def test_module_lazy_imports(self, tmp_path):
+        manifest = write_manifest(tmp_path, [deck("deck.ppttc")])
+        code = (
+            "import sys; from thinkcell.cli import main; "
+            "assert main(['build', sys.argv[1], '-q']) == 0; "
+            "assert 'pandas' not in sys.modules; "
+            "assert 'numpy' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code, manifest], check=True)
+        process = subprocess.run(
+            [sys.executable, "-m", "thinkcell", "build", manifest],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        assert process.returncode == 0
+        assert "Built 1 of 1 decks" in process.stdout
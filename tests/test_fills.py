@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.fills import FillRules
+
+RED, GREEN, BLUE = "#C00000", "#00B050", "#0070C0"
+
+
+def chart_rows(tc, template=0, chart=0):
+    return tc.charts[template]["data"][chart]["table"][2:]
+
+
+def fills(rows):
+    return [
+        [None if cell is None else cell.get("fill") for cell in row]
+        for row in rows
+    ]
+
+
+def add(tc, data, fill, categories=None, **kwargs):
+    template = tc.add_template("template.pptx")
+    categories = categories or [f"c{j}" for j in range(len(data[0]) - 1)]
+    tc.add_chart(template, "Chart", categories, data, fill=fill, **kwargs)
+
+
+class TestFillRules(object):
+    def test_thresholds_first_rule_wins(self):
+        tc = Thinkcell()
+        rules = FillRules().below(0, RED).above(10, GREEN).between(0, 10, BLUE)
+        add(tc, [["a", -1, 0, 5], ["b", 10, 11, -5]], rules)
+        assert fills(chart_rows(tc)) == [
+            [None, RED, BLUE, BLUE],
+            [None, BLUE, GREEN, RED],
+        ]
+        rules = FillRules().above(10, GREEN, inclusive=True).below(0, RED)
+        tc = Thinkcell()
+        add(tc, [["a", 10, -1, 3]], rules)
+        assert fills(chart_rows(tc)) == [[None, GREEN, RED, None]]
+
+    def test_colour_strings_shared(self):
+        tc = Thinkcell()
+        add(tc, [["a", -1, -2], ["b", -3, 4]], FillRules().below(0, RED))
+        rows = chart_rows(tc)
+        assert rows[0][1]["fill"] is rows[1][1]["fill"]
+        assert rows[1][2] == {"number": 4}
+
+    def test_top_bottom_quantiles(self):
+        data = [
+            [f"s{i}"] + list(range(i * 10, i * 10 + 10)) for i in range(10)
+        ]
+        tc = Thinkcell()
+        add(tc, data, FillRules().top(0.1, GREEN).bottom(0.1, RED))
+        result = np.array(fills(chart_rows(tc)))[:, 1:]
+        assert (result[9] == GREEN).all() and (result[0] == RED).all()
+        assert (result[1:9] == None).all()
+
+        tc = Thinkcell()
+        add(tc, data, FillRules().quantiles([RED, BLUE, GREEN, "#FFFFFF"]))
+        result = np.array(fills(chart_rows(tc)))[:, 1:]
+        assert (result[:2] == RED).all() and (result[2, :5] == RED).all()
+        assert (result[7, 5:] == "#FFFFFF").all()
+        assert [(result == color).sum() for color in [RED, BLUE, GREEN]] == [
+            25,
+            25,
+            25,
+        ]
+
+    def test_only_numbers_match(self):
+        tc = Thinkcell(missing="empty")
+        data = [["a", "text", None, float("nan"), -1, 2]]
+        add(tc, data, FillRules().below(100, RED).quantiles([BLUE]))
+        assert fills(chart_rows(tc)) == [[None, None, None, None, RED, RED]]
+
+    def test_colors_and_where(self):
+        tc = Thinkcell()
+        add(tc, [["a", 1, 2], ["b", 3, 4]], FillRules().colors([RED, None]))
+        assert fills(chart_rows(tc)) == [[None, RED, RED], [None, None, None]]
+
+        per_cell = np.array([[GREEN, ""], [None, BLUE]], dtype=object)
+        rules = FillRules().where(lambda x: x % 2 == 0, RED).colors(per_cell)
+        tc = Thinkcell()
+        add(tc, [["a", 1, 2], ["b", 3, 4]], rules)
+        assert fills(chart_rows(tc)) == [[None, GREEN, RED], [None, None, RED]]
+
+        with pytest.raises(ValueError) as e_info:
+            add(Thinkcell(), [["a", 1, 2]], FillRules().colors([RED, BLUE]))
+        with pytest.raises(ValueError) as e_info:
+            add(
+                Thinkcell(), [["a", 1]], FillRules().where(lambda x: True, RED)
+            )
+
+    def test_dataframe_column(self):
+        dataframe = pd.DataFrame(
+            {
+                "Company": ["Amazon", "Slack", "Zoom"],
+                "Status": ["late", "ok", "other"],
+                "Ads": [1, -8, 3],
+                "Revenue": [11.5, 2.0, 4.0],
+            }
+        )
+        rules = (
+            FillRules()
+            .below(0, RED)
+            .column("Status", {"late": GREEN, "ok": BLUE})
+        )
+        tc = Thinkcell()
+        tc.add_template("template.pptx")
+        tc.add_chart_from_dataframe("template.pptx", "Chart", dataframe, rules)
+        table = tc.charts[0]["data"][0]["table"]
+        assert table[0] == [None, {"string": "Ads"}, {"string": "Revenue"}]
+        assert fills(table[2:]) == [
+            [None, GREEN, GREEN],
+            [None, RED, BLUE],
+            [None, None, None],
+        ]
+        assert list(dataframe.columns) == [
+            "Company",
+            "Status",
+            "Ads",
+            "Revenue",
+        ]
+
+        with pytest.raises(ValueError) as e_info:
+            add(Thinkcell(), [["a", 1]], FillRules().column("Status"))
+        assert "add_chart_from_dataframe" in str(e_info.value)
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart_from_dataframe(
+                "template.pptx", "Other", dataframe, FillRules().column("x")
+            )
+
+    def test_long_dataframe_and_update(self):
+        dataframe = pd.DataFrame(
+            {
+                "region": ["north", "north", "south"],
+                "month": ["Jan", "Feb", "Jan"],
+                "revenue": [-1.0, 2.0, 3.0],
+            }
+        )
+        tc = Thinkcell()
+        tc.add_template("template.pptx")
+        tc.add_chart_from_long_dataframe(
+            "template.pptx",
+            "Chart",
+            dataframe,
+            series="region",
+            category="month",
+            value="revenue",
+            categories=["Jan", "Feb"],
+            fill=FillRules().below(0, RED),
+        )
+        assert fills(chart_rows(tc)) == [[None, RED, None], [None, None, None]]
+        tc.update_chart("template.pptx", "Chart", data=[["x", 1, -2]])
+        assert fills(chart_rows(tc)) == [[None, None, RED]]
+
+    @pytest.mark.parametrize("validation", ["strict", "deferred", "off"])
+    def test_validation_cache_lazy(self, validation):
+        rules = FillRules().below(0, RED)
+        tc = Thinkcell(validation=validation, cache=8)
+        for _ in range(2):
+            add(tc, [["a", -1, 2]], rules)
+            add(tc, [["a", -1, 2]], FillRules().where(lambda x: x > 0, RED))
+        add(tc, lambda: [["a", -1, 2]], rules, categories=lambda: ["x", "y"])
+        tc.to_bytes()
+        assert tc.cache.stats()["hits"] == 1
+        assert fills(chart_rows(tc, 4)) == [[None, RED, None]]
+
+    def test_skeleton_evaluates_rules(self):
+        tc = Thinkcell()
+        add(tc, [["a", 1, 2]], FillRules().below(0, RED))
+        content = tc.compile().render({"Chart": [[-1, 2]]})
+        expected = Thinkcell()
+        add(expected, [["a", -1, 2]], FillRules().below(0, RED))
+        assert content == expected.to_bytes()
+
+    def test_same_as_cell_by_cell(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(200, 30))
+        values[rng.random(values.shape) < 0.05] = np.nan
+        rules = FillRules().below(-1, RED).top(0.1, GREEN).above(0, BLUE)
+        tc = Thinkcell()
+        add(
+            tc,
+            [[f"s{i}"] + row for i, row in enumerate(values.tolist())],
+            rules,
+        )
+
+        cutoff = np.nanquantile(values, 0.9)
+        expected = []
+        for row in values.tolist():
+            colors = [None]
+            for value in row:
+                if value != value:
+                    colors.append(None)
+                elif value < -1:
+                    colors.append(RED)
+                elif value >= cutoff:
+                    colors.append(GREEN)
+                elif value > 0:
+                    colors.append(BLUE)
+                else:
+                    colors.append(None)
+            expected.append(colors)
+        assert fills(chart_rows(tc)) == expected
+
+    def test_invalid_rules(self):
+        with pytest.raises(ValueError) as e_info:
+            FillRules().top(0, GREEN)
+        with pytest.raises(ValueError) as e_info:
+            FillRules().quantiles([])
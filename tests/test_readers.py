@@ -0,0 +1,74 @@
+import pytest
+from thinkcell.readers import read_csv
+
+
+def write_csv(tmp_path, rows):
+    filename = tmp_path / "chart.csv"
+    filename.write_text("".join(",".join(row) + "\n" for row in rows))
+    return str(filename)
+
+
+class TestReadCsv(object):
+    def test_read_csv(self, tmp_path):
+        filename = write_csv(
+            tmp_path,
+            [
+                ["Company", "Ads", "Revenue", "Date"],
+                ["Amazon", "1", "1.5", "2021-01-31"],
+                ["Slack", "2", "3", "2021-02-28T10:00:00"],
+            ],
+        )
+        categories, columns, lengths = read_csv(filename)
+        assert categories == ("string", ["Ads", "Revenue", "Date"])
+        assert [(kind, list(values)) for kind, values in columns] == [
+            ("string", ["Amazon", "Slack"]),
+            ("number", [1, 2]),
+            ("number", [1.5, 3.0]),
+            ("date", ["2021-01-31", "2021-02-28"]),
+        ]
+        assert lengths == {4}
+
+    @pytest.mark.parametrize(
+        "value, kind",
+        [
+            ("2021-02-28 10:00:00.5+01:00", "date"),
+            ("2021-02-28T10:00Z", "date"),
+            ("2021-02-30", "string"),
+            ("2021-2-28", "string"),
+            ("2021-02-28T24:00", "string"),
+        ],
+    )
+    def test_read_csv_dates(self, tmp_path, value, kind):
+        filename = write_csv(tmp_path, [["Company", "Date"], ["a", value]])
+        _, columns, _ = read_csv(filename)
+        assert columns[1] == (kind, [value[:10] if kind == "date" else value])
+
+    @pytest.mark.parametrize("chunksize", [1, 2, 256])
+    def test_read_csv_upgrades(self, tmp_path, chunksize):
+        rows = [["Company", "Ads", "Code", "Empty", "Ratio"]]
+        rows += [[f"c{i}", str(i), str(i), "", "1"] for i in range(4)]
+        rows += [["x", "", "007a", "2021-01-31", "nan"]]
+        filename = write_csv(tmp_path, rows)
+        _, columns, _ = read_csv(filename, chunksize=chunksize)
+        assert [kind for kind, _ in columns[1:3]] == [
+            ["number"] * 4 + [None],
+            "string",
+        ]
+        assert list(columns[2][1]) == ["0", "1", "2", "3", "007a"]
+        assert columns[3] == (
+            [None] * 4 + ["date"],
+            [None] * 4 + ["2021-01-31"],
+        )
+        assert columns[4][0] == ["number"] * 4 + [None]
+
+    def test_read_csv_missing_zero(self, tmp_path):
+        filename = write_csv(tmp_path, [["Company", "Ads"], ["Amazon", ""]])
+        _, columns, _ = read_csv(filename, missing="zero")
+        assert columns[1] == ("number", [0])
+
+    @pytest.mark.parametrize("content", ["", "Company,Ads\n", "\n\n"])
+    def test_read_csv_no_data(self, tmp_path, content):
+        filename = tmp_path / "chart.csv"
+        filename.write_text(content)
+        with pytest.raises(ValueError) as e_info:
+            read_csv(str(filename))
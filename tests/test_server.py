@@ -0,0 +1,207 @@
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from thinkcell.batch import build
+from thinkcell.cache import TableCache
+from thinkcell.server import RenderServer
+from thinkcell.templates import TemplateInspector
+
+
+def deck(title="Client", revenue=11):
+    return {
+        "templates": [
+            {
+                "template": "template.pptx",
+                "charts": [
+                    {
+                        "chart_name": "Chart1",
+                        "categories": ["Ads", "Revenue"],
+                        "data": [["Amazon", 1, revenue], ["Slack", 8, 2]],
+                        "fill": ["#70AD47", "#ED7D31"],
+                    }
+                ],
+                "textfields": [{"field_name": "Title", "text": title}],
+            }
+        ]
+    }
+
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+
+@pytest.fixture
+def server():
+    yield from serving(RenderServer(("127.0.0.1", 0), max_concurrency=2))
+
+
+@pytest.fixture
+def inspecting_server(monkeypatch):
+    monkeypatch.chdir(EXAMPLES)
+    inspector = TemplateInspector(persist=False)
+    yield from serving(RenderServer(("127.0.0.1", 0), inspector=inspector))
+
+
+def serving(server):
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def request(connection, method, path, body=None, headers=None):
+    content = None if body is None else json.dumps(body).encode()
+    connection.request(method, path, body=content, headers=headers or {})
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def connect(server):
+    return http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+
+
+class TestRenderServer(object):
+    def test_render_keep_alive(self, server):
+        connection = connect(server)
+        for i in range(5):
+            status, content = request(
+                connection, "POST", "/render", deck(f"Client {i}", i)
+            )
+            assert status == 200
+            assert content == build(deck(f"Client {i}", i)).to_bytes()
+        status, content = request(connection, "GET", "/health")
+        health = json.loads(content)
+        assert health["stats"]["counters"]["decks"] == 5
+        assert health["stats"]["counters"]["requests"] == 5
+        assert health["cache"]["misses"] == 5
+        connection.close()
+
+    def test_warm_cache(self, server):
+        connection = connect(server)
+        for _ in range(3):
+            request(connection, "POST", "/render", deck())
+        assert server.cache.stats()["hits"] == 2
+
+    def test_cache_bool(self):
+        with RenderServer(("127.0.0.1", 0), cache=True) as server:
+            assert server.cache.maxsize == TableCache().maxsize
+        with RenderServer(("127.0.0.1", 0), cache=False) as server:
+            assert server.cache is None
+            assert server.health()["cache"] is None
+
+    def test_layouts(self, server):
+        connection = connect(server)
+        status, content = request(connection, "PUT", "/layouts/client", deck())
+        assert status == 200
+        assert json.loads(content)["keys"] == [[0, "Chart1"], [0, "Title"]]
+
+        data = {"Chart1": [[1, 42], [8, 2]], "Title": "Acme"}
+        status, content = request(
+            connection, "POST", "/layouts/client/render", {"data": data}
+        )
+        assert status == 200
+        assert content == build(deck("Acme", 42)).to_bytes()
+
+        data = [[0, "Title", "Acme"]]
+        status, content = request(
+            connection, "POST", "/layouts/client/render", {"data": data}
+        )
+        assert content == build(deck("Acme")).to_bytes()
+
+        status, _ = request(
+            connection, "POST", "/layouts/other/render", {"data": {}}
+        )
+        assert status == 404
+
+    @pytest.mark.parametrize(
+        "method, path, body, headers, status",
+        [
+            ("POST", "/render", {"pages": []}, None, 400),
+            (
+                "POST",
+                "/render",
+                {"templates": [{"template": "a.txt"}]},
+                None,
+                400,
+            ),
+            ("POST", "/render", {"templates": [{"template": 1}]}, None, 400),
+            ("POST", "/missing", {}, None, 404),
+            ("GET", "/missing", None, None, 404),
+            ("PUT", "/layouts/a%20b", deck(), None, 400),
+            ("POST", "/layouts/client/render", {"data": 3}, None, 404),
+            ("POST", "/render", None, {"Content-Length": "-1"}, 400),
+            ("POST", "/render", None, {"Content-Length": "many"}, 400),
+        ],
+    )
+    def test_errors(self, server, method, path, body, headers, status):
+        connection = connect(server)
+        assert request(connection, method, path, body, headers)[0] == status
+        assert request(connection, "GET", "/health")[0] == 200
+
+    def test_no_files(self, server):
+        job = deck()
+        job["templates"][0]["charts"] = [
+            {"chart_name": "Chart1", "csv": "/etc/passwd"}
+        ]
+        status, content = request(connect(server), "POST", "/render", job)
+        assert status == 400
+        assert "csv" in json.loads(content)["error"]
+
+    def test_inspected_templates(self, inspecting_server):
+        connection = connect(inspecting_server)
+        job = deck()
+        job["templates"][0]["textfields"] = []
+        job["templates"][0]["charts"][0]["chart_name"] = "Chrat1"
+        for template, message in [
+            ("simple-template.pptx", "Did you mean 'Chart1'?"),
+            (os.path.abspath("simple-template.pptx"), "relative path"),
+            ("../examples/simple-template.pptx", "relative path"),
+            ("missing.pptx", "'missing.pptx' could not be read."),
+        ]:
+            job["templates"][0]["template"] = template
+            status, content = request(connection, "POST", "/render", job)
+            assert status == 400
+            error = json.loads(content)["error"]
+            assert message in error
+            assert "Errno" not in error
+            assert os.getcwd() not in error.replace(template, "")
+
+    def test_invalid_json_and_busy(self, server):
+        connection = connect(server)
+        connection.request("POST", "/render", body=b"{not json")
+        response = connection.getresponse()
+        assert response.status == 400
+        response.read()
+
+        server.queue_timeout = 0.05
+        for _ in range(2):
+            server._slots.acquire()
+        try:
+            status, _ = request(connection, "POST", "/render", deck())
+            assert status == 503
+        finally:
+            for _ in range(2):
+                server._slots.release()
+        assert request(connection, "POST", "/render", deck())[0] == 200
+
+    def test_concurrent_clients(self, server):
+        def client(number):
+            connection = connect(server)
+            results = [
+                request(connection, "POST", "/render", deck(str(i), number))
+                for i in range(10)
+            ]
+            connection.close()
+            return number, results
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for number, results in executor.map(client, range(8)):
+                for i, (status, content) in enumerate(results):
+                    assert status == 200
+                    assert content == build(deck(str(i), number)).to_bytes()
@@ -0,0 +1,148 @@
+import json
+import os
+import hashlib
+import pytest
+from thinkcell import Thinkcell
+
+
+def read_shards(tmp_path, index):
+    charts = []
+    for shard in index["shards"]:
+        content = (tmp_path / shard["filename"]).read_bytes()
+        assert len(content) == shard["bytes"]
+        assert hashlib.sha256(content).hexdigest() == shard["sha256"]
+        charts.extend(json.loads(content))
+    return charts
+
+
+class TestSaveSharded(object):
+    def test_max_slides(self, build_deck, tmp_path):
+        tc = build_deck(10)
+        index = tc.save_sharded(str(tmp_path / "deck.ppttc"), max_slides=4)
+        assert [shard["filename"] for shard in index["shards"]] == [
+            "deck-001.ppttc",
+            "deck-002.ppttc",
+            "deck-003.ppttc",
+        ]
+        assert [shard["first"] for shard in index["shards"]] == [0, 4, 8]
+        assert index["shards"][2]["templates"] == [
+            "template-2.pptx",
+            "template-0.pptx",
+        ]
+        assert read_shards(tmp_path, index) == json.loads(tc.to_bytes())
+        on_disk = json.loads((tmp_path / "deck.index.json").read_text())
+        assert on_disk == index
+        assert not (tmp_path / "deck.ppttc").exists()
+
+    def test_max_bytes(self, build_deck, tmp_path):
+        tc = build_deck(30)
+        index = tc.save_sharded(
+            str(tmp_path / "deck.ppttc"), max_bytes=1000, workers=3
+        )
+        assert len(index["shards"]) > 1
+        assert all(shard["bytes"] <= 1000 for shard in index["shards"])
+        assert read_shards(tmp_path, index) == json.loads(tc.to_bytes())
+
+    def test_template_larger_than_budget(self, build_deck, tmp_path):
+        tc = build_deck(3)
+        index = tc.save_sharded(str(tmp_path / "deck.ppttc"), max_bytes=10)
+        assert [len(shard["templates"]) for shard in index["shards"]] == [
+            1,
+            1,
+            1,
+        ]
+        assert read_shards(tmp_path, index) == json.loads(tc.to_bytes())
+
+    def test_both_limits(self, build_deck, tmp_path):
+        tc = build_deck(12)
+        size = len(tc.to_bytes())
+        index = tc.save_sharded(
+            str(tmp_path / "deck.ppttc"), max_slides=5, max_bytes=size
+        )
+        assert [len(shard["templates"]) for shard in index["shards"]] == [
+            5,
+            5,
+            2,
+        ]
+
+    def test_stale_shards_removed(self, build_deck, tmp_path):
+        filename = str(tmp_path / "deck.ppttc")
+        build_deck(10).save_sharded(filename, max_slides=2)
+        assert (tmp_path / "deck-005.ppttc").exists()
+        index = build_deck(10).save_sharded(filename, max_slides=5)
+        assert len(index["shards"]) == 2
+        assert sorted(os.listdir(tmp_path)) == [
+            "deck-001.ppttc",
+            "deck-002.ppttc",
+            "deck.index.json",
+        ]
+
+    def test_skip_unchanged(self, build_deck, tmp_path):
+        filename = str(tmp_path / "deck.ppttc")
+        index = build_deck(6).save_sharded(
+            filename, max_slides=2, skip_unchanged=True
+        )
+        assert index["written"] == 3
+        tc = build_deck(6)
+        tc.add_textfield(5, "Subtitle", "changed")
+        index = tc.save_sharded(filename, max_slides=2, skip_unchanged=True)
+        assert index["written"] == 1
+        assert read_shards(tmp_path, index) == json.loads(tc.to_bytes())
+
+    @pytest.mark.parametrize("skip_unchanged", [False, True])
+    def test_failed_save_keeps_previous(
+        self, build_deck, tmp_path, skip_unchanged
+    ):
+        filename = str(tmp_path / "deck.ppttc")
+        build_deck(6).save_sharded(
+            filename, max_slides=2, skip_unchanged=skip_unchanged
+        )
+        before = {
+            name: (tmp_path / name).read_bytes()
+            for name in os.listdir(tmp_path)
+        }
+
+        def rows():
+            raise RuntimeError("The database is down.")
+
+        tc = build_deck(6)
+        tc.add_textfield(0, "Subtitle", "changed")
+        tc.add_chart(5, "Lazy", ["alpha"], rows)
+        with pytest.raises(ValueError) as e_info:
+            tc.save_sharded(
+                filename, max_slides=2, skip_unchanged=skip_unchanged
+            )
+        assert "database is down" in str(e_info.value)
+        after = {
+            name: (tmp_path / name).read_bytes()
+            for name in os.listdir(tmp_path)
+        }
+        assert after == before
+        index = json.loads(before["deck.index.json"])
+        assert read_shards(tmp_path, index) == json.loads(
+            build_deck(6).to_bytes()
+        )
+
+    def test_stats(self, build_deck, tmp_path):
+        tc = build_deck(6, stats=True)
+        tc.save_sharded(str(tmp_path / "deck.ppttc"), max_slides=4)
+        assert tc.stats.counters["saves"] == 2
+
+    def test_errors(self, build_deck, tmp_path):
+        tc = build_deck(2)
+        with pytest.raises(ValueError) as e_info:
+            tc.save_sharded(str(tmp_path / "deck.ppttc"))
+        with pytest.raises(ValueError) as e_info:
+            tc.save_sharded(str(tmp_path / "deck.ppttc"), max_slides=0)
+        with pytest.raises(ValueError) as e_info:
+            tc.save_sharded(str(tmp_path / "deck.pptx"), max_slides=1)
+        with pytest.raises(ValueError) as e_info:
+            tc.save_sharded(
+                str(tmp_path / "deck.ppttc"), max_slides=1, workers=0
+            )
+
+    def test_stream(self, tmp_path):
+        with Thinkcell.open_stream(str(tmp_path / "stream.ppttc")) as tc:
+            tc.add_template("first.pptx")
+            with pytest.raises(ValueError) as e_info:
+                tc.save_sharded(str(tmp_path / "deck.ppttc"), max_slides=1)
@@ -0,0 +1,126 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import pytest
+from thinkcell import Thinkcell
+
+PROTOTYPE = [[[0, 0, 0], [0, 0, 0]], [[0, 0, 0], [0, 0, 0]]]
+
+
+class TestSkeleton(object):
+    @pytest.mark.parametrize("backend", ["orjson", "json"])
+    def test_render_same_as_thinkcell(self, build_deck, backend):
+        skeleton = build_deck(
+            values=PROTOTYPE,
+            titles=["", ""],
+            fill=["#ff0000", None],
+            backend=backend,
+        ).compile()
+        values = [[[1, 2.5, -3], [True, 1e20, 7]], [[4, 5, 6], [7, 8, 9]]]
+        content = skeleton.render(
+            {
+                (0, "Chart"): values[0],
+                (1, "Chart"): np.array(values[1]),
+                (0, "Title"): '100% "quoted"',
+                (1, "Title"): "Slide 1",
+            }
+        )
+        expected = build_deck(
+            values=values,
+            titles=['100% "quoted"', "Slide 1"],
+            fill=["#ff0000", None],
+            backend=backend,
+        )
+        assert content == expected.to_bytes()
+
+    def test_defaults_and_unique_names(self):
+        tc = Thinkcell()
+        tc.add_template("template.pptx")
+        tc.add_chart("template.pptx", "Chart", ["a", "b"], [["x", 1, 2]])
+        tc.add_textfield("template.pptx", "Title", "Old")
+        skeleton = tc.compile()
+        assert skeleton.render() == tc.to_bytes()
+        assert skeleton.render({"Title": "New"}) == (
+            tc.to_bytes().replace(b"Old", b"New")
+        )
+        assert skeleton.keys == [(0, "Chart"), (0, "Title")]
+        assert skeleton.templates == ("template.pptx",)
+
+    def test_slow_path(self, build_deck):
+        skeleton = build_deck(
+            values=PROTOTYPE[:1], titles=[""], missing="null"
+        ).compile()
+        values = [[None, math.nan, datetime(2024, 1, 1)], ["a", 1, 2]]
+        content = skeleton.render(
+            {
+                (0, "Chart"): values,
+                (0, "Title"): datetime(2024, 5, 1),
+            }
+        )
+        expected = build_deck(
+            values=[values], titles=[datetime(2024, 5, 1)], missing="null"
+        )
+        assert content == expected.to_bytes()
+        array = np.array([[1.0, np.inf, 2.0], [3.0, 4.0, 5.0]])
+        content = (
+            build_deck(values=PROTOTYPE[:1], titles=[""])
+            .compile()
+            .render({"Chart": array})
+        )
+        expected = build_deck(values=[array.tolist()], titles=[""])
+        assert content == expected.to_bytes()
+
+    def test_errors(self, build_deck):
+        skeleton = build_deck(values=PROTOTYPE, titles=["", ""]).compile()
+        with pytest.raises(ValueError) as e_info:
+            skeleton.render({"Chart": [[1, 2, 3], [4, 5, 6]]})
+        assert "(slide, 'Chart')" in str(e_info.value)
+        with pytest.raises(ValueError) as e_info:
+            skeleton.render({"Chrat": [[1, 2, 3]]})
+        assert "Did you mean 'Chart'?" in str(e_info.value)
+        with pytest.raises(ValueError) as e_info:
+            skeleton.render({(2, "Chart"): [[1, 2, 3]]})
+        with pytest.raises(ValueError) as e_info:
+            skeleton.render({(0, "Chart"): [[1, 2, 3]]})
+        with pytest.raises(ValueError) as e_info:
+            skeleton.render({(0, "Chart"): np.zeros((2, 2))})
+        strict = build_deck(
+            values=PROTOTYPE[:1], titles=[""], missing="raise"
+        ).compile()
+        with pytest.raises(ValueError) as e_info:
+            strict.render({"Chart": [[None, 1, 2], [1, 2, 3]]})
+        assert "chart 'Chart'" in str(e_info.value)
+
+    def test_compile_checks(self, tmp_path):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell().compile()
+        with Thinkcell.open_stream(str(tmp_path / "deck.ppttc")) as tc:
+            tc.add_template("template.pptx")
+            with pytest.raises(ValueError) as e_info:
+                tc.compile()
+
+    def test_lazy_prototype(self):
+        tc = Thinkcell()
+        tc.add_template("template.pptx")
+        tc.add_chart(
+            "template.pptx", "Chart", lambda: ["a"], lambda: [["x", 1]]
+        )
+        skeleton = tc.compile()
+        assert skeleton.render({"Chart": [[2]]}) == (
+            tc.to_bytes().replace(b'{"number":1}', b'{"number":2}')
+        )
+
+    def test_threads(self, build_deck):
+        skeleton = build_deck(values=PROTOTYPE, titles=["", ""]).compile()
+
+        def render(number):
+            values = [[number, 0, 0], [0, number, 0]]
+            return number, skeleton.render({(1, "Chart"): values})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(render, range(100)))
+        for number, content in results:
+            values = [PROTOTYPE[0], [[number, 0, 0], [0, number, 0]]]
+            expected = build_deck(values=values, titles=["", ""])
+            assert content == expected.to_bytes()
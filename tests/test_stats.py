@@ -0,0 +1,77 @@
+import io
+from thinkcell import Thinkcell
+from thinkcell.stats import Stats
+
+
+class TestStats(object):
+    def test_disabled(self, build_deck):
+        tc = build_deck(dataframe=True)
+        assert tc.stats is None
+        tc.save_ppttc(io.BytesIO())
+
+    def test_counters(self, build_deck):
+        tc = build_deck(stats=True, dataframe=True)
+        buffer = io.BytesIO()
+        tc.save_ppttc(buffer)
+        counters = tc.stats.as_dict()["counters"]
+        assert 0 < counters.pop("bytes") < len(buffer.getvalue())
+        assert counters == {
+            "templates": 1,
+            "charts": 2,
+            "textfields": 1,
+            "cells": 11,
+            "saves": 1,
+        }
+
+    def test_timers(self, build_deck, tmp_path):
+        tc = build_deck(stats=True, dataframe=True)
+        tc.save_ppttc(str(tmp_path / "test.ppttc"))
+        timers = tc.stats.as_dict()["timers"]
+        assert set(timers) == {
+            "validate",
+            "transform",
+            "dataframe",
+            "encode",
+            "write",
+        }
+        assert all(seconds >= 0 for seconds in timers.values())
+
+    def test_hooks(self, build_deck):
+        events = []
+        stats = Stats(
+            on_chart_added=lambda tc, template, entry: events.append(
+                ("added", template, entry.name)
+            ),
+            on_save_start=lambda tc, filename: events.append(("start",)),
+            on_save_end=lambda tc, filename, size: events.append(
+                ("end", size)
+            ),
+        )
+        tc = build_deck(stats=stats, dataframe=True)
+        buffer = io.BytesIO()
+        tc.save_ppttc(buffer)
+        assert events[:3] == [
+            ("added", 0, "Chart"),
+            ("added", 0, "Title"),
+            ("added", 0, "Frame"),
+        ]
+        assert events[3] == ("start",)
+        assert events[4][0] == "end"
+        assert events[4][1] == stats.counters["bytes"]
+
+    def test_shared_and_reset(self, build_deck):
+        stats = Stats()
+        build_deck(stats=stats, dataframe=True)
+        build_deck(stats=stats, dataframe=True)
+        assert stats.counters["templates"] == 2
+        assert stats.flat()["thinkcell.charts"] == 4
+        assert "thinkcell.validate_seconds" in stats.flat()
+        stats.reset()
+        assert stats.as_dict() == {"timers": {}, "counters": {}}
+
+    def test_stream(self, build_deck, tmp_path):
+        with Thinkcell.open_stream(str(tmp_path / "test.ppttc")) as tc:
+            tc.stats = Stats()
+            build_deck(dataframe=True, tc=tc)
+        assert tc.stats.counters["charts"] == 2
+        assert tc.stats.timers["write"] >= 0
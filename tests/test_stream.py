@@ -0,0 +1,117 @@
+import os
+import pytest
+from thinkcell import Thinkcell, ThinkcellStream
+
+
+class TestThinkcellStream(object):
+    def test_open_stream(self, tmp_path):
+        filename = str(tmp_path / "stream.ppttc")
+        with Thinkcell.open_stream(filename) as tc:
+            assert isinstance(tc, ThinkcellStream)
+            tc.add_template("example.pptx")
+        assert tc.closed
+
+    def test_stream_identical_to_save(self, build_deck, tmp_path):
+        expected = str(tmp_path / "expected.ppttc")
+        streamed = str(tmp_path / "streamed.ppttc")
+        tc = build_deck(3)
+        tc.add_template("empty.pptx")
+        tc.save_ppttc(expected)
+        with Thinkcell.open_stream(streamed) as stream:
+            build_deck(3, tc=stream)
+            stream.add_template("empty.pptx")
+            assert len(stream.charts) == 1
+            assert stream.charts[0]["data"] == []
+        with open(expected, "rb") as a, open(streamed, "rb") as b:
+            assert a.read() == b.read()
+
+    @pytest.mark.parametrize("filename", ["word.docx", 3])
+    def test_open_stream_bad_file(self, filename):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell.open_stream(filename)
+
+    def test_stream_no_template(self, tmp_path):
+        filename = str(tmp_path / "empty.ppttc")
+        with pytest.raises(ValueError) as e_info:
+            with Thinkcell.open_stream(filename):
+                pass
+        assert not os.path.exists(filename)
+
+    def test_stream_error_removes_file(self, tmp_path):
+        filename = str(tmp_path / "error.ppttc")
+        with pytest.raises(ValueError) as e_info:
+            with Thinkcell.open_stream(filename) as tc:
+                tc.add_template("example.pptx")
+                tc.add_chart(
+                    template_name="example.pptx",
+                    chart_name="Chart name",
+                    categories=["alpha", "bravo"],
+                    data=[["today", 1]],
+                )
+        assert not os.path.exists(filename)
+
+    def test_stream_error_keeps_previous_file(self, build_deck, tmp_path):
+        filename = tmp_path / "deck.ppttc"
+        filename.write_bytes(b"previous")
+        with pytest.raises(ValueError) as e_info:
+            with Thinkcell.open_stream(str(filename)) as tc:
+                tc.add_template("example.pptx")
+                assert filename.read_bytes() == b"previous"
+                tc.add_chart("example.pptx", "Chart name", ["a"], [["x"]])
+        assert filename.read_bytes() == b"previous"
+        assert os.listdir(tmp_path) == ["deck.ppttc"]
+
+        with Thinkcell.open_stream(str(filename)) as tc:
+            build_deck(3, tc=tc)
+        assert filename.read_bytes() == build_deck(3).to_bytes()
+        assert os.listdir(tmp_path) == ["deck.ppttc"]
+
+    def test_stream_deferred_validation(self, tmp_path):
+        filename = str(tmp_path / "deferred.ppttc")
+        with pytest.raises(ValueError) as e_info:
+            with Thinkcell.open_stream(filename, validation="deferred") as tc:
+                tc.add_template("example.pptx")
+                tc.add_chart(
+                    template_name="example.pptx",
+                    chart_name="Chart name",
+                    categories=["alpha", "bravo"],
+                    data=[["today", 1]],
+                )
+        assert not os.path.exists(filename)
+
+    def test_stream_lazy(self, tmp_path):
+        filename = str(tmp_path / "lazy.ppttc")
+        read = []
+
+        def rows():
+            read.append(True)
+            yield ["today", 1]
+
+        with Thinkcell.open_stream(filename) as tc:
+            tc.add_template("example.pptx")
+            tc.add_chart("example.pptx", "Chart name", ["alpha"], rows())
+            assert read == [True]
+            assert tc.charts[0]["data"] == []
+
+    def test_stream_closed(self, tmp_path):
+        filename = str(tmp_path / "closed.ppttc")
+        tc = Thinkcell.open_stream(filename)
+        tc.add_template("example.pptx")
+        assert tc.close() == True
+        with pytest.raises(ValueError) as e_info:
+            tc.add_template("example.pptx")
+
+    def test_stream_save_ppttc(self, tmp_path):
+        with Thinkcell.open_stream(str(tmp_path / "a.ppttc")) as tc:
+            tc.add_template("example.pptx")
+            with pytest.raises(ValueError) as e_info:
+                tc.save_ppttc(str(tmp_path / "b.ppttc"))
+
+    def test_stream_handles(self, tmp_path):
+        with Thinkcell.open_stream(str(tmp_path / "a.ppttc")) as tc:
+            first = tc.add_template("example.pptx")
+            second = tc.add_template("example.pptx")
+            assert (first, second) == (0, 1)
+            tc.add_textfield(second, "Title", "Second")
+            with pytest.raises(ValueError) as e_info:
+                tc.add_textfield(first, "Title", "First")
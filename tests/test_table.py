@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+from thinkcell.table import (
+    Table,
+    cell_value,
+    column_from_array,
+    column_from_series,
+    column_from_values,
+    with_missing,
+)
+from datetime import datetime
+
+
+class TestTable(object):
+    @pytest.mark.parametrize(
+        "test_input, expected",
+        [
+            ("daf", ("string", "daf")),
+            (3, ("number", 3)),
+            (datetime(2012, 9, 16, 0, 0), ("date", "2012-09-16")),
+            (np.int32(3), ("number", 3)),
+            (np.float64(2.5), ("number", 2.5)),
+            (np.datetime64("2012-09-16T10:30"), ("date", "2012-09-16")),
+        ],
+    )
+    def test_cell_value(self, test_input, expected):
+        assert cell_value(test_input) == expected
+
+    def test_column_from_values(self):
+        assert column_from_values([1, 2.5]) == ("number", [1, 2.5])
+        assert column_from_values(["a", 2]) == (
+            ["string", "number"],
+            ["a", 2],
+        )
+
+    def test_cell_value_numpy_types(self):
+        assert type(cell_value(np.int32(3))[1]) is int
+        assert type(cell_value(np.float64(2.5))[1]) is float
+        with pytest.raises(ValueError) as e_info:
+            cell_value(np.datetime64("NaT"))
+
+    @pytest.mark.parametrize(
+        "values, expected",
+        [
+            (np.array([1, 2], dtype=np.int32), ("number", [1, 2])),
+            (np.array(["a", "b"]), ("string", ["a", "b"])),
+            (
+                np.array(["2012-09-16T10:30", "2013-01-01"], "datetime64[m]"),
+                ("date", ["2012-09-16", "2013-01-01"]),
+            ),
+            (
+                np.array(["a", 1, np.int64(2)], dtype=object),
+                (["string", "number", "number"], ["a", 1, 2]),
+            ),
+        ],
+    )
+    def test_column_from_array(self, values, expected):
+        kind, raw = column_from_array(values)
+        assert (kind, list(raw)) == expected
+
+    def test_from_rows_array(self):
+        categories = np.array(["alpha", "bravo"])
+        data = np.array([[2017, 1.5, 2], [2018, 3, 4.5]])
+        table = Table.from_rows(categories, data)
+        assert (
+            table.to_json()
+            == Table.from_rows(categories.tolist(), data.tolist()).to_json()
+        )
+        assert isinstance(table.columns[1][1], np.ndarray)
+
+    @pytest.mark.parametrize(
+        "missing, expected",
+        [
+            ("empty", ([None, "number", None], [None, 1.5, None])),
+            ("null", ("number", [None, 1.5, None])),
+            ("zero", ("number", [0, 1.5, 0])),
+        ],
+    )
+    def test_column_from_values_missing(self, missing, expected):
+        values = [None, 1.5, float("inf")]
+        assert column_from_values(values, missing) == expected
+
+    def test_column_from_values_missing_raise(self):
+        with pytest.raises(ValueError) as e_info:
+            column_from_values([1.0, float("nan")], "raise")
+        assert column_from_values([1.0, 2], "raise") == ("number", [1.0, 2])
+
+    @pytest.mark.parametrize(
+        "column",
+        [
+            pd.Series([1.0, np.nan, np.inf]),
+            pd.Series([1, None, None], dtype="Int64"),
+            pd.Series(pd.to_datetime(["2020-01-01", None, None])),
+            pd.Series(["a", None, np.nan], dtype=object),
+        ],
+    )
+    def test_column_from_series_missing(self, column):
+        kind, values = column_from_series(column)
+        assert list(kind)[1:] == [None, None]
+        assert type(kind[0]) is str
+
+    def test_column_from_series_missing_zero(self):
+        kind, values = column_from_series(pd.Series([1.0, np.nan]), "zero")
+        assert kind == "number"
+        assert values.tolist() == [1.0, 0.0]
+
+    def test_with_missing_no_cells(self):
+        values = np.array([1.0, 2.0])
+        assert with_missing("number", values, [], "raise")[1] is values
+
+    def test_to_json_missing(self):
+        table = Table.from_rows(
+            ["alpha"], [["a", None], ["b", 1]], ["#FFFFFF", "#000000"]
+        )
+        assert table.to_json()[2] == [{"string": "a", "fill": "#FFFFFF"}, None]
+
+    def test_column_from_series_keeps_array(self):
+        kind, values = column_from_series(pd.Series([1, 2, 3]))
+        assert kind == "number"
+        assert isinstance(values, np.ndarray)
+
+    def test_column_from_series_copies(self):
+        series = pd.Series([1, 2, 3])
+        kind, values = column_from_series(series)
+        series[0] = 10
+        assert values[0] == 1
+
+    def test_to_json(self):
+        table = Table.from_rows(
+            ["alpha", 2017], [["a", 1, "x"], ["b", 2.5, 3]], ["#FFFFFF", None]
+        )
+        assert len(table) == 2
+        assert table.to_json() == [
+            [None, {"string": "alpha"}, {"number": 2017}],
+            [],
+            [
+                {"string": "a", "fill": "#FFFFFF"},
+                {"number": 1, "fill": "#FFFFFF"},
+                {"string": "x", "fill": "#FFFFFF"},
+            ],
+            [{"string": "b"}, {"number": 2.5}, {"number": 3}],
+        ]
+
+    def test_to_json_no_series(self):
+        table = Table.from_rows(["alpha"], [])
+        assert len(table) == 0
+        assert table.to_json() == [[None, {"string": "alpha"}], []]
+
+    def test_to_json_text(self):
+        assert Table.from_text("Title").to_json() == [[{"string": "Title"}]]
+
+    def test_to_json_numpy_values(self):
+        table = Table(
+            ("string", ["alpha"]),
+            [("string", ["a", "b"]), ("number", np.array([1, 2]))],
+            ["#FFFFFF", "#000000"],
+        )
+        cells = table.to_json()
+        assert cells[2][1] == {"number": 1, "fill": "#FFFFFF"}
+        assert type(cells[3][1]["number"]) is int
@@ -0,0 +1,143 @@
+import os
+import shutil
+import pytest
+from thinkcell import Thinkcell
+from thinkcell.templates import (
+    Element,
+    TemplateInspector,
+    read_template,
+)
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+
+def copy_template(tmp_path, name="complex-template-text-field.pptx"):
+    filename = tmp_path / "template.pptx"
+    shutil.copy(os.path.join(EXAMPLES, name), filename)
+    return str(filename)
+
+
+class TestReadTemplate(object):
+    def test_read_template(self, tmp_path):
+        index = read_template(copy_template(tmp_path))
+        assert index.elements == [
+            Element("chart_text", "textfield", 1),
+            Element("Chart2", "chart", 1, series=3, categories=3),
+            Element("Chart1", "chart", 1, series=3, categories=3),
+            Element("Chart3", "chart", 2, series=2, categories=3),
+        ]
+        assert index.charts == {"Chart1", "Chart2", "Chart3"}
+        assert index.textfields == {"chart_text"}
+        assert "Chart1" in index
+
+    def test_check(self, tmp_path):
+        index = read_template(copy_template(tmp_path))
+        index.check("Chart1", "chart")
+        index.check("chart_text", "textfield")
+        with pytest.raises(ValueError) as e_info:
+            index.check("Chrat1", "chart")
+        assert "Did you mean 'Chart1'" in str(e_info.value)
+        with pytest.raises(ValueError) as e_info:
+            index.check("chart_text", "chart")
+        assert "it is a textfield" in str(e_info.value)
+
+    def test_read_template_bad_file(self, tmp_path):
+        filename = tmp_path / "template.pptx"
+        filename.write_bytes(b"not a zip file")
+        with pytest.raises(ValueError) as e_info:
+            read_template(str(filename))
+
+
+class TestTemplateInspector(object):
+    def test_inspect_cached_on_disk(self, tmp_path):
+        filename = copy_template(tmp_path)
+        inspector = TemplateInspector(tmp_path / "cache")
+        index = inspector.inspect(filename)
+        assert inspector.inspect(filename) is index
+        assert inspector.parsed == 1
+
+        again = TemplateInspector(tmp_path / "cache")
+        assert again.inspect(filename).elements == index.elements
+        assert again.parsed == 0
+
+    def test_inspect_touched(self, tmp_path):
+        filename = copy_template(tmp_path)
+        inspector = TemplateInspector(tmp_path / "cache")
+        inspector.inspect(filename)
+        status = os.stat(filename)
+        os.utime(filename, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+        inspector.inspect(filename)
+        assert inspector.parsed == 1
+
+    def test_inspect_changed(self, tmp_path):
+        filename = copy_template(tmp_path)
+        inspector = TemplateInspector(tmp_path / "cache")
+        assert len(inspector.inspect(filename)) == 4
+        copy_template(tmp_path, "simple-template.pptx")
+        assert inspector.inspect(filename).charts == {"Chart1"}
+        assert inspector.parsed == 2
+
+    def test_inspect_corrupted_cache(self, tmp_path):
+        filename = copy_template(tmp_path)
+        TemplateInspector(tmp_path / "cache").inspect(filename)
+        for name in os.listdir(tmp_path / "cache"):
+            (tmp_path / "cache" / name).write_text("{")
+        inspector = TemplateInspector(tmp_path / "cache")
+        assert len(inspector.inspect(filename)) == 4
+        assert inspector.parsed == 1
+
+    def test_inspect_memory_only(self, tmp_path):
+        inspector = TemplateInspector(persist=False)
+        inspector.inspect(copy_template(tmp_path))
+        assert inspector.directory is None
+        assert os.listdir(tmp_path) == ["template.pptx"]
+
+    def test_inspect_missing_file(self, tmp_path):
+        inspector = TemplateInspector(tmp_path / "cache")
+        with pytest.raises(ValueError) as e_info:
+            inspector.inspect(str(tmp_path / "missing.pptx"))
+
+
+class TestThinkcellInspector(object):
+    def make(self, tmp_path, **kwargs):
+        inspector = TemplateInspector(tmp_path / "cache")
+        tc = Thinkcell(inspector=inspector, **kwargs)
+        return tc, copy_template(tmp_path)
+
+    def test_add_chart(self, tmp_path):
+        tc, template = self.make(tmp_path)
+        handle = tc.add_template(template)
+        tc.add_chart(template, "Chart1", ["a"], [["x", 1]])
+        tc.add_textfield(handle, "chart_text", "Hello")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart(handle, "Chrat1", ["a"], [["x", 1]])
+        with pytest.raises(ValueError) as e_info:
+            tc.add_textfield(template, "Chart1", "Hello")
+
+    def test_add_template_missing(self, tmp_path):
+        tc, _ = self.make(tmp_path)
+        with pytest.raises(ValueError) as e_info:
+            tc.add_template(str(tmp_path / "missing.pptx"))
+
+    def test_deferred(self, tmp_path):
+        tc, template = self.make(tmp_path, validation="deferred")
+        tc.add_template(template)
+        tc.add_chart(template, "Chrat1", ["a"], [["x", 1]])
+        with pytest.raises(ValueError) as e_info:
+            tc.save_ppttc(str(tmp_path / "deck.ppttc"))
+        assert not os.path.exists(tmp_path / "deck.ppttc")
+
+    def test_off(self, tmp_path):
+        tc, template = self.make(tmp_path, validation="off")
+        tc.add_template(template)
+        tc.add_chart(template, "Chrat1", ["a"], [["x", 1]])
+
+    def test_stream(self, tmp_path):
+        inspector = TemplateInspector(tmp_path / "cache")
+        template = copy_template(tmp_path)
+        filename = str(tmp_path / "deck.ppttc")
+        with Thinkcell.open_stream(filename, inspector=inspector) as tc:
+            handle = tc.add_template(template)
+            tc.add_textfield(handle, "chart_text", "Hello")
+            with pytest.raises(ValueError) as e_info:
+                tc.add_textfield(handle, "Title", "Hello")
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 from thinkcell import Thinkcell, DataFrameError
+from thinkcell.backends import Backend, get_backend
 from datetime import datetime
 import os
 
@@ -50,6 +52,53 @@ class TestThinkcell(object):
         tc.add_template(template)
         assert tc.charts == [{"template": template, "data": []}]
 
+    def test_add_template_handle(self):
+        tc = Thinkcell()
+        assert tc.add_template("example.pptx") == 0
+        assert tc.add_template("other.pptx") == 1
+        assert tc.add_template("example.pptx") == 2
+
+    def test_add_textfield_to_handle(self):
+        tc = Thinkcell()
+        first = tc.add_template("example.pptx")
+        second = tc.add_template("example.pptx")
+        tc.add_textfield(first, "Title", "First")
+        tc.add_textfield(second, "Title", "Second")
+        tc.add_textfield("example.pptx", "Subtitle", "Last")
+        assert tc.charts == [
+            {
+                "template": "example.pptx",
+                "data": [{"name": "Title", "table": [[{"string": "First"}]]}],
+            },
+            {
+                "template": "example.pptx",
+                "data": [
+                    {"name": "Title", "table": [[{"string": "Second"}]]},
+                    {"name": "Subtitle", "table": [[{"string": "Last"}]]},
+                ],
+            },
+        ]
+
+    def test_add_chart_to_earlier_template(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_template("other.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["alpha"],
+            data=[["today", 1]],
+        )
+        assert len(tc.charts[0]["data"]) == 1
+        assert tc.charts[1]["data"] == []
+
+    @pytest.mark.parametrize("handle", [1, -1, True, None])
+    def test_add_textfield_bad_handle(self, handle):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_textfield(handle, "Title", "A great slide")
+
     def test_add_chart_warning(self):
         tc = Thinkcell()
         template_name = "template.pptx"
@@ -178,6 +227,124 @@ class TestThinkcell(object):
             }
         ]
 
+    def test_add_chart_from_array(self):
+        categories = ["alpha", "bravo"]
+        data = [["today", 1, 2.5], ["tomorrow", 3, 4]]
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart("example.pptx", "Chart name", categories, data)
+
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=np.array(categories),
+            data=np.array(data, dtype=object),
+        )
+        assert tc.to_bytes() == expected.to_bytes()
+
+    def test_add_chart_from_array_dates(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=np.array(["2021-01-31", "2021-02-28"], "datetime64[D]"),
+            data=np.arange(6).reshape(2, 3),
+        )
+        header = tc.charts[0]["data"][0]["table"][0]
+        assert header == [None, {"date": "2021-01-31"}, {"date": "2021-02-28"}]
+
+    @pytest.mark.parametrize("validation", ["strict", "deferred"])
+    def test_add_chart_from_array_bad_shape(self, validation):
+        tc = Thinkcell(validation=validation)
+        tc.add_template("example.pptx")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart(
+                template_name="example.pptx",
+                chart_name="Chart name",
+                categories=["alpha"],
+                data=np.arange(3),
+            )
+
+    def test_add_chart_lazy(self):
+        categories = ["alpha", "bravo"]
+        data = [["today", 1, 2], ["tomorrow", 3, 4]]
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart("example.pptx", "Chart name", categories, data)
+
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=lambda: categories,
+            data=(row for row in data),
+        )
+        assert tc.to_bytes() == expected.to_bytes()
+
+    def test_add_chart_lazy_read_at_save(self):
+        data = [["today", 1]]
+        tc = Thinkcell(backend="json")
+        tc.add_template("example.pptx")
+        tc.add_chart("example.pptx", "Chart name", ["alpha"], lambda: data)
+        data[0][1] = 2
+        assert b'{"number": 2}' in tc.to_bytes()
+        data[0][1] = 3
+        assert b'{"number": 3}' in tc.to_bytes()
+
+    def test_add_chart_lazy_read_once(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart("example.pptx", "Chart name", ["alpha"], iter([["a", 1]]))
+        tc.to_bytes()
+        with pytest.raises(ValueError) as e_info:
+            tc.to_bytes()
+        assert "'Chart name'" in str(e_info.value)
+
+    def test_add_chart_lazy_cursor(self):
+        import sqlite3
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("create table sales (company, ads, revenue)")
+        connection.execute("insert into sales values ('Amazon', 1, 11)")
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["Ads", "Revenue"],
+            data=lambda: connection.execute("select * from sales"),
+        )
+        assert tc.charts[0]["data"][0]["table"][2] == [
+            {"string": "Amazon"},
+            {"number": 1},
+            {"number": 11},
+        ]
+
+    @pytest.mark.parametrize("validation", ["strict", "deferred"])
+    def test_add_chart_lazy_bad(self, validation):
+        tc = Thinkcell(validation=validation)
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["alpha", "bravo"],
+            data=iter([["today", 1]]),
+        )
+        with pytest.raises(ValueError) as e_info:
+            tc.to_bytes()
+        assert "'Chart name'" in str(e_info.value)
+
+    def test_update_chart_lazy(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart("example.pptx", "Chart name", ["alpha"], iter([]))
+        with pytest.raises(ValueError) as e_info:
+            tc.update_chart("example.pptx", "Chart name", fill=[])
+
     def test_add_chart_from_dataframe(self):
         tc = Thinkcell()
         template = "example.pptx"
@@ -289,6 +456,129 @@ class TestThinkcell(object):
             }
         ]
 
+    @pytest.mark.parametrize(
+        "column, expected",
+        [
+            (pd.Series([1, 2]), [{"number": 1}, {"number": 2}]),
+            (pd.Series([1.5, 2.0]), [{"number": 1.5}, {"number": 2.0}]),
+            (pd.Series(["a", "b"]), [{"string": "a"}, {"string": "b"}]),
+            (
+                pd.Series(pd.to_datetime(["2012-09-16", "2013-01-02"])),
+                [{"date": "2012-09-16"}, {"date": "2013-01-02"}],
+            ),
+            (
+                pd.Series(["a", 2], dtype=object),
+                [{"string": "a"}, {"number": 2}],
+            ),
+        ],
+    )
+    def test_transform_column(self, column, expected):
+        assert Thinkcell.transform_column(column) == expected
+
+    def test_transform_column_bad(self):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell.transform_column(pd.Series([[3, 4]], dtype=object))
+
+    def test_add_chart_from_dataframe_same_as_add_chart(self):
+        dataframe = pd.DataFrame(
+            {
+                "Company": ["Apple", "Amazon"],
+                "Founded": pd.to_datetime(["1976-04-01", "1994-07-05"]),
+                "Employees": [200, 100],
+                "Revenue": [1.5, 1.0],
+                "Other": ["a", 3],
+            }
+        )
+        fill = ["#70AD47", "#ED7D31"]
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart(
+            template_name="example.pptx",
+            chart_name="Cool Chart",
+            categories=dataframe.columns.to_list()[1:],
+            data=dataframe.values.tolist(),
+            fill=fill,
+        )
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_dataframe(
+            template_name="example.pptx",
+            chart_name="Cool Chart",
+            dataframe=dataframe,
+            fill=fill,
+        )
+        assert tc.charts == expected.charts
+
+    @pytest.mark.parametrize("missing", ["empty", "null", "zero"])
+    def test_add_chart_from_dataframe_small(self, monkeypatch, missing):
+        dataframe = pd.DataFrame(
+            {
+                "Company": ["Apple", None, "Zoom"],
+                "Employees": [200, 100, 50],
+                "Nullable": pd.array([1, None, 3], dtype="Int64"),
+                "Revenue": [1.5, float("nan"), float("inf")],
+                "Empty": [float("nan")] * 3,
+                "Founded": pd.to_datetime(["1976-04-01", None, "2011-04-21"]),
+                "Text": pd.array(["a", None, "c"], dtype="string"),
+                "Other": ["a", 3, None],
+                "Flag": [True, False, True],
+            }
+        )
+        fill = ["#70AD47", "#ED7D31", None]
+
+        def chart():
+            tc = Thinkcell(missing=missing)
+            tc.add_template("example.pptx")
+            tc.add_chart_from_dataframe(
+                "example.pptx", "Chart name", dataframe, fill
+            )
+            return tc.to_bytes()
+
+        small = chart()
+        monkeypatch.setattr("thinkcell.thinkcell.SMALL_DATAFRAME", 0)
+        assert small == chart()
+
+    @pytest.mark.parametrize(
+        "missing, expected",
+        [("empty", b"null"), ("null", b'{"number": null}')],
+    )
+    def test_add_chart_from_dataframe_missing(self, missing, expected):
+        dataframe = pd.DataFrame(
+            columns=["Company", "Ads"], data=[["Amazon", float("nan")]]
+        )
+        tc = Thinkcell(backend="json", missing=missing)
+        tc.add_template("example.pptx")
+        tc.add_chart_from_dataframe("example.pptx", "Chart name", dataframe)
+        assert b"NaN" not in tc.to_bytes()
+        assert b'{"string": "Amazon"}, ' + expected in tc.to_bytes()
+
+    def test_add_chart_from_dataframe_missing_raise(self):
+        dataframe = pd.DataFrame(
+            columns=["Company", "Ads"], data=[["Amazon", float("nan")]]
+        )
+        tc = Thinkcell(missing="raise")
+        tc.add_template("example.pptx")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart_from_dataframe(
+                "example.pptx", "Chart name", dataframe
+            )
+
+    def test_missing_bad(self):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell(missing="drop")
+
+    def test_add_chart_from_dataframe_bad_fill(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        dataframe = pd.DataFrame(columns=["Company", "Ads"], data=[["A", 1]])
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart_from_dataframe(
+                template_name="example.pptx",
+                chart_name="Cool Chart",
+                dataframe=dataframe,
+                fill=["#70AD47", "#ED7D31"],
+            )
+
     def test_add_chart_from_dataframe_invalid_dataframe(self):
         tc = Thinkcell()
         template = "example.pptx"
@@ -351,6 +641,245 @@ class TestThinkcell(object):
                 dataframe=dataframe,
             )
 
+    def long_dataframe(self):
+        return pd.DataFrame(
+            {
+                "Company": ["Amazon", "Slack", "Amazon", "Zoom", "Slack"],
+                "Month": ["Feb", "Jan", "Jan", "Feb", "Jan"],
+                "Revenue": [1, 2, 3, 4, 5],
+            }
+        )
+
+    def test_add_chart_from_long_dataframe(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_long_dataframe(
+            template_name="example.pptx",
+            chart_name="Cool Chart",
+            dataframe=self.long_dataframe(),
+            series="Company",
+            category="Month",
+            value="Revenue",
+        )
+        assert tc.charts[0]["data"][0]["table"] == [
+            [None, {"string": "Feb"}, {"string": "Jan"}],
+            [],
+            [{"string": "Amazon"}, {"number": 1}, {"number": 3}],
+            [{"string": "Slack"}, None, {"number": 7}],
+            [{"string": "Zoom"}, {"number": 4}, None],
+        ]
+
+    def test_add_chart_from_long_dataframe_options(self):
+        tc = Thinkcell(missing="zero")
+        tc.add_template("example.pptx")
+        tc.add_chart_from_long_dataframe(
+            template_name="example.pptx",
+            chart_name="Cool Chart",
+            dataframe=self.long_dataframe(),
+            series="Company",
+            category="Month",
+            value="Revenue",
+            agg="max",
+            categories=["Jan", "Feb"],
+            top=2,
+            fill=["#70AD47", "#ED7D31"],
+        )
+        assert tc.charts[0]["data"][0]["table"] == [
+            [None, {"string": "Jan"}, {"string": "Feb"}],
+            [],
+            [
+                {"string": "Slack", "fill": "#70AD47"},
+                {"number": 5, "fill": "#70AD47"},
+                {"number": 0, "fill": "#70AD47"},
+            ],
+            [
+                {"string": "Amazon", "fill": "#ED7D31"},
+                {"number": 3, "fill": "#ED7D31"},
+                {"number": 1, "fill": "#ED7D31"},
+            ],
+        ]
+
+    def test_add_chart_from_long_dataframe_dates(self):
+        dataframe = self.long_dataframe()
+        dataframe["Month"] = pd.to_datetime(
+            dataframe["Month"].map({"Jan": "2021-01-31", "Feb": "2021-02-28"})
+        )
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_long_dataframe(
+            template_name="example.pptx",
+            chart_name="Cool Chart",
+            dataframe=dataframe,
+            series="Company",
+            category="Month",
+            value="Revenue",
+            agg="count",
+        )
+        table = tc.charts[0]["data"][0]["table"]
+        assert table[0] == [
+            None,
+            {"date": "2021-01-31"},
+            {"date": "2021-02-28"},
+        ]
+        assert table[3] == [{"string": "Slack"}, {"number": 2}, None]
+
+    def test_add_chart_from_long_dataframe_bad_column(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        with pytest.raises(DataFrameError) as e_info:
+            tc.add_chart_from_long_dataframe(
+                template_name="example.pptx",
+                chart_name="Cool Chart",
+                dataframe=self.long_dataframe(),
+                series="Company",
+                category="Quarter",
+                value="Revenue",
+            )
+
+    def test_add_chart_from_long_dataframe_no_data(self):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        with pytest.raises(DataFrameError) as e_info:
+            tc.add_chart_from_long_dataframe(
+                template_name="example.pptx",
+                chart_name="Cool Chart",
+                dataframe=self.long_dataframe(),
+                series="Company",
+                category="Month",
+                value="Revenue",
+                categories=["Mar"],
+            )
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"top": 0}, {"categories": ["Jan", "Jan"]}, {"fill": ["#70AD47"]}],
+    )
+    def test_add_chart_from_long_dataframe_bad_options(self, options):
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart_from_long_dataframe(
+                template_name="example.pptx",
+                chart_name="Cool Chart",
+                dataframe=self.long_dataframe(),
+                series="Company",
+                category="Month",
+                value="Revenue",
+                **options,
+            )
+
+    def test_add_chart_from_csv(self, tmp_path):
+        filename = tmp_path / "chart.csv"
+        filename.write_text(
+            "Company,Ads,Revenue,Date\n"
+            "Amazon,1,11.5,2021-01-31\n"
+            "Slack,8,,2021-02-28\n"
+        )
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart_from_dataframe(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            dataframe=pd.read_csv(filename, parse_dates=["Date"]),
+        )
+
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_csv(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            filename=str(filename),
+        )
+        assert tc.to_bytes() == expected.to_bytes()
+
+    def test_add_chart_from_csv_delimiter(self, tmp_path):
+        filename = tmp_path / "chart.csv"
+        filename.write_text("Company;Ads\nAmazon;1\n")
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_csv(
+            "example.pptx", "Chart name", str(filename), delimiter=";"
+        )
+        assert tc.charts[0]["data"][0]["table"][2] == [
+            {"string": "Amazon"},
+            {"number": 1},
+        ]
+
+    @pytest.mark.parametrize(
+        "content", ["", "Company,Ads\n", "Company,Ads\nAmazon,1,2\n"]
+    )
+    def test_add_chart_from_csv_bad(self, tmp_path, content):
+        filename = tmp_path / "chart.csv"
+        filename.write_text(content)
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart_from_csv("example.pptx", "Chart name", str(filename))
+
+    def test_add_chart_from_arrow(self, tmp_path):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.parquet
+
+        dataframe = pd.DataFrame(
+            {
+                "Company": ["Amazon", "Slack"],
+                "Ads": [1, 8],
+                "Revenue": [11.5, None],
+                "Date": pd.to_datetime(["2021-01-31", "2021-02-28"]),
+            }
+        )
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart_from_dataframe(
+            "example.pptx", "Chart name", dataframe
+        )
+
+        table = pyarrow.Table.from_pandas(dataframe, preserve_index=False)
+        filename = str(tmp_path / "chart.parquet")
+        pyarrow.parquet.write_table(table, filename)
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_arrow("example.pptx", "Chart name", table)
+        assert tc.to_bytes() == expected.to_bytes()
+
+        tc = Thinkcell()
+        tc.add_template("example.pptx")
+        tc.add_chart_from_parquet("example.pptx", "Chart name", filename)
+        assert tc.to_bytes() == expected.to_bytes()
+
+    @pytest.mark.parametrize("missing", ["empty", "null", "zero"])
+    def test_add_chart_from_arrow_types(self, missing):
+        pyarrow = pytest.importorskip("pyarrow")
+
+        dataframe = pd.DataFrame(
+            {
+                "Company": ["Amazon", "Slack", "Zoom"],
+                "Ads": pd.array([1, None, 3], dtype="Int64"),
+                "Revenue": [11.5, float("inf"), 2.0],
+                "Date": pd.to_datetime(
+                    ["1969-12-31 23:59", None, "2021-02-28 10:00"]
+                ),
+                "Day": pd.to_datetime(["2021-01-31", "2021-02-01", None]),
+            }
+        )
+        expected = Thinkcell(missing=missing)
+        expected.add_template("example.pptx")
+        expected.add_chart_from_dataframe(
+            "example.pptx", "Chart name", dataframe
+        )
+
+        table = pyarrow.Table.from_pandas(dataframe, preserve_index=False)
+        table = table.set_column(
+            4, "Day", table.column("Day").cast(pyarrow.date32())
+        )
+        chunked = pyarrow.concat_tables([table.slice(0, 1), table.slice(1)])
+        for arrow in (table, chunked):
+            tc = Thinkcell(missing=missing)
+            tc.add_template("example.pptx")
+            tc.add_chart_from_arrow("example.pptx", "Chart name", arrow)
+            assert tc.to_bytes() == expected.to_bytes()
+        assert table.column("Revenue").to_pylist()[1] == float("inf")
+
     def test_add_textfield(self):
         tc = Thinkcell()
         template = "example.pptx"
@@ -367,6 +896,184 @@ class TestThinkcell(object):
             }
         ]
 
+    def make_deck(self, **kwargs):
+        tc = Thinkcell(**kwargs)
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["alpha", "bravo"],
+            data=[["today", 1, 2], ["tomorrow", 3, 4]],
+            fill=["#70AD47", "#ED7D31"],
+        )
+        tc.add_textfield(
+            template_name="example.pptx", field_name="Title", text="Slide"
+        )
+        return tc
+
+    @pytest.mark.parametrize("validation", ["deferred", "off"])
+    def test_validation_same_output(self, validation):
+        expected = self.make_deck().to_bytes()
+        assert self.make_deck(validation=validation).to_bytes() == expected
+
+    def test_validation_bad(self):
+        with pytest.raises(ValueError) as e_info:
+            Thinkcell(validation="lazy")
+
+    def test_validation_deferred(self, tmp_path):
+        tc = Thinkcell(validation="deferred")
+        tc.add_template("example.pptx")
+        tc.add_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["alpha", "bravo"],
+            data=[["today", 1, 2], ["tomorrow", 3]],
+        )
+        with pytest.raises(ValueError) as e_info:
+            tc.to_bytes()
+        assert "'Chart name'" in str(e_info.value)
+        with pytest.raises(ValueError) as e_info:
+            tc.save_ppttc(str(tmp_path / "deferred.ppttc"))
+        assert not os.path.exists(tmp_path / "deferred.ppttc")
+
+    def test_validation_off_template(self):
+        tc = Thinkcell(validation="off")
+        with pytest.raises(ValueError) as e_info:
+            tc.add_chart(
+                template_name="example.pptx",
+                chart_name="Chart name",
+                categories=["alpha"],
+                data=[["today", 1]],
+            )
+
+    def test_validation_deferred_warning(self):
+        tc = Thinkcell(validation="deferred")
+        tc.add_template("example.pptx")
+        tc.add_textfield(template_name="example.pptx", field_name=1, text="a")
+        with pytest.warns(UserWarning):
+            tc.to_bytes()
+
+    def test_replace_chart(self):
+        tc = self.make_deck()
+        tc.replace_chart(
+            template_name="example.pptx",
+            chart_name="Chart name",
+            categories=["charlie"],
+            data=[["today", 5]],
+        )
+        expected = Thinkcell()
+        expected.add_template("example.pptx")
+        expected.add_chart(
+            "example.pptx", "Chart name", ["charlie"], [["today", 5]]
+        )
+        expected.add_textfield("example.pptx", "Title", "Slide")
+        assert tc.charts == expected.charts
+
+    def test_replace_chart_missing(self):
+        tc = self.make_deck()
+        with pytest.raises(ValueError) as e_info:
+            tc.replace_chart(
+                template_name="example.pptx",
+                chart_name="Other chart",
+                categories=["charlie"],
+                data=[["today", 5]],
+            )
+
+    def test_replace_chart_from_dataframe(self):
+        tc = self.make_deck()
+        dataframe = pd.DataFrame(columns=["Company", "Ads"], data=[["A", 1]])
+        tc.replace_chart_from_dataframe(
+            "example.pptx", "Chart name", dataframe
+        )
+        assert tc.charts[0]["data"][0]["table"][2] == [
+            {"string": "A"},
+            {"number": 1},
+        ]
+
+    def test_replace_textfield(self):
+        tc = self.make_deck()
+        tc.replace_textfield("example.pptx", "Title", "New title")
+        assert tc.charts[0]["data"][1] == {
+            "name": "Title",
+            "table": [[{"string": "New title"}]],
+        }
+
+    def test_update_chart_data(self):
+        tc = self.make_deck()
+        tc.update_chart(
+            "example.pptx",
+            "Chart name",
+            data=[["today", 5, 6], ["later", 7, 8]],
+        )
+        table = tc.charts[0]["data"][0]["table"]
+        assert table[0] == [None, {"string": "alpha"}, {"string": "bravo"}]
+        assert table[3] == [
+            {"string": "later", "fill": "#ED7D31"},
+            {"number": 7, "fill": "#ED7D31"},
+            {"number": 8, "fill": "#ED7D31"},
+        ]
+
+    def test_update_chart_fill_and_categories(self):
+        tc = self.make_deck()
+        tc.update_chart(
+            "example.pptx",
+            "Chart name",
+            categories=["charlie", "delta"],
+            fill=["#000000", "#FFFFFF"],
+        )
+        table = tc.charts[0]["data"][0]["table"]
+        assert table[0] == [None, {"string": "charlie"}, {"string": "delta"}]
+        assert table[2][1] == {"number": 1, "fill": "#000000"}
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"categories": ["charlie"]},
+            {"data": [["today", 5]]},
+            {"data": [["today", 5, 6]]},
+            {"fill": ["#000000"]},
+        ],
+    )
+    def test_update_chart_bad(self, changes):
+        tc = self.make_deck()
+        with pytest.raises(ValueError) as e_info:
+            tc.update_chart("example.pptx", "Chart name", **changes)
+
+    def test_update_chart_textfield(self):
+        tc = self.make_deck()
+        with pytest.raises(ValueError) as e_info:
+            tc.update_chart("example.pptx", "Title", fill=[])
+
+    def test_fragment_cache(self):
+        calls = []
+        backend = get_backend("json")
+        counting = Backend(
+            "counting",
+            lambda obj: calls.append(obj) or backend.dumps(obj),
+            backend.separator,
+        )
+        tc = self.make_deck(backend=counting, fragment_cache=True)
+        first = tc.to_bytes()
+        charts = len(calls)
+        assert tc.to_bytes() == first
+        tc.replace_textfield("example.pptx", "Title", "New title")
+        tc.to_bytes()
+        assert len(calls) - charts == 3
+        uncached = self.make_deck(backend="json")
+        uncached.replace_textfield("example.pptx", "Title", "New title")
+        assert tc.to_bytes() == uncached.to_bytes()
+
+    def test_fragment_cache_lazy(self):
+        rows = [["today", 1, 2]]
+        tc = self.make_deck(fragment_cache=True)
+        tc.add_chart("example.pptx", "Lazy", ["alpha", "bravo"], lambda: rows)
+        first = tc.to_bytes()
+        rows[0][1] = 5
+        expected = self.make_deck()
+        expected.add_chart("example.pptx", "Lazy", ["alpha", "bravo"], rows)
+        assert tc.to_bytes() != first
+        assert tc.to_bytes() == expected.to_bytes()
+
     @pytest.mark.parametrize(
         "input, output", [("word.docx", ValueError), (3, ValueError)]
     )
@@ -398,3 +1105,49 @@ class TestThinkcell(object):
         )
         assert tc.save_ppttc(filename="test.ppttc") == True
         os.remove("test.ppttc")
+
+    def test_content_hash(self):
+        tc = self.make_deck(backend="json")
+        other = self.make_deck(backend="json")
+        assert tc.content_hash() == other.content_hash()
+        other.replace_textfield("example.pptx", "Title", "New title")
+        assert tc.content_hash() != other.content_hash()
+
+    def test_save_ppttc_skip_unchanged(self, tmp_path):
+        filename = str(tmp_path / "test.ppttc")
+        tc = self.make_deck()
+        assert tc.save_ppttc(filename, skip_unchanged=True) == True
+        mtime = os.stat(filename).st_mtime_ns
+        assert (
+            self.make_deck().save_ppttc(filename, skip_unchanged=True) == False
+        )
+        assert os.stat(filename).st_mtime_ns == mtime
+        with open(filename + ".sha256") as infile:
+            assert infile.read().strip() == tc.content_hash()
+        tc.replace_textfield("example.pptx", "Title", "New title")
+        assert tc.save_ppttc(filename, skip_unchanged=True) == True
+        with open(filename, "rb") as infile:
+            assert infile.read() == tc.to_bytes()
+        assert sorted(os.listdir(tmp_path)) == [
+            "test.ppttc",
+            "test.ppttc.sha256",
+        ]
+
+    def test_save_ppttc_skip_unchanged_no_sidecar(self, tmp_path):
+        filename = str(tmp_path / "test.ppttc")
+        self.make_deck().save_ppttc(filename)
+        assert (
+            self.make_deck().save_ppttc(filename, skip_unchanged=True) == False
+        )
+
+    def test_save_ppttc_skip_unchanged_modified_file(self, tmp_path):
+        filename = str(tmp_path / "test.ppttc")
+        tc = self.make_deck()
+        tc.save_ppttc(filename, skip_unchanged=True)
+        content = tc.to_bytes()
+        with open(filename, "wb") as outfile:
+            outfile.write(content.replace(b"Slide", b"Slido"))
+        os.utime(
+            filename, ns=(0, os.stat(filename + ".sha256").st_mtime_ns + 1)
+        )
+        assert tc.save_ppttc(filename, skip_unchanged=True) == True
@@ -1 +1,2 @@
-from thinkcell.thinkcell import Thinkcell, DataFrameError
\ No newline at end of file
+from thinkcell.thinkcell import Thinkcell, DataFrameError
+from thinkcell.stream import ThinkcellStream
@@ -0,0 +1,5 @@
+import sys
+
+from thinkcell.cli import main
+
+sys.exit(main())
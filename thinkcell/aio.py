@@ -0,0 +1,134 @@
+"""Saves decks from asyncio code without blocking the event loop.
+
+The encoding and writing of every deck runs in a thread of an `AsyncRunner`,
+whose number of threads caps the number of saves running at once across all
+the requests of a service::
+
+    runner = AsyncRunner(max_workers=4)
+
+    async def handler(request):
+        tc = build_deck(request)
+        await tc.save_ppttc_async("deck.ppttc", runner=runner)
+
+Cancelling the awaiting task stops the save: a save that did not start yet
+never runs, and a running one stops before its next chunk and removes its
+temporary file. Files are only ever replaced by complete ones.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from thinkcell.batch import run as run_job
+
+DEFAULT_WORKERS = 4
+
+_default_runner = None
+_default_lock = threading.Lock()
+
+
+class AsyncRunner(object):
+    """A bounded pool of threads running blocking work for asyncio code.
+
+    Attributes
+    ----------
+    max_workers : int
+        The number of threads, and so of saves running at once.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        """Initializes the runner, its threads are started when needed.
+
+        Parameters
+        ----------
+        max_workers : int
+            The number of threads.
+        """
+        if max_workers < 1:
+            raise ValueError(
+                f"You need at least one worker, not {max_workers}."
+            )
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="thinkcell"
+        )
+
+    async def run(self, func, *args):
+        """Runs `func(*args, cancel=event)` in a thread of the runner.
+
+        If the awaiting task is cancelled, `event` is set and the task waits
+        for `func` to stop before raising `asyncio.CancelledError`, so that
+        `func` can clean up.
+
+        Returns
+        -------
+        object
+            The value returned by `func`.
+        """
+        cancel = threading.Event()
+        future = self._executor.submit(func, *args, cancel=cancel)
+        waiter = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            cancel.set()
+            if not future.cancel():
+                await asyncio.wait([waiter])
+            raise
+
+    def shutdown(self, wait=True):
+        """Stops the threads of the runner."""
+        self._executor.shutdown(wait=wait)
+
+
+def default_runner():
+    """Returns the runner shared by the whole process.
+
+    Returns
+    -------
+    AsyncRunner
+        A runner with `DEFAULT_WORKERS` threads.
+    """
+    global _default_runner
+
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = AsyncRunner()
+        return _default_runner
+
+
+async def generate_async(
+    jobs, backend="auto", skip_unchanged=False, runner=None
+):
+    """Builds and saves many decks without blocking the event loop.
+
+    The asyncio counterpart of `thinkcell.batch.generate`: the jobs are
+    built and saved by the threads of `runner`, and a job that fails is
+    reported in its `Result`. Cancelling the call cancels every job.
+
+    Parameters
+    ----------
+    jobs : iterable
+        The descriptions of the decks, see `thinkcell.batch`.
+    backend : str
+        The name of the JSON encoder, see `Thinkcell`.
+    skip_unchanged : bool
+        Leaves the files whose content did not change untouched, see
+        `Thinkcell.save_ppttc`.
+    runner : AsyncRunner
+        The threads running the jobs. Defaults to `default_runner()`.
+
+    Returns
+    -------
+    list
+        A `Result` for every job, in the order of `jobs`.
+
+    Examples
+    --------
+    >>> results = await generate_async(jobs)
+    >>> failed = [result for result in results if not result.ok]
+    """
+    runner = runner or default_runner()
+    return await asyncio.gather(
+        *[runner.run(run_job, job, backend, skip_unchanged) for job in jobs]
+    )
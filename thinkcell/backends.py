@@ -0,0 +1,151 @@
+import json
+
+
+class Backend(object):
+    """A JSON encoder used to write `.ppttc` files.
+
+    Attributes
+    ----------
+    name : str
+        The name of the backend.
+    dumps : callable
+        Encodes a Python object into JSON bytes.
+    separator : bytes
+        The separator the encoder puts between the items of a list.
+    """
+
+    __slots__ = ("name", "dumps", "separator")
+
+    def __init__(self, name, dumps, separator):
+        self.name = name
+        self.dumps = dumps
+        self.separator = separator
+
+    def __repr__(self):
+        return f"Backend({self.name!r})"
+
+    def template_start(self, template_name):
+        """Encodes the beginning of a template, up to its first chart.
+
+        Parameters
+        ----------
+        template_name : str
+            The name of the template.
+
+        Returns
+        -------
+        bytes
+            The encoded template object up to the opening bracket of `data`.
+        """
+        encoded = self.dumps({"template": template_name, "data": []})
+        return encoded[: encoded.rindex(b"[]") + 1]
+
+
+def _json_backend():
+    return Backend("json", lambda obj: json.dumps(obj).encode(), b", ")
+
+
+def _compact_json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _with_fallback(dumps):
+    """Encodes the objects a fast encoder rejects with the standard library.
+
+    orjson and ujson only encode integers of up to 64 bits, while `json`
+    encodes integers of any size.
+    """
+
+    def encode(obj):
+        try:
+            return dumps(obj)
+        except (TypeError, OverflowError):
+            return _compact_json(obj)
+
+    return encode
+
+
+def _orjson_backend():
+    import orjson
+
+    return Backend("orjson", _with_fallback(orjson.dumps), b",")
+
+
+def _ujson_backend():
+    import ujson
+
+    def dumps(obj):
+        return ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False
+        ).encode()
+
+    return Backend("ujson", _with_fallback(dumps), b",")
+
+
+BACKENDS = {
+    "orjson": _orjson_backend,
+    "ujson": _ujson_backend,
+    "json": _json_backend,
+}
+
+# The backend picked by "auto", found on the first call of `get_backend`:
+# trying to import the packages that are missing takes longer than building
+# a deck.
+_auto = None
+
+
+def available_backends():
+    """Lists the JSON backends that can be used.
+
+    Returns
+    -------
+    list
+        The names of the installed backends, fastest first.
+    """
+    available = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def get_backend(backend="auto"):
+    """Returns a JSON backend.
+
+    Parameters
+    ----------
+    backend : str or Backend
+        "orjson", "ujson" or "json" for the standard library, "auto" to use
+        the fastest one installed, or an existing `Backend`. "auto" always
+        returns the same `Backend`.
+
+    Returns
+    -------
+    Backend
+        The JSON backend.
+
+    Raises
+    ------
+    ValueError
+        If the backend does not exist.
+    ImportError
+        If the package of the backend is not installed.
+    """
+    if isinstance(backend, Backend):
+        return backend
+
+    if backend == "auto":
+        global _auto
+        if _auto is None:
+            _auto = BACKENDS[available_backends()[0]]()
+        return _auto
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"'{backend}' is not a valid JSON backend, choose one of {list(BACKENDS)} or 'auto'."
+        )
+
+    return BACKENDS[backend]()
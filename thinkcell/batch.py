@@ -0,0 +1,299 @@
+"""Builds many `.ppttc` files in parallel.
+
+A job is a dictionary describing one deck::
+
+    {
+        "filename": "client-1.ppttc",
+        "templates": [
+            {
+                "template": "template.pptx",
+                "charts": [
+                    {"chart_name": "Chart1", "dataframe": dataframe},
+                    {
+                        "chart_name": "Chart2",
+                        "categories": ["Ads", "Revenue"],
+                        "data": [["Amazon", 1, 11], ["Slack", 8, 2]],
+                        "fill": ["#70AD47", "#ED7D31"],
+                    },
+                ],
+                "textfields": [{"field_name": "Title", "text": "Client 1"}],
+            }
+        ],
+    }
+
+Charts with a `dataframe` are added with `add_chart_from_dataframe`. Charts
+can also be read from files: `"csv"` and `"parquet"` give the name of a
+file for `add_chart_from_csv` and `add_chart_from_parquet`, and `"json"`
+the name of a JSON file holding the `categories` and `data` of `add_chart`.
+The others are added with `add_chart`.
+"""
+
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from thinkcell.stats import Stats
+from thinkcell.thinkcell import Thinkcell
+
+Result = namedtuple("Result", ["filename", "ok", "error", "written", "stats"])
+# The `defaults` argument of namedtuple needs Python 3.7.
+Result.__new__.__defaults__ = (None,)
+Result.__doc__ = """The outcome of a job.
+
+Attributes
+----------
+filename : str
+    The `filename` of the job.
+ok : bool
+    Whether the file was written.
+error : str or None
+    The exception raised by the job, if any.
+written : bool
+    Whether the file was written, False if it failed or was unchanged.
+stats : dict or None
+    The timers and counters of the job, see `Stats.as_dict`, if it was
+    profiled.
+"""
+
+
+def build(job, backend="auto"):
+    """Builds the Thinkcell object described by a job.
+
+    Parameters
+    ----------
+    job : dict
+        The description of the deck, see the module documentation.
+    backend : str
+        The JSON encoder, see `Thinkcell`.
+
+    Returns
+    -------
+    Thinkcell
+        The Thinkcell object, not saved yet.
+    """
+    return add_job(Thinkcell(backend=backend), job)
+
+
+def add_job(tc, job):
+    """Adds the templates, charts and text fields of a job to `tc`.
+
+    Parameters
+    ----------
+    tc : Thinkcell
+        The object to fill, which can be a `ThinkcellStream`.
+    job : dict
+        The description of the deck, see the module documentation.
+
+    Returns
+    -------
+    Thinkcell
+        `tc`.
+    """
+    for page in job["templates"]:
+        template = tc.add_template(page["template"])
+        for chart in page.get("charts", []):
+            if "dataframe" in chart:
+                tc.add_chart_from_dataframe(
+                    template_name=template,
+                    chart_name=chart["chart_name"],
+                    dataframe=chart["dataframe"],
+                    fill=chart.get("fill"),
+                )
+            elif "csv" in chart:
+                tc.add_chart_from_csv(
+                    template_name=template,
+                    chart_name=chart["chart_name"],
+                    filename=chart["csv"],
+                    fill=chart.get("fill"),
+                )
+            elif "parquet" in chart:
+                tc.add_chart_from_parquet(
+                    template_name=template,
+                    chart_name=chart["chart_name"],
+                    filename=chart["parquet"],
+                    fill=chart.get("fill"),
+                )
+            elif "json" in chart:
+                with open(chart["json"], encoding="utf-8") as infile:
+                    content = json.load(infile)
+                tc.add_chart(
+                    template_name=template,
+                    chart_name=chart["chart_name"],
+                    categories=content["categories"],
+                    data=content["data"],
+                    fill=chart.get("fill", content.get("fill")),
+                )
+            else:
+                tc.add_chart(
+                    template_name=template,
+                    chart_name=chart["chart_name"],
+                    categories=chart["categories"],
+                    data=chart["data"],
+                    fill=chart.get("fill"),
+                )
+        for field in page.get("textfields", []):
+            tc.add_textfield(
+                template_name=template,
+                field_name=field["field_name"],
+                text=field["text"],
+            )
+    return tc
+
+
+def run(
+    job,
+    backend="auto",
+    skip_unchanged=False,
+    cancel=None,
+    stream=False,
+    profile=False,
+):
+    """Builds and saves a job, reporting errors instead of raising them.
+
+    Parameters
+    ----------
+    job : dict
+        The description of the deck, see the module documentation.
+    backend : str
+        The JSON encoder, see `Thinkcell`.
+    skip_unchanged : bool
+        Leaves the file untouched if its content did not change, see
+        `Thinkcell.save_ppttc`.
+    cancel : threading.Event
+        Stops the save when it is set, without leaving a partial file, see
+        `thinkcell.aio`.
+    stream : bool
+        Writes every chart to the file as soon as it is added, see
+        `Thinkcell.open_stream`, instead of saving the whole deck at the
+        end. Cannot be combined with `skip_unchanged`.
+    profile : bool
+        Times the stages of the job and returns them in `Result.stats`.
+
+    Returns
+    -------
+    Result
+        The outcome of the job.
+    """
+    filename = job.get("filename")
+    stats = Stats() if profile else None
+    try:
+        if stream and skip_unchanged:
+            raise ValueError(
+                "A streamed file is always written, it cannot skip unchanged content."
+            )
+        if stream:
+            with Thinkcell.open_stream(
+                filename, backend=backend, stats=stats
+            ) as tc:
+                add_job(tc, job)
+            written = True
+        else:
+            tc = add_job(Thinkcell(backend=backend, stats=stats), job)
+            written = tc._save_ppttc(filename, skip_unchanged, cancel)
+    except Exception as error:
+        error = f"{type(error).__name__}: {error}"
+        return Result(filename, False, error, False, _profile(stats))
+    return Result(filename, True, None, written, _profile(stats))
+
+
+def _profile(stats):
+    return None if stats is None else stats.as_dict()
+
+
+def _run_chunk(jobs, backend, skip_unchanged, stream=False, profile=False):
+    return [
+        run(
+            job,
+            backend=backend,
+            skip_unchanged=skip_unchanged,
+            stream=stream,
+            profile=profile,
+        )
+        for job in jobs
+    ]
+
+
+def _chunks(jobs, size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate(
+    jobs,
+    workers=None,
+    chunksize=8,
+    backend="auto",
+    skip_unchanged=False,
+    stream=False,
+    profile=False,
+):
+    """Builds and saves many decks across a pool of processes.
+
+    A job that fails is reported in its `Result` and does not stop the
+    others. Jobs are sent to the workers in chunks, so that DataFrames and
+    results are pickled in a few large messages rather than many small ones.
+
+    Parameters
+    ----------
+    jobs : iterable
+        The descriptions of the decks, see the module documentation.
+    workers : int
+        The number of processes. Defaults to the number of CPUs. With 1,
+        the jobs run in the current process.
+    chunksize : int
+        The number of jobs sent to a worker at once.
+    backend : str
+        The name of the JSON encoder, see `Thinkcell`.
+    skip_unchanged : bool
+        Leaves the files whose content did not change untouched, see
+        `Thinkcell.save_ppttc`. Their `Result` has `written` set to False.
+    stream : bool
+        Writes the charts of every deck as they are added, see `run`.
+    profile : bool
+        Times the stages of every job, see `run`.
+
+    Returns
+    -------
+    list
+        A `Result` for every job, in the order of `jobs`.
+
+    Examples
+    --------
+    >>> results = generate(jobs, workers=4)
+    >>> failed = [result for result in results if not result.ok]
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError(f"You need at least one worker, not {workers}.")
+
+    options = (backend, skip_unchanged, stream, profile)
+    if workers == 1:
+        return _run_chunk(jobs, *options)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (
+                chunk,
+                executor.submit(_run_chunk, chunk, *options),
+            )
+            for chunk in _chunks(jobs, chunksize)
+        ]
+        for chunk, future in futures:
+            try:
+                results.extend(future.result())
+            except Exception as error:
+                results.extend(
+                    Result(job.get("filename"), False, repr(error), False)
+                    for job in chunk
+                )
+    return results
@@ -0,0 +1,63 @@
+"""Builders filling the slides of a deck from several threads.
+
+A `SlideBuilder` is bound to one slide of a `Thinkcell` object, created by
+`Thinkcell.add_slide`. Its methods are those of `Thinkcell` without the
+`template_name` argument, and only change the `data` list of that slide, so
+builders of different slides need no lock between them. The order of the
+slides is fixed when the builders are created, which keeps the saved deck
+the same whatever the order in which the threads finish.
+"""
+
+METHODS = (
+    "add_chart",
+    "add_chart_from_dataframe",
+    "add_chart_from_long_dataframe",
+    "add_chart_from_csv",
+    "add_chart_from_parquet",
+    "add_chart_from_arrow",
+    "add_textfield",
+    "replace_chart",
+    "replace_chart_from_dataframe",
+    "replace_textfield",
+    "update_chart",
+)
+
+
+def _slide_method(name):
+    def method(self, *args, **kwargs):
+        return getattr(self.thinkcell, name)(self.handle, *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = (
+        f"Calls `Thinkcell.{name}` with the template of the slide."
+    )
+    return method
+
+
+class SlideBuilder(object):
+    """Adds charts and text fields to one slide of a `Thinkcell` object.
+
+    A builder must only be used by one thread at a time. Builders of
+    different slides can be used at the same time.
+
+    Attributes
+    ----------
+    thinkcell : Thinkcell
+        The object the slide belongs to.
+    handle : int
+        The handle of the slide, see `Thinkcell.add_template`.
+    """
+
+    __slots__ = ("thinkcell", "handle")
+
+    def __init__(self, thinkcell, handle):
+        self.thinkcell = thinkcell
+        self.handle = handle
+
+    def __repr__(self):
+        template = self.thinkcell._template_name(self.handle)
+        return f"SlideBuilder({template!r}, handle={self.handle})"
+
+
+for name in METHODS:
+    setattr(SlideBuilder, name, _slide_method(name))
@@ -0,0 +1,219 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class TableCache(object):
+    """A bounded cache of chart tables, shared by identical charts.
+
+    The tables are keyed by a hash of the content they were built from, so a
+    chart that is added several times, to one or several Thinkcell objects,
+    is only converted once. Cached tables must not be modified. The cache
+    can be used from several threads: tables are built outside of its lock,
+    so two threads may build the same table once each.
+
+    Attributes
+    ----------
+    maxsize : int
+        The number of tables kept, the least recently used are evicted first.
+    hits : int
+        The number of tables that were found in the cache.
+    misses : int
+        The number of tables that had to be built.
+    """
+
+    def __init__(self, maxsize=128):
+        """Initializes an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int
+            The number of tables kept.
+        """
+        if maxsize < 1:
+            raise ValueError(
+                f"The cache size should be positive, not {maxsize}."
+            )
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tables)
+
+    def get(self, key, build):
+        """Returns the table cached under `key`, building it if needed.
+
+        Parameters
+        ----------
+        key : bytes or None
+            The hash of the content of the table. None disables the cache.
+        build : callable
+            Builds the table when it is not cached.
+
+        Returns
+        -------
+        Table
+            The cached or built table.
+        """
+        if key is None:
+            return build()
+
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self.hits += 1
+                self._tables.move_to_end(key)
+                return table
+
+        table = build()
+        with self._lock:
+            self.misses += 1
+            self._tables[key] = table
+            if len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return table
+
+    def stats(self):
+        """Returns the counters of the cache.
+
+        Returns
+        -------
+        dict
+            The `hits`, `misses`, current `size` and `maxsize` of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._tables),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """Empties the cache and resets its counters."""
+        with self._lock:
+            self._tables.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.digest()
+
+
+def _value_part(value):
+    """Hashes arrays by their content and other values by their `repr`.
+
+    Lists and tuples holding arrays, such as a list of rows, are hashed item
+    by item, since the `repr` of large arrays is truncated.
+    """
+    if isinstance(value, (list, tuple)) and any(
+        hasattr(item, "dtype") for item in value
+    ):
+        return _digest(b"items", *[_value_part(item) for item in value])
+    if not hasattr(value, "dtype"):
+        return repr(value).encode()
+
+    import numpy as np
+
+    array = np.asarray(value)
+    if array.dtype.kind == "O":
+        return repr((array.shape, array.tolist())).encode()
+    header = repr((array.dtype.str, array.shape)).encode()
+    return header + np.ascontiguousarray(array).tobytes()
+
+
+def _fill_part(fill, missing):
+    """Hashes the fill and missing value policy of a chart.
+
+    Returns
+    -------
+    bytes or None
+        The part of the key, or None if the fill rules cannot be hashed.
+    """
+    if not hasattr(fill, "cache_key"):
+        return repr((fill, missing)).encode()
+    key = fill.cache_key()
+    return None if key is None else key + repr(missing).encode()
+
+
+def rows_key(categories, data, fill=None, missing="empty"):
+    """Hashes the arguments of `add_chart`.
+
+    Lists are hashed with their `repr` and NumPy arrays with their content,
+    since the `repr` of large arrays is truncated.
+
+    Returns
+    -------
+    bytes or None
+        The key of the table, or None if it cannot be cached.
+    """
+    fill = _fill_part(fill, missing)
+    if fill is None:
+        return None
+    return _digest(b"rows", _value_part(categories), _value_part(data), fill)
+
+
+def dataframe_key(dataframe, fill=None, missing="empty"):
+    """Hashes the arguments of `add_chart_from_dataframe`.
+
+    Numeric, date and string columns are hashed with pandas. Other columns,
+    the column names, dtypes, fill and missing value policy are hashed with
+    their `repr`, which tells apart values such as `1` and `"1"`.
+
+    Returns
+    -------
+    bytes or None
+        The key of the table, or None if it cannot be cached.
+    """
+    fill = _fill_part(fill, missing)
+    if fill is None:
+        return None
+
+    from pandas import StringDtype
+    from pandas.util import hash_pandas_object
+
+    hashes = []
+    for _, column in dataframe.items():
+        if column.dtype.kind in "biufM" or isinstance(
+            column.dtype, StringDtype
+        ):
+            hashed = hash_pandas_object(column, index=False).to_numpy()
+            hashes.append(hashed.tobytes())
+        else:
+            hashes.append(repr(column.tolist()).encode())
+
+    header = (
+        "dataframe",
+        list(dataframe.columns),
+        [str(dtype) for dtype in dataframe.dtypes],
+    )
+    return _digest(repr(header).encode(), fill, *hashes)
+
+
+def long_dataframe_key(
+    dataframe, columns, options, fill=None, missing="empty"
+):
+    """Hashes the arguments of `add_chart_from_long_dataframe`.
+
+    Only the `columns` of `dataframe` that are pivoted are hashed, see
+    `dataframe_key`. A callable aggregation in `options` cannot be hashed
+    reliably, so it disables the cache.
+
+    Returns
+    -------
+    bytes or None
+        The key of the table, or None if it cannot be cached.
+    """
+    if any(callable(option) for option in options):
+        return None
+    key = dataframe_key(dataframe[list(columns)], fill, missing)
+    if key is None:
+        return None
+    return _digest(b"long", key, _value_part(options))
@@ -0,0 +1,274 @@
+"""The `thinkcell` command line.
+
+`thinkcell build manifest.json` builds the decks described by a manifest,
+a JSON or YAML file holding a list of jobs in the format of
+`thinkcell.batch`, or a mapping with that list under `decks`::
+
+    decks:
+      - filename: client-1.ppttc
+        templates:
+          - template: template.pptx
+            charts:
+              - {chart_name: Chart1, csv: data/chart1.csv}
+              - {chart_name: Chart2, parquet: data/chart2.parquet}
+              - {chart_name: Chart3, json: data/chart3.json}
+            textfields:
+              - {field_name: Title, text: Client 1}
+
+The output files and data files are relative to the manifest. Nothing
+heavier than the standard library is imported until a manifest needs it:
+PyYAML for YAML manifests, pyarrow for Parquet files.
+
+`thinkcell serve` renders decks sent over HTTP, see `thinkcell.server`.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+FILE_KEYS = ("csv", "parquet", "json")
+
+
+def load_manifest(filename):
+    """Reads the jobs of a manifest.
+
+    Parameters
+    ----------
+    filename : str
+        The name of a `.json`, `.yaml` or `.yml` file.
+
+    Returns
+    -------
+    list
+        The jobs, with their files relative to the manifest made absolute.
+
+    Raises
+    ------
+    ValueError
+        If the manifest cannot be read or has no list of decks.
+    """
+    with open(filename, encoding="utf-8") as infile:
+        if filename.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(
+                    "Reading YAML manifests needs PyYAML, install it with 'pip install pyyaml' or use a JSON manifest."
+                )
+            try:
+                manifest = yaml.safe_load(infile)
+            except yaml.YAMLError as error:
+                raise ValueError(f"{filename} is not valid YAML: {error}")
+        else:
+            manifest = json.load(infile)
+
+    if isinstance(manifest, dict):
+        manifest = manifest.get("decks")
+    if not isinstance(manifest, list):
+        raise ValueError(
+            f"The manifest '{filename}' should contain a list of decks, or a mapping with one under 'decks'."
+        )
+
+    folder = os.path.dirname(os.path.abspath(filename))
+    for job in manifest:
+        if not isinstance(job, dict) or "filename" not in job:
+            raise ValueError(
+                f"Every deck of the manifest '{filename}' needs a 'filename', not {job!r}."
+            )
+        job["filename"] = os.path.join(folder, job["filename"])
+        for page in job.get("templates", []):
+            for chart in page.get("charts", []):
+                for key in FILE_KEYS:
+                    if key in chart:
+                        chart[key] = os.path.join(folder, chart[key])
+    return manifest
+
+
+def format_profile(results, seconds):
+    """Sums the timers and counters of the results into a table.
+
+    Returns
+    -------
+    str
+        The time spent in every stage, with its share of the total, and the
+        counters.
+    """
+    timers, counters = {}, {}
+    for result in results:
+        if result.stats is None:
+            continue
+        for stage, value in result.stats["timers"].items():
+            timers[stage] = timers.get(stage, 0.0) + value
+        for counter, value in result.stats["counters"].items():
+            counters[counter] = counters.get(counter, 0) + value
+
+    total = sum(timers.values()) or 1.0
+    lines = [f"{'stage':<12} {'seconds':>10} {'share':>7}"]
+    for stage, value in sorted(timers.items(), key=lambda item: -item[1]):
+        lines.append(f"{stage:<12} {value:>10.4f} {value / total:>7.1%}")
+    lines.append(f"{'total':<12} {sum(timers.values()):>10.4f}")
+    lines.append(f"{'wall':<12} {seconds:>10.4f}")
+    lines.extend(
+        f"{counter:<12} {value:>10}"
+        for counter, value in sorted(counters.items())
+    )
+    return "\n".join(lines)
+
+
+def build(args):
+    """Runs `thinkcell build`, returns the exit status."""
+    start = time.perf_counter()
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as error:
+        print(f"thinkcell: {error}", file=sys.stderr)
+        return 2
+
+    from thinkcell.batch import generate
+
+    try:
+        results = generate(
+            jobs,
+            workers=args.workers,
+            backend=args.backend,
+            skip_unchanged=args.skip_unchanged,
+            stream=args.stream and not args.skip_unchanged,
+            profile=args.profile,
+        )
+    except ValueError as error:
+        print(f"thinkcell: {error}", file=sys.stderr)
+        return 2
+    seconds = time.perf_counter() - start
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"failed: {result.filename}: {result.error}", file=sys.stderr)
+    if not args.quiet:
+        written = sum(result.written for result in results)
+        print(
+            f"Built {len(results) - len(failed)} of {len(results)} decks "
+            f"({written} written) in {seconds:.2f} s."
+        )
+    if args.profile:
+        print(format_profile(results, seconds))
+    return 1 if failed else 0
+
+
+def serve(args):
+    """Runs `thinkcell serve` until it is interrupted."""
+    from thinkcell import server
+
+    print(f"Serving on http://{args.host}:{args.port}", flush=True)
+    server.serve(
+        args.host,
+        args.port,
+        max_concurrency=args.concurrency,
+        backend=args.backend,
+        inspector=args.inspect or None,
+        quiet=args.quiet,
+    )
+    return 0
+
+
+def make_parser():
+    """Returns the parser of the command line."""
+    parser = argparse.ArgumentParser(
+        prog="thinkcell",
+        description="Generates think-cell .ppttc files.",
+    )
+    # The `required` argument of add_subparsers needs Python 3.7.
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    command = commands.add_parser(
+        "build",
+        help="build the decks of a manifest",
+        description="Builds the decks described by a JSON or YAML manifest.",
+    )
+    command.add_argument("manifest", help="the JSON or YAML manifest")
+    command.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="the number of processes building decks (default: 1)",
+    )
+    command.add_argument(
+        "--backend",
+        default="auto",
+        help="the JSON encoder: orjson, ujson, json or auto (default)",
+    )
+    command.add_argument(
+        "--no-stream",
+        dest="stream",
+        action="store_false",
+        help="build every deck in memory before writing it",
+    )
+    command.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="leave the files whose content did not change untouched",
+    )
+    command.add_argument(
+        "--profile",
+        action="store_true",
+        help="print the time spent in every stage of the build",
+    )
+    command.add_argument(
+        "-q", "--quiet", action="store_true", help="only print errors"
+    )
+    command.set_defaults(func=build)
+
+    command = commands.add_parser(
+        "serve",
+        help="render decks over HTTP",
+        description="Renders decks sent as JSON over HTTP, see thinkcell.server.",
+    )
+    command.add_argument(
+        "--host", default="127.0.0.1", help="default: 127.0.0.1"
+    )
+    command.add_argument(
+        "--port", type=int, default=8000, help="default: 8000"
+    )
+    command.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="the number of decks built at once (default: 4)",
+    )
+    command.add_argument(
+        "--backend",
+        default="auto",
+        help="the JSON encoder: orjson, ujson, json or auto (default)",
+    )
+    command.add_argument(
+        "--inspect",
+        action="store_true",
+        help="check the chart names against the templates of the working directory",
+    )
+    command.add_argument(
+        "-q", "--quiet", action="store_true", help="do not log the requests"
+    )
+    command.set_defaults(func=serve)
+    return parser
+
+
+def main(argv=None):
+    """Runs the command line.
+
+    Parameters
+    ----------
+    argv : list
+        The arguments, defaults to `sys.argv[1:]`.
+
+    Returns
+    -------
+    int
+        The exit status: 0 if every deck was built, 1 if some failed, and 2
+        if the manifest could not be read.
+    """
+    args = make_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,302 @@
+"""Fill colours decided cell by cell from the values of a chart.
+
+A `FillRules` object is passed as the `fill` of any `add_chart` method,
+instead of a list with one colour per series. Its rules are evaluated on
+the whole table at once, with NumPy, when the chart is added::
+
+    rules = (
+        FillRules()
+        .below(0, "#C00000")
+        .top(0.1, "#00B050")
+        .column("Status", {"late": "#FFC000"})
+    )
+    tc.add_chart_from_dataframe("template.pptx", "Chart1", dataframe, rules)
+
+Every cell takes the colour of the first rule it matches, and the cells
+that match no rule, the empty cells and the names of the series have no
+fill. The rules on values only match numbers: strings and dates never
+match them. The colours are stored once per chart and shared by its
+cells.
+"""
+
+import hashlib
+
+
+class FillRules(object):
+    """An ordered list of rules giving a fill colour to the cells of a chart.
+
+    The methods adding a rule return a new object, so a set of rules can be
+    extended without changing it.
+
+    Attributes
+    ----------
+    rules : tuple
+        The rules, as tuples of their name, parameters and colour.
+    """
+
+    __slots__ = ("rules",)
+
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)
+
+    def __repr__(self):
+        return f"FillRules({list(self.rules)!r})"
+
+    def _add(self, *rule):
+        return FillRules(self.rules + (rule,))
+
+    def below(self, value, color, inclusive=False):
+        """Fills the numbers lower than `value`, or equal if `inclusive`."""
+        return self._add("below", (value, inclusive), color)
+
+    def above(self, value, color, inclusive=False):
+        """Fills the numbers greater than `value`, or equal if `inclusive`."""
+        return self._add("above", (value, inclusive), color)
+
+    def between(self, lower, upper, color):
+        """Fills the numbers from `lower` to `upper`, both included."""
+        return self._add("between", (lower, upper), color)
+
+    def top(self, fraction, color):
+        """Fills the largest `fraction` of the numbers of the chart.
+
+        The cells from the `1 - fraction` quantile of the chart up are
+        filled, so `top(0.1, color)` fills the top decile.
+        """
+        _check_fraction(fraction)
+        return self._add("top", (fraction,), color)
+
+    def bottom(self, fraction, color):
+        """Fills the smallest `fraction` of the numbers of the chart."""
+        _check_fraction(fraction)
+        return self._add("bottom", (fraction,), color)
+
+    def quantiles(self, colors):
+        """Splits the numbers of the chart in as many quantiles as `colors`.
+
+        The first colour fills the smallest numbers and the last colour the
+        largest, such as `quantiles(["#F8696B", "#FFEB84", "#63BE7B"])` for
+        a three colour scale.
+        """
+        if not len(colors):
+            raise ValueError("Give at least one colour to 'quantiles'.")
+        return self._add("quantiles", (), tuple(colors))
+
+    def where(self, predicate, color):
+        """Fills the cells selected by `predicate`.
+
+        `predicate` is called with the numbers of the chart, a float array
+        with one row per series and NaN for the cells that are not numbers,
+        and returns a boolean array of the same shape.
+        """
+        return self._add("where", (predicate,), color)
+
+    def colors(self, colors):
+        """Gives their colours to the cells.
+
+        `colors` is a list or array with the colour of every series, or a
+        two-dimensional one with the colour of every cell, one row per
+        series. None, NaN and empty strings leave the cells unfilled.
+        """
+        return self._add("colors", (), colors)
+
+    def column(self, name, mapping=None):
+        """Gives every series the colour of a column of the DataFrame.
+
+        Only for `add_chart_from_dataframe`, which leaves the column out of
+        the categories. The column holds colours, or keys of `mapping`; the
+        values that are not in `mapping` leave their series unfilled.
+        """
+        return self._add("column", (name, mapping), None)
+
+    @property
+    def columns(self):
+        """list: The DataFrame columns read by the `column` rules."""
+        return [
+            params[0] for name, params, _ in self.rules if name == "column"
+        ]
+
+    def bind(self, dataframe):
+        """Reads the `column` rules from a DataFrame.
+
+        Returns
+        -------
+        tuple
+            The rules, with `colors` rules in place of the `column` rules,
+            and the DataFrame without their columns.
+
+        Raises
+        ------
+        ValueError
+            If a column does not exist.
+        """
+        if not self.columns:
+            return self, dataframe
+
+        rules = []
+        for name, params, color in self.rules:
+            if name == "column":
+                column, mapping = params
+                if column not in dataframe.columns:
+                    raise ValueError(
+                        f"The DataFrame you passed has no column {column!r} to read the fill from."
+                    )
+                colors = dataframe[column]
+                if mapping is not None:
+                    colors = colors.map(mapping)
+                name, params, color = "colors", (), colors.to_numpy(object)
+            rules.append((name, params, color))
+        return FillRules(rules), dataframe.drop(columns=self.columns)
+
+    def cache_key(self):
+        """Returns a key telling these rules apart, or None.
+
+        Rules with a predicate cannot be told apart reliably, so they have
+        no key and disable the cache of the chart.
+        """
+        parts = []
+        for name, params, color in self.rules:
+            if name == "where":
+                return None
+            if name == "colors":
+                import numpy as np
+
+                array = np.asarray(color, dtype=object)
+                digest = hashlib.blake2b(
+                    repr((array.shape, array.tolist())).encode(),
+                    digest_size=16,
+                )
+                color = digest.hexdigest()
+            parts.append((name, params, color))
+        return repr(parts).encode()
+
+    def evaluate(self, columns):
+        """Decides the fill of every cell of a table.
+
+        Parameters
+        ----------
+        columns : list
+            The type and values of the columns of the table, the first one
+            holding the names of the series, see `Table`.
+
+        Returns
+        -------
+        tuple
+            The list of the colours used, and an array of their index for
+            every cell, one row per series and one column per category, -1
+            for the cells without fill.
+
+        Raises
+        ------
+        ValueError
+            If the rules contain a `column` rule, or colours that do not
+            have the shape of the chart.
+        """
+        import numpy as np
+
+        n_series = len(columns[0][1])
+        numbers = np.empty((n_series, len(columns) - 1))
+        for j, (kind, values) in enumerate(columns[1:]):
+            numbers[:, j] = _numbers(np, kind, values)
+        finite = np.isfinite(numbers)
+        filled = numbers[finite]
+
+        palette, codes = {}, np.full(numbers.shape, -1, dtype=np.int32)
+        for name, params, color in self.rules:
+            if name == "column":
+                raise ValueError(
+                    f"The fill rule on the column {params[0]!r} can only be used with 'add_chart_from_dataframe'."
+                )
+            if name == "colors":
+                rule = _color_codes(np, color, numbers.shape, palette)
+            elif name == "quantiles":
+                rule = np.full(numbers.shape, -1, dtype=np.int32)
+                if filled.size:
+                    steps = np.linspace(0, 1, len(color) + 1)[1:-1]
+                    edges = np.quantile(filled, steps)
+                    bins = np.searchsorted(edges, numbers[finite], "right")
+                    indexes = np.array(
+                        [palette.setdefault(c, len(palette)) for c in color]
+                    )
+                    rule[finite] = indexes[bins]
+            else:
+                mask = _mask(np, name, params, numbers, finite, filled)
+                index = palette.setdefault(color, len(palette))
+                rule = np.where(mask, index, -1)
+            free = codes < 0
+            codes[free] = rule[free]
+        return list(palette), codes
+
+
+def _check_fraction(fraction):
+    if not 0 < fraction <= 1:
+        raise ValueError(
+            f"The fraction of the cells should be in (0, 1], not {fraction}."
+        )
+
+
+def _numbers(np, kind, values):
+    """Returns the numbers of a column as floats, NaN for other cells."""
+    if isinstance(kind, str):
+        if kind != "number":
+            return np.nan
+        if hasattr(values, "dtype"):
+            return values
+        return np.array(values, dtype=float)
+    return np.array(
+        [
+            value if kind == "number" and value is not None else np.nan
+            for kind, value in zip(kind, values)
+        ],
+        dtype=float,
+    )
+
+
+def _mask(np, name, params, numbers, finite, filled):
+    """Returns the cells matched by a rule on the values."""
+    with np.errstate(invalid="ignore"):
+        if name == "below":
+            value, inclusive = params
+            return numbers <= value if inclusive else numbers < value
+        if name == "above":
+            value, inclusive = params
+            return numbers >= value if inclusive else numbers > value
+        if name == "between":
+            lower, upper = params
+            return (numbers >= lower) & (numbers <= upper)
+        if name == "where":
+            mask = np.asarray(params[0](numbers), dtype=bool)
+            if mask.shape != numbers.shape:
+                raise ValueError(
+                    f"The fill predicate should return an array of shape {numbers.shape}, not {mask.shape}."
+                )
+            return mask
+        if not filled.size:
+            return np.zeros(numbers.shape, dtype=bool)
+        if name == "top":
+            return finite & (numbers >= np.quantile(filled, 1 - params[0]))
+        return finite & (numbers <= np.quantile(filled, params[0]))
+
+
+def _color_codes(np, colors, shape, palette):
+    """Returns the palette index of explicit colours, -1 for no colour."""
+    colors = np.asarray(colors, dtype=object)
+    if colors.ndim == 1 and len(colors) == shape[0]:
+        colors = np.repeat(colors[:, None], shape[1], axis=1)
+    if colors.shape != shape:
+        raise ValueError(
+            f"The fill colours should have one colour per series, {shape[0]}, or per cell, {shape}, not the shape {colors.shape}."
+        )
+    unique, inverse = np.unique(colors.astype(str), return_inverse=True)
+    indexes = np.array(
+        [
+            (
+                -1
+                if color in ("", "None", "nan", "<NA>")
+                else palette.setdefault(color, len(palette))
+            )
+            for color in unique.tolist()
+        ],
+        dtype=np.int32,
+    )
+    return indexes[inverse.reshape(shape)]
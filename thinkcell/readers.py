@@ -0,0 +1,218 @@
+"""Reads chart tables from files without going through pandas."""
+
+import csv
+import re
+from array import array
+from itertools import islice
+from math import isfinite
+
+from thinkcell.table import column_from_values, with_missing
+
+KINDS = ("int", "float", "date", "string")
+ISO_DATE = (
+    # The days of every month, then the 29th of February of leap years.
+    r"(?!0000)(?:[0-9]{4}-(?:(?:0[1-9]|1[0-2])-(?:0[1-9]|1[0-9]|2[0-8])"
+    r"|(?:0[13-9]|1[0-2])-(?:29|30)|(?:0[13578]|1[02])-31)"
+    r"|(?:[0-9]{2}(?:0[48]|[2468][048]|[13579][26])"
+    r"|(?:[02468][048]|[13579][26])00)-02-29)"
+    # An optional time and offset.
+    r"(?:[T ](?:[01][0-9]|2[0-3])"
+    r"(?::[0-5][0-9](?::[0-5][0-9](?:\.[0-9]{1,6})?)?)?"
+    r"(?:Z|[+-][0-9]{2}:[0-9]{2})?)?"
+)
+ISO_DATES = re.compile(f"(?:{ISO_DATE}\n)*{ISO_DATE}")
+
+
+class _Upgrade(Exception):
+    """Raised when a column needs a type its parsed values cannot take."""
+
+    def __init__(self, column, kind):
+        self.column = column
+        self.kind = kind
+
+
+def _parse_date(values):
+    """Returns the day of ISO 8601 dates, `YYYY-MM-DD` with an optional time.
+
+    `datetime.fromisoformat` needs Python 3.7, and the forms it accepts
+    depend on the version of Python. The values are joined by line breaks
+    and checked with a single pattern.
+
+    Raises
+    ------
+    ValueError
+        If a value is not such a date.
+    """
+    if not values:
+        return []
+    joined = "\n".join(values)
+    if joined.count("\n") != len(values) - 1 or not ISO_DATES.fullmatch(
+        joined
+    ):
+        single = re.compile(ISO_DATE)
+        value = next(value for value in values if not single.fullmatch(value))
+        raise ValueError(f"Invalid isoformat string: {value!r}")
+    return [value[:10] for value in values]
+
+
+PARSERS = {
+    "int": lambda values: array("q", map(int, values)),
+    "float": lambda values: array("d", map(float, values)),
+    "date": _parse_date,
+    "string": list,
+}
+
+
+class _CsvColumn(object):
+    """A column of a CSV file, parsed one chunk of rows at a time."""
+
+    __slots__ = ("index", "kind", "values", "cells", "empty", "size")
+
+    def __init__(self, index, kind):
+        self.index = index
+        self.kind = kind
+        self.values = PARSERS[kind](())
+        self.cells = []
+        self.empty = 0
+        self.size = 0
+
+    def add(self, strings):
+        """Parses the strings of a chunk, upgrading the type if needed.
+
+        Raises
+        ------
+        _Upgrade
+            If the column needs a type that its parsed values cannot be
+            converted to.
+        """
+        present = strings
+        if "" in strings:
+            present = [value for value in strings if value]
+
+        while True:
+            try:
+                parsed = PARSERS[self.kind](present)
+                break
+            except (ValueError, OverflowError):
+                self._upgrade(KINDS[KINDS.index(self.kind) + 1])
+
+        if len(present) != len(strings):
+            self.cells.extend(
+                self.size + i for i, value in enumerate(strings) if not value
+            )
+            self.empty += len(strings) - len(present)
+            parsed = self._with_placeholders(strings, parsed)
+        self.values.extend(parsed)
+
+        if self.kind == "float" and not isfinite(sum(parsed)):
+            self.cells.extend(
+                self.size + i
+                for i, value in enumerate(parsed)
+                if not isfinite(value)
+            )
+            self.cells.sort()
+        self.size += len(strings)
+
+    def _upgrade(self, kind):
+        if self.kind == "int" and kind == "float":
+            self.values = array("d", self.values)
+        elif self.empty == self.size:
+            self.values = PARSERS[kind](())
+            self.values.extend(self._placeholder(kind) for _ in self.cells)
+        else:
+            raise _Upgrade(self.index, kind)
+        self.kind = kind
+
+    @staticmethod
+    def _placeholder(kind):
+        return "" if kind in ("date", "string") else 0
+
+    def _with_placeholders(self, strings, parsed):
+        placeholder = self._placeholder(self.kind)
+        values = iter(parsed)
+        return [next(values) if value else placeholder for value in strings]
+
+    def column(self, missing):
+        """Returns the type and raw values of the column."""
+        kind = "number" if self.kind in ("int", "float") else self.kind
+        return with_missing(kind, self.values, self.cells, missing)
+
+
+def read_csv(
+    filename, missing="empty", encoding="utf-8", chunksize=256, **fmtparams
+):
+    """Reads a CSV file laid out like the DataFrames of `Thinkcell`.
+
+    The first row contains the categories after a first cell that is
+    ignored, every other row the name of a series followed by its values.
+    The rows are read in chunks and every column is parsed as soon as a
+    chunk is read, so that only the parsed values are kept in memory. The
+    type of every column is inferred from its values: integers, then
+    floats, then ISO dates, and strings otherwise. Empty strings are missing
+    values. If a column turns out to contain dates or strings after numbers,
+    the file is read again with the right type.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file.
+    missing : str
+        The policy for empty, NaN and infinite values, see `with_missing`.
+    encoding : str
+        The encoding of the file.
+    chunksize : int
+        The number of rows parsed at once.
+    **fmtparams
+        The format of the file, see `csv.reader`.
+
+    Returns
+    -------
+    tuple
+        The categories, the columns as `(kind, values)` tuples, and the set
+        of the lengths of the rows.
+
+    Raises
+    ------
+    ValueError
+        If the file does not contain data.
+    """
+    kinds = {}
+    while True:
+        try:
+            return _read_csv(
+                filename, missing, encoding, chunksize, fmtparams, kinds
+            )
+        except _Upgrade as upgrade:
+            kinds[upgrade.column] = upgrade.kind
+
+
+def _read_csv(filename, missing, encoding, chunksize, fmtparams, kinds):
+    with open(filename, newline="", encoding=encoding) as infile:
+        reader = csv.reader(infile, **fmtparams)
+        header = next(reader, [])
+        columns = [
+            _CsvColumn(j, kinds.get(j, "int")) for j in range(len(header))
+        ]
+        lengths = set()
+        while True:
+            chunk = list(islice(reader, chunksize))
+            if not chunk:
+                break
+            chunk = [row for row in chunk if row]
+            lengths.update(map(len, chunk))
+            try:
+                for column, strings in zip(columns, zip(*chunk)):
+                    column.add(strings)
+            except _Upgrade:
+                kinds.update((column.index, column.kind) for column in columns)
+                raise
+
+    if len(header) < 2 or not lengths:
+        raise ValueError(f"The file {filename} does not contain data.")
+
+    categories = column_from_values(header[1:], missing)
+    return (
+        categories,
+        [column.column(missing) for column in columns],
+        lengths,
+    )
@@ -0,0 +1,448 @@
+"""A local HTTP service rendering `.ppttc` files.
+
+The server keeps the work that does not depend on the request between
+requests: the JSON backend, a `TableCache` of the charts, the names of the
+charts of the templates when an inspector is enabled, and compiled layouts.
+It only uses the standard library::
+
+    thinkcell serve --port 8000
+
+    POST /render                 a deck, in the format of `thinkcell.batch`
+    PUT  /layouts/<name>         compiles a deck into a layout, see
+                                 `Thinkcell.compile`
+    POST /layouts/<name>/render  {"data": {"Chart1": [[1, 2]], ...}}
+    GET  /health                 the counters and timers of the server
+
+Every response has a `Content-Length`, so clients can keep their
+connection open between requests. At most `max_concurrency` decks are
+built at once; the other requests wait up to `queue_timeout` seconds for
+their turn and are answered with 503 after that. The charts of a request
+carry their data: the file keys of `thinkcell.batch` are refused, so that
+a request cannot read the files of the server. When an inspector is
+enabled, the templates are read relative to the working directory of the
+server: absolute paths and `..` are refused, and the errors only give the
+name of the template.
+"""
+
+import json
+import ntpath
+import posixpath
+import re
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from thinkcell.backends import get_backend
+from thinkcell.batch import add_job
+from thinkcell.cache import TableCache
+from thinkcell.stats import Stats
+from thinkcell.thinkcell import DataFrameError, Thinkcell
+
+FILE_KEYS = ("csv", "parquet", "json", "dataframe")
+LAYOUT_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+class RequestError(ValueError):
+    """An invalid request, answered with its HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderServer(ThreadingMixIn, HTTPServer):
+    """A threaded HTTP server rendering decks.
+
+    Attributes
+    ----------
+    backend : Backend
+        The JSON encoder of every deck.
+    cache : TableCache
+        The tables of the charts, shared by every request.
+    inspector : TemplateInspector or None
+        Verifies the names of the charts against the templates.
+    stats : Stats
+        The timers of every stage and the counters of the server.
+    """
+
+    # The same as http.server.ThreadingHTTPServer, which needs Python 3.7.
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 8000),
+        max_concurrency=4,
+        queue_timeout=10.0,
+        backend="auto",
+        cache=1024,
+        inspector=None,
+        validation="strict",
+        max_layouts=256,
+        max_body=64 * 1024 * 1024,
+        quiet=True,
+    ):
+        """Binds the server, call `serve_forever` to start serving.
+
+        Parameters
+        ----------
+        address : tuple
+            The host and port, port 0 picks a free one.
+        max_concurrency : int
+            The number of decks built at once.
+        queue_timeout : float
+            How long a request waits for its turn before a 503.
+        backend : str or Backend
+            The JSON encoder, see `Thinkcell`.
+        cache : bool, int or TableCache
+            The number of chart tables kept between requests, True for the
+            default size of `TableCache`, False to disable it, or a cache.
+        inspector : bool or TemplateInspector
+            Verifies the names of the charts against the templates, see
+            `Thinkcell`.
+        validation : str
+            The validation level of every deck, see `Thinkcell`.
+        max_layouts : int
+            The number of compiled layouts kept, the least recently used
+            are dropped first.
+        max_body : int
+            The largest request accepted, in bytes.
+        quiet : bool
+            Does not log the requests.
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                f"You need to build at least one deck at once, not {max_concurrency}."
+            )
+        if inspector is True:
+            from thinkcell.templates import TemplateInspector
+
+            inspector = TemplateInspector()
+        self.backend = get_backend(backend)
+        if cache is True:
+            cache = TableCache()
+        elif cache is False:
+            cache = None
+        elif isinstance(cache, int):
+            cache = TableCache(cache)
+        self.cache = cache
+        self.inspector = inspector or None
+        self._inspector = _LocalTemplates(inspector) if inspector else None
+        self.validation = validation
+        self.stats = Stats()
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_layouts = max_layouts
+        self.max_body = max_body
+        self.quiet = quiet
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        super().__init__(address, RenderHandler)
+
+    @property
+    def url(self):
+        """str: The address of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _thinkcell(self):
+        return Thinkcell(
+            backend=self.backend,
+            cache=self.cache,
+            stats=self.stats,
+            validation=self.validation,
+            inspector=self._inspector,
+        )
+
+    def _turn(self):
+        """Waits for one of the `max_concurrency` slots."""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.stats.count("rejected")
+            raise RequestError(
+                503, "The server is busy, try again in a moment."
+            )
+        return _Release(self._slots)
+
+    def render(self, spec):
+        """Builds the deck of a request.
+
+        Returns
+        -------
+        bytes
+            The content of the `.ppttc` file.
+        """
+        job = _check_job(spec)
+        with self._turn(), self.stats.timer("request"):
+            return add_job(self._thinkcell(), job).to_bytes()
+
+    def compile_layout(self, name, spec):
+        """Compiles the deck of a request and keeps it as `name`.
+
+        Returns
+        -------
+        dict
+            The slides and keys of the layout.
+        """
+        _check_layout_name(name)
+        job = _check_job(spec)
+        with self._turn(), self.stats.timer("compile"):
+            skeleton = add_job(self._thinkcell(), job).compile()
+        with self._lock:
+            self._layouts[name] = skeleton
+            self._layouts.move_to_end(name)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return {
+            "layout": name,
+            "templates": list(skeleton.templates),
+            "keys": [list(key) for key in skeleton.keys],
+        }
+
+    def render_layout(self, name, spec):
+        """Renders a compiled layout with the data of a request.
+
+        The data is a mapping of the chart and text field names to their
+        data, or a list of `[slide, name, data]` for the names used on
+        several slides, see `Skeleton.render`.
+
+        Returns
+        -------
+        bytes
+            The content of the `.ppttc` file.
+        """
+        _check_layout_name(name)
+        with self._lock:
+            skeleton = self._layouts.get(name)
+            if skeleton is not None:
+                self._layouts.move_to_end(name)
+        if skeleton is None:
+            raise RequestError(404, f"There is no layout named '{name}'.")
+
+        data = spec.get("data", {}) if isinstance(spec, dict) else None
+        if isinstance(data, list):
+            try:
+                data = {(slide, key): value for slide, key, value in data}
+            except (TypeError, ValueError):
+                data = None
+        if not isinstance(data, dict):
+            raise RequestError(
+                400,
+                "The data should be a mapping of names to data, or a list of [slide, name, data].",
+            )
+        with self._turn(), self.stats.timer("render"):
+            return skeleton.render(data)
+
+    def health(self):
+        """Returns the state of the server."""
+        with self._lock:
+            layouts = list(self._layouts)
+        return {
+            "status": "ok",
+            "backend": self.backend.name,
+            "max_concurrency": self.max_concurrency,
+            "layouts": layouts,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "stats": self.stats.as_dict(),
+        }
+
+
+class _Release(object):
+    """Releases a slot of the server when the deck is built."""
+
+    __slots__ = ("slots",)
+
+    def __init__(self, slots):
+        self.slots = slots
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.slots.release()
+        return False
+
+
+class _LocalTemplates(object):
+    """Inspects the templates of the working directory only."""
+
+    __slots__ = ("inspector",)
+
+    def __init__(self, inspector):
+        self.inspector = inspector
+
+    def inspect(self, filename):
+        name = str(filename)
+        if (
+            posixpath.isabs(name)
+            or ntpath.isabs(name)
+            or ntpath.splitdrive(name)[0]
+            or ".." in re.split(r"[\\/]", name)
+        ):
+            raise RequestError(
+                400,
+                f"The template '{name}' should be a relative path inside the directory of the server.",
+            )
+        try:
+            index = self.inspector.inspect(filename)
+        except ValueError:
+            # The error names the absolute path, and the one of the file
+            # system tells which files exist.
+            raise RequestError(
+                400, f"The template '{name}' could not be read."
+            ) from None
+        from thinkcell.templates import TemplateIndex
+
+        # The index is named after the absolute path of the template.
+        return TemplateIndex(name, index.elements)
+
+
+def _check_layout_name(name):
+    if not LAYOUT_NAME.match(name):
+        raise RequestError(400, f"'{name}' is not a valid layout name.")
+
+
+def _check_job(spec):
+    """Verifies that a deck only contains inline data."""
+    if not isinstance(spec, dict) or not isinstance(
+        spec.get("templates"), list
+    ):
+        raise RequestError(
+            400, "The deck should be an object with a list of 'templates'."
+        )
+    for page in spec["templates"]:
+        if not isinstance(page, dict):
+            raise RequestError(400, f"{page!r} is not a valid template.")
+        for chart in page.get("charts", []):
+            keys = [key for key in FILE_KEYS if key in chart]
+            if keys:
+                raise RequestError(
+                    400,
+                    f"The charts of a request need their 'categories' and 'data', not {keys[0]!r}.",
+                )
+    return spec
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """Answers the requests of a `RenderServer`."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "thinkcell"
+    # The headers and the body are sent separately, Nagle's algorithm would
+    # hold the body until the client acknowledges the headers.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.server.health())
+        else:
+            self._send_json(404, {"error": f"No such path: {self.path}"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        try:
+            spec = self._read_json()
+            if parts == ["render"]:
+                self._send_deck(self.server.render(spec))
+            elif len(parts) == 3 and parts[::2] == ["layouts", "render"]:
+                self._send_deck(self.server.render_layout(parts[1], spec))
+            else:
+                raise RequestError(404, f"No such path: {self.path}")
+        except Exception as error:
+            self._send_error(error)
+
+    def do_PUT(self):
+        parts = self.path.strip("/").split("/")
+        try:
+            spec = self._read_json()
+            if len(parts) != 2 or parts[0] != "layouts":
+                raise RequestError(404, f"No such path: {self.path}")
+            self._send_json(200, self.server.compile_layout(parts[1], spec))
+        except Exception as error:
+            self._send_error(error)
+
+    def _read_json(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            raise RequestError(411, "The request needs a Content-Length.")
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise RequestError(
+                400, "The Content-Length should be a number of bytes."
+            )
+        if length > self.server.max_body:
+            self.close_connection = True
+            raise RequestError(
+                413,
+                f"The request is larger than {self.server.max_body} bytes.",
+            )
+        body = self.rfile.read(length)
+        try:
+            return json.loads(body)
+        except ValueError as error:
+            raise RequestError(400, f"The request is not valid JSON: {error}")
+
+    def _send_error(self, error):
+        self.server.stats.count("errors")
+        if isinstance(error, RequestError):
+            status = error.status
+        elif isinstance(
+            error, (ValueError, TypeError, KeyError, DataFrameError)
+        ):
+            status = 400
+        else:
+            status = 500
+        message = str(error)
+        if isinstance(error, KeyError):
+            message = f"Missing key {message}."
+        headers = {"Retry-After": "1"} if status == 503 else {}
+        self._send_json(status, {"error": message}, headers)
+
+    def _send_deck(self, content):
+        self.server.stats.count("decks")
+        self._send(200, content, "application/json")
+
+    def _send_json(self, status, obj, headers=None):
+        content = json.dumps(obj).encode("utf-8")
+        self._send(status, content, "application/json", headers)
+
+    def _send(self, status, content, content_type, headers=None):
+        self.server.stats.count("requests")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=8000, **options):
+    """Runs a `RenderServer` until it is interrupted.
+
+    Parameters
+    ----------
+    host : str
+        The address to listen on.
+    port : int
+        The port to listen on.
+    **options
+        The options of `RenderServer`.
+    """
+    with RenderServer((host, port), **options) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,266 @@
+"""Decks compiled once and rendered again and again with new data.
+
+`Thinkcell.compile` turns a deck into a `Skeleton`. The templates, the names
+of the charts and text fields, the categories, the series names and the
+fills are encoded once, and only the cells of the charts and the text of
+the fields are left as slots. `Skeleton.render` fills the slots with new
+data and returns the content of the `.ppttc` file, byte for byte the one a
+`Thinkcell` object built with the same data would save::
+
+    tc = Thinkcell()
+    tc.add_template("template.pptx")
+    tc.add_chart("template.pptx", "Chart1", ["2023", "2024"], [["Sales", 0, 0]])
+    tc.add_textfield("template.pptx", "Title", "")
+    skeleton = tc.compile()
+
+    for client in clients:
+        content = skeleton.render({"Chart1": [client.sales], "Title": client.name})
+
+Numbers are encoded in one call per chart and written into the encoded
+chart, nothing else is checked or converted. Other values, such as dates or
+missing values, and the charts filled by `FillRules`, go through the same
+conversion as `add_chart`.
+"""
+
+import difflib
+from itertools import chain
+from math import isfinite
+
+from thinkcell.table import (
+    NUMBER_TYPES,
+    Entry,
+    LazyTable,
+    Table,
+    column_from_array,
+    column_from_values,
+)
+
+MARKER = "\x00thinkcell-slot\x00"
+
+
+class _Slot(object):
+    """A chart or text field whose data is given to `Skeleton.render`."""
+
+    __slots__ = (
+        "key",
+        "position",
+        "header",
+        "names",
+        "fills",
+        "shape",
+        "template",
+    )
+
+    def __init__(self, key, position, table, backend):
+        self.key = key
+        self.position = position
+        self.header = table.header
+        self.names = table.columns[0] if table.header is not None else None
+        self.fills = table.fills
+        if table.header is None:
+            self.shape = None
+            rows = [[{"string": MARKER}]]
+        else:
+            self.shape = (len(table), len(table.header[1]))
+            if table.cell_fills is not None:
+                # The fill rules depend on the values, they are evaluated
+                # again by every render.
+                self.template = None
+                return
+            rows = table.to_json()
+            for i, row in enumerate(rows[2:]):
+                color = None if self.fills is None else self.fills[i]
+                cell = {"number": MARKER}
+                if color is not None:
+                    cell["fill"] = color
+                row[1:] = [cell] * self.shape[1]
+
+        encoded = backend.dumps({"name": key[1], "table": rows})
+        marker = backend.dumps(MARKER)
+        n_cells = 1 if self.shape is None else self.shape[0] * self.shape[1]
+        if encoded.count(marker) == n_cells:
+            self.template = encoded.replace(b"%", b"%%").replace(marker, b"%b")
+        else:
+            self.template = None
+
+    def render(self, value, backend, missing):
+        """Encodes the chart or text field with new data."""
+        if self.shape is None:
+            if type(value) is str and self.template is not None:
+                return self.template % (backend.dumps(value),)
+            return backend.dumps(
+                Entry(self.key[1], Table.from_text(value)).to_json()
+            )
+
+        n_series, n_categories = self.shape
+        if hasattr(value, "shape"):
+            import numpy as np
+
+            value = np.asarray(value)
+            if value.shape != self.shape:
+                raise ValueError(
+                    f"The chart '{self.key[1]}' of slide {self.key[0]} has {n_series} series of {n_categories} values, not an array of shape {value.shape}."
+                )
+            kind = value.dtype.kind
+            fast = kind in "biu" or kind == "f" and np.isfinite(value).all()
+            flat = value.ravel().tolist() if fast else None
+        else:
+            if len(value) != n_series or set(map(len, value)) - {n_categories}:
+                raise ValueError(
+                    f"The chart '{self.key[1]}' of slide {self.key[0]} has {n_series} series of {n_categories} values, give it a list of {n_series} lists of {n_categories} values."
+                )
+            flat = list(chain.from_iterable(value))
+            types = set(map(type, flat))
+            try:
+                fast = types <= NUMBER_TYPES and (
+                    float not in types or isfinite(sum(flat))
+                )
+            except OverflowError:
+                fast = False
+
+        if fast and self.template is not None:
+            if not flat:
+                return self.template
+            tokens = backend.dumps(flat)[1:-1].split(backend.separator)
+            return self.template % tuple(tokens)
+
+        try:
+            if hasattr(value, "shape"):
+                columns = [
+                    column_from_array(value[:, j], missing)
+                    for j in range(n_categories)
+                ]
+            else:
+                columns = [
+                    column_from_values(column, missing)
+                    for column in zip(*value)
+                ]
+        except ValueError as error:
+            raise ValueError(
+                f"The data of chart '{self.key[1]}' of slide {self.key[0]} is not valid: {error}"
+            ) from error
+        table = Table(self.header, [self.names] + columns, self.fills)
+        return backend.dumps(Entry(self.key[1], table).to_json())
+
+
+class Skeleton(object):
+    """A deck whose layout is fixed and whose data changes.
+
+    A skeleton is created by `Thinkcell.compile` and never changes, so it
+    can be rendered by several threads at once.
+
+    Attributes
+    ----------
+    backend : Backend
+        The JSON encoder of the deck.
+    missing : str
+        How missing values are written, see `Thinkcell`.
+    templates : tuple
+        The name of the template of every slide.
+    """
+
+    __slots__ = (
+        "backend",
+        "missing",
+        "templates",
+        "_parts",
+        "_slots",
+        "_names",
+    )
+
+    def __init__(self, pages, backend, missing="empty"):
+        self.backend = backend
+        self.missing = missing
+        self.templates = tuple(page["template"] for page in pages)
+        separator = backend.separator
+        parts, slots = [b"["], {}
+        for i, page in enumerate(pages):
+            if i:
+                parts.append(separator)
+            parts.append(backend.template_start(page["template"]))
+            for j, entry in enumerate(page["data"]):
+                if j:
+                    parts.append(separator)
+                table = entry.table
+                if isinstance(table, LazyTable):
+                    table = table.table()
+                key = (i, entry.name)
+                slots[key] = _Slot(key, len(parts), table, backend)
+                parts.append(backend.dumps(Entry(entry.name, table).to_json()))
+            parts.append(b"]}")
+        parts.append(b"]")
+        self._parts = tuple(parts)
+        self._slots = slots
+        self._names = {}
+        for slot in slots.values():
+            self._names.setdefault(slot.key[1], []).append(slot)
+
+    def __repr__(self):
+        return f"Skeleton({len(self.templates)} slides, {len(self._slots)} charts and text fields)"
+
+    @property
+    def keys(self):
+        """list: The `(slide, name)` key of every chart and text field."""
+        return list(self._slots)
+
+    def _find(self, key):
+        """Returns the slot of a `(slide, name)` key or of a unique name."""
+        if isinstance(key, tuple):
+            slot = self._slots.get(key)
+            if slot is not None:
+                return slot
+            raise ValueError(
+                f"Slide {key[0]} has no chart or text field named '{key[1]}'."
+            )
+
+        found = self._names.get(key, [])
+        if len(found) == 1:
+            return found[0]
+        if found:
+            raise ValueError(
+                f"'{key}' is on slides {[slot.key[0] for slot in found]}, use a (slide, '{key}') key to choose one."
+            )
+        close = difflib.get_close_matches(str(key), sorted(self._names), n=3)
+        hint = f" Did you mean {', '.join(map(repr, close))}?" if close else ""
+        raise ValueError(
+            f"The deck has no chart or text field named '{key}'.{hint}"
+        )
+
+    def render(self, data_by_chart=None):
+        """Encodes the deck with new data.
+
+        Parameters
+        ----------
+        data_by_chart : dict
+            The new data, by chart or text field. A key is either the name of
+            a chart or text field that is on one slide only, or a
+            `(slide, name)` tuple, `slide` being the handle returned by
+            `add_template`. The data of a chart is a list of lists, or a
+            two-dimensional array, with one row of values per series, without
+            the name of the series. The data of a text field is its text. The
+            charts and text fields that are not given keep the data they were
+            compiled with.
+
+        Returns
+        -------
+        bytes
+            The content of the `.ppttc` file.
+
+        Raises
+        ------
+        ValueError
+            If a key matches no chart or text field, or several, or if the
+            data does not have the shape of the chart.
+
+        Examples
+        --------
+        >>> skeleton.render({"Chart1": [[1, 2], [3, 4]], (1, "Title"): "Q3"})
+        b'[{"template":"template.pptx","data":[...]}]'
+        """
+        parts = list(self._parts)
+        for key, value in (data_by_chart or {}).items():
+            slot = self._find(key)
+            parts[slot.position] = slot.render(
+                value, self.backend, self.missing
+            )
+        return b"".join(parts)
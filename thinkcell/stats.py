@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import defaultdict
+
+
+class _NullTimer(object):
+    """The timer used when statistics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer(object):
+    __slots__ = ("stats", "stage", "start")
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.add_time(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Stats(object):
+    """Timers, counters and hooks describing how a deck is built.
+
+    Pass an instance, or True, as `stats` to `Thinkcell` to enable them.
+    The stages are timed cumulatively, in seconds:
+
+    - `validate`: checking the arguments of `add_chart`, `add_textfield`
+      and `add_chart_from_dataframe`.
+    - `transform`: converting the data of `add_chart` and `add_textfield`,
+      and reading the files of `add_chart_from_csv` and
+      `add_chart_from_parquet`.
+    - `dataframe`: converting the columns of `add_chart_from_dataframe`.
+    - `encode`: encoding the charts and text fields to JSON.
+    - `write`: writing the encoded JSON to its file or buffer.
+
+    The counters are `templates`, `charts`, `textfields`, `cells`, `saves`
+    and `bytes`. They can be updated from several threads at once.
+
+    Attributes
+    ----------
+    timers : dict
+        The cumulative time of every stage.
+    counters : dict
+        The value of every counter.
+    on_chart_added : callable
+        Called as `on_chart_added(tc, template_name, entry)` every time a
+        chart or text field is added.
+    on_save_start : callable
+        Called as `on_save_start(tc, filename)` before saving.
+    on_save_end : callable
+        Called as `on_save_end(tc, filename, size)` after saving, with the
+        number of bytes of the document.
+    """
+
+    def __init__(
+        self, on_chart_added=None, on_save_start=None, on_save_end=None
+    ):
+        self.timers = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.on_chart_added = on_chart_added
+        self.on_save_start = on_save_start
+        self.on_save_end = on_save_end
+        self._lock = threading.Lock()
+
+    def timer(self, stage):
+        """Returns a context manager adding its duration to `stage`."""
+        return _Timer(self, stage)
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.timers[stage] += seconds
+
+    def count(self, counter, n=1):
+        with self._lock:
+            self.counters[counter] += n
+
+    def as_dict(self):
+        """Returns the timers and counters.
+
+        Returns
+        -------
+        dict
+            The `timers` and `counters`, as plain dictionaries.
+        """
+        with self._lock:
+            timers, counters = dict(self.timers), dict(self.counters)
+        return {"timers": timers, "counters": counters}
+
+    def flat(self, prefix="thinkcell"):
+        """Returns the timers and counters as flat metric names.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of every metric name.
+
+        Returns
+        -------
+        dict
+            For example `{"thinkcell.encode_seconds": 0.2,
+            "thinkcell.cells": 1200}`.
+        """
+        stats = self.as_dict()
+        metrics = {
+            f"{prefix}.{stage}_seconds": seconds
+            for stage, seconds in stats["timers"].items()
+        }
+        metrics.update(
+            (f"{prefix}.{counter}", value)
+            for counter, value in stats["counters"].items()
+        )
+        return metrics
+
+    def reset(self):
+        """Sets every timer and counter back to zero."""
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
@@ -0,0 +1,240 @@
+import os
+import uuid
+
+from thinkcell.thinkcell import Thinkcell
+
+
+class ThinkcellStream(Thinkcell):
+    """A Thinkcell object that writes its `.ppttc` file while it is built.
+
+    Only the template that was added last is kept in memory, and only until
+    the next call to `add_template`. Charts and text fields are encoded and
+    written to disk as soon as they are added. Use it as a context manager,
+    or call `close` once the last chart has been added.
+
+    The file is written under a temporary name and only replaces `filename`
+    when it is closed, so a failed build leaves the previous file untouched.
+
+    Attributes
+    ----------
+    filename : str
+        The name of the file being written.
+    charts : list
+        Contains the template that was added last, with an empty `data` list.
+    """
+
+    def __init__(
+        self,
+        filename,
+        backend="auto",
+        validation="strict",
+        missing="empty",
+        inspector=None,
+        stats=None,
+    ):
+        """Opens a temporary file next to `filename` for writing.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file to be written.
+        backend : str or Backend
+            The JSON encoder, see `Thinkcell`.
+        validation : str
+            The validation level, see `Thinkcell`.
+        missing : str
+            How missing values are written, see `Thinkcell`.
+        inspector : bool or TemplateInspector
+            Verifies the names of the charts and text fields against the
+            templates, see `Thinkcell`.
+        stats : bool or Stats
+            Times the stages of the build and counts what is written, see
+            `Thinkcell`.
+        """
+        super().__init__(
+            backend=backend,
+            stats=stats,
+            validation=validation,
+            missing=missing,
+            inspector=inspector,
+        )
+        self.filename = self.verify_filename(filename)
+        self._temporary = f"{self.filename}.{uuid.uuid4().hex}.tmp"
+        self._outfile = open(self._temporary, "xb")
+        self._n_templates = 0
+        self._n_fragments = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def closed(self):
+        """bool: Whether the file has been finished or aborted."""
+        return self._outfile.closed
+
+    def _write(self, data):
+        if self.closed:
+            raise ValueError(f"The stream to '{self.filename}' is closed.")
+        self._outfile.write(data)
+
+    def add_template(self, template_name):
+        """Adds a template and writes it to the file.
+
+        The data of the previous template can no longer be changed.
+
+        Parameters
+        ----------
+        template_name : str
+            The name of the template to be added.
+
+        Returns
+        -------
+        int
+            The handle of the added template.
+        """
+        self.verify_template(template_name)
+        self._inspect_template(template_name)
+        if self.stats is not None:
+            self.stats.count("templates")
+        if self._n_templates:
+            self._write(b"]}" + self.backend.separator)
+        else:
+            self._write(b"[")
+        self._write(self.backend.template_start(template_name))
+        self._n_templates += 1
+        self._n_fragments = 0
+        self._pages = [{"template": template_name, "data": []}]
+        return self._n_templates - 1
+
+    def add_slide(self, template_name):
+        """Not available, the slides of a stream are written in order.
+
+        Raises
+        ------
+        ValueError
+            Always.
+        """
+        raise ValueError(
+            f"This object streams to '{self.filename}', slides cannot be filled concurrently. Use 'Thinkcell.add_slide' instead."
+        )
+
+    def _template_name(self, handle):
+        return self._pages[0]["template"]
+
+    def _template_data(self, template_name):
+        if self._pages:
+            page = self._pages[0]
+            if template_name == page["template"] or (
+                type(template_name) is int
+                and template_name == self._n_templates - 1
+            ):
+                return page["data"]
+
+        raise ValueError(
+            f"{template_name} does not exist or was already written, only the last template can be changed."
+        )
+
+    def _append_data(self, template_name, entry):
+        self._template_data(template_name)
+        fragment = self._encode(entry)
+        with self._timer("write"):
+            if self._n_fragments:
+                self._write(self.backend.separator)
+            self._write(fragment)
+        self._n_fragments += 1
+        if self.stats is not None:
+            self._record_entry(template_name, entry)
+
+    def save_ppttc(self, filename, skip_unchanged=False):
+        """Not available, the data is written to `filename` while it is added.
+
+        Raises
+        ------
+        ValueError
+            Always.
+        """
+        raise ValueError(
+            f"This object streams to '{self.filename}', use 'close' to finish the file."
+        )
+
+    def save_sharded(self, filename, *args, **kwargs):
+        """Not available, the data is written to a single file.
+
+        Raises
+        ------
+        ValueError
+            Always.
+        """
+        raise ValueError(
+            f"This object streams to '{self.filename}', it cannot be split into shards. Use 'Thinkcell.save_sharded' instead."
+        )
+
+    def compile(self):
+        """Not available, the templates written are no longer in memory.
+
+        Raises
+        ------
+        ValueError
+            Always.
+        """
+        raise ValueError(
+            f"This object streams to '{self.filename}', it cannot be compiled. Use 'Thinkcell.compile' instead."
+        )
+
+    def _save_ppttc(self, filename, skip_unchanged, cancel=None):
+        return self.save_ppttc(filename, skip_unchanged)
+
+    def close(self):
+        """Finishes the `.ppttc` file and moves it to `filename`.
+
+        Returns
+        -------
+        bool
+            True once the file has been written.
+
+        Raises
+        ------
+        ValueError
+            If no template was added. The partial file is removed and
+            `filename` is left untouched.
+        """
+        if self.closed:
+            return True
+
+        if not self._n_templates:
+            self.abort()
+            raise ValueError(
+                f"Please add data before saving to a template file by using 'add_template' and then 'add_chart'."
+            )
+
+        try:
+            self._run_deferred_checks()
+        except Exception:
+            self.abort()
+            raise
+
+        try:
+            self._write(b"]}]")
+            self._outfile.close()
+            os.replace(self._temporary, self.filename)
+        except BaseException:
+            self.abort()
+            raise
+        self._pages = []
+        return True
+
+    def abort(self):
+        """Closes and removes the partially written file.
+
+        `filename` is left untouched.
+        """
+        self._outfile.close()
+        self._pages = []
+        if os.path.exists(self._temporary):
+            os.remove(self._temporary)
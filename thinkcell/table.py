@@ -0,0 +1,759 @@
+from datetime import datetime
+from itertools import repeat
+from math import isfinite
+
+from thinkcell.fills import FillRules
+
+NUMBER_TYPES = {int, float, bool}
+MISSING_POLICIES = ("empty", "null", "zero", "raise")
+
+
+def cell_value(data_element):
+    """Splits a `data element` into its think-cell type and its raw value.
+
+    Parameters
+    ----------
+    data_element : str, int, float, datetime
+        A data element can be a string, int, float or datetime, or the NumPy
+        equivalent of a number or a datetime.
+
+    Returns
+    -------
+    tuple
+        The type ("number", "string" or "date") and the value to be written.
+
+    Raises
+    ------
+    ValueError
+        Raises if object is not of type int, float, str, or datetime.
+    """
+    if isinstance(data_element, datetime):
+        return "date", data_element.strftime("%Y-%m-%d")
+
+    if isinstance(data_element, str):
+        return "string", data_element
+
+    if isinstance(data_element, (int, float)):
+        if type(data_element) not in NUMBER_TYPES:
+            data_element = data_element.item()
+        return "number", data_element
+
+    kind = getattr(getattr(data_element, "dtype", None), "kind", None)
+    if kind in ("b", "i", "u", "f"):
+        return "number", data_element.item()
+    if kind == "M" and data_element == data_element:
+        import numpy as np
+
+        return "date", str(np.datetime_as_string(data_element, unit="D"))
+    else:
+        raise ValueError(
+            f"{data_element} of type {type(data_element)} is not acceptable."
+        )
+
+
+def column_from_values(values, missing="empty"):
+    """Converts a list of data elements into a column.
+
+    Parameters
+    ----------
+    values : list
+        The data elements of the column.
+    missing : str
+        The policy for None, NaN and infinite values, see `with_missing`.
+
+    Returns
+    -------
+    tuple
+        The type of the column and its raw values. The type is a single
+        string when every element has the same type, and a list with the
+        type of every element otherwise.
+    """
+    types = set(map(type, values))
+    if types and types <= NUMBER_TYPES:
+        values = list(values)
+        try:
+            total = sum(values)
+        except OverflowError:
+            total = float("nan")
+        if float not in types or isfinite(total):
+            return "number", values
+        missing_cells = [
+            i
+            for i, value in enumerate(values)
+            if type(value) is float and not isfinite(value)
+        ]
+        return with_missing("number", values, missing_cells, missing)
+    if types == {str}:
+        return "string", list(values)
+
+    kinds, raw, missing_cells = [], [], []
+    for i, data_element in enumerate(values):
+        try:
+            kind, value = cell_value(data_element)
+        except ValueError:
+            if not _is_missing(data_element):
+                raise
+            kind = value = None
+        else:
+            if type(value) is float and not isfinite(value):
+                kind = value = None
+        if kind is None:
+            missing_cells.append(i)
+        kinds.append(kind)
+        raw.append(value)
+
+    if missing_cells:
+        return with_missing(kinds, raw, missing_cells, missing)
+    if kinds and kinds.count(kinds[0]) == len(kinds):
+        return kinds[0], raw
+    return kinds, raw
+
+
+def _is_missing(data_element):
+    """Tells whether a data element rejected by `cell_value` is missing."""
+    if data_element is None:
+        return True
+    if isinstance(data_element, datetime) or hasattr(data_element, "dtype"):
+        return data_element != data_element
+    return False
+
+
+def with_missing(kind, values, cells, missing="empty"):
+    """Applies a missing value policy to the missing cells of a column.
+
+    Parameters
+    ----------
+    kind : str or list
+        The type of the column, or the type of each of its elements.
+    values : list or numpy.ndarray
+        The raw values of the column.
+    cells : list or numpy.ndarray
+        The indices of the missing cells.
+    missing : str
+        "empty" writes the cells as empty think-cell cells (`null`), "null"
+        as numbers without a value (`{"number": null}`), "zero" as the
+        number 0, or 0.0 in a column of floats, and "raise" raises a
+        ValueError.
+
+    Returns
+    -------
+    tuple
+        The type of the column and its raw values.
+
+    Raises
+    ------
+    ValueError
+        If the policy is "raise" and there are missing cells.
+    """
+    if not len(cells):
+        return kind, values
+
+    if missing == "raise":
+        raise ValueError(
+            f"Your data has {len(cells)} missing or infinite values, the first one is element {cells[0]} of its column. Use missing='empty', 'null' or 'zero' to write them."
+        )
+
+    if kind == "number" and hasattr(values, "dtype"):
+        if missing == "zero":
+            values[cells] = 0
+            return kind, values
+        if missing == "empty":
+            kinds = [kind] * len(values)
+            for i in cells.tolist():
+                kinds[i] = None
+            return kinds, values
+
+    if isinstance(kind, str):
+        kinds = [kind] * len(values)
+    else:
+        kinds = list(kind)
+    values = values.tolist() if hasattr(values, "tolist") else list(values)
+
+    cell_kind = None if missing == "empty" else "number"
+    cell = None
+    if missing == "zero":
+        # The zeros of a column of floats are floats, as in a float array.
+        skipped = set(cells)
+        floats = all(
+            type(value) is float
+            for i, value in enumerate(values)
+            if i not in skipped
+        )
+        cell = 0.0 if floats else 0
+    for i in cells:
+        kinds[i] = cell_kind
+        values[i] = cell
+
+    if cell_kind is not None and kinds.count(cell_kind) == len(kinds):
+        return cell_kind, values
+    return kinds, values
+
+
+def column_from_series(column, missing="empty"):
+    """Converts a `pandas.Series` into a column.
+
+    The type of the column is decided once based on its dtype. Numeric
+    columns are kept as a NumPy array until they are written. Missing values
+    are found with one vectorized pass over the column.
+
+    Parameters
+    ----------
+    column : pandas.Series
+        The column to be converted.
+    missing : str
+        The policy for None, NaN and infinite values, see `with_missing`.
+
+    Returns
+    -------
+    tuple
+        The type of the column and its raw values.
+    """
+    import numpy as np
+
+    kind = column.dtype.kind
+
+    if kind in "biuf" and (
+        isinstance(column.dtype, np.dtype) or not column.hasnans
+    ):
+        values = column.to_numpy(copy=True)
+        if values.dtype.kind in "biu":
+            return "number", values
+        if values.dtype.kind == "f":
+            cells = np.flatnonzero(~np.isfinite(values))
+            return with_missing("number", values, cells, missing)
+
+    mask = column.isna().to_numpy()
+    cells = np.flatnonzero(mask)
+
+    if kind in "biuf":
+        values = column.to_numpy(dtype=object, na_value=None)
+        return with_missing("number", values, cells, missing)
+
+    if kind == "M":
+        values = column.dt.strftime("%Y-%m-%d").tolist()
+        return with_missing("date", values, cells, missing)
+
+    if len(cells):
+        column = column.astype(object).where(~mask, None)
+    values = column.tolist()
+    if all(type(value) is str for value in values):
+        return "string", values
+
+    return column_from_values(values, missing)
+
+
+def column_from_array(values, missing="empty"):
+    """Converts a one-dimensional array into a column.
+
+    Numeric arrays are kept as they are until they are written, datetime64
+    arrays are formatted all at once, and other arrays are converted element
+    by element.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The values of the column, or any object NumPy can convert to one.
+    missing : str
+        The policy for None, NaN and infinite values, see `with_missing`.
+
+    Returns
+    -------
+    tuple
+        The type of the column and its raw values.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    kind = values.dtype.kind
+
+    if kind in "biu":
+        return "number", values.copy()
+
+    if kind == "f":
+        cells = np.flatnonzero(~np.isfinite(values))
+        return with_missing("number", values.copy(), cells, missing)
+
+    if kind == "M":
+        cells = np.flatnonzero(np.isnat(values))
+        strings = np.datetime_as_string(values, unit="D").tolist()
+        return with_missing("date", strings, cells, missing)
+
+    if kind == "U":
+        return "string", values.tolist()
+
+    return column_from_values(values.tolist(), missing)
+
+
+def column_from_arrow(column, missing="empty"):
+    """Converts a `pyarrow` array or chunked array into a column.
+
+    Numeric columns are kept as NumPy views of the Arrow data, which never
+    changes, dates and timestamps are formatted by Arrow, and the other
+    columns go through Python objects.
+
+    Parameters
+    ----------
+    column : pyarrow.Array or pyarrow.ChunkedArray
+        The column to be converted.
+    missing : str
+        The policy for null, NaN and infinite values, see `with_missing`.
+
+    Returns
+    -------
+    tuple
+        The type of the column and its raw values.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.types as types
+
+    kind = column.type
+    if types.is_timestamp(kind) and kind.tz is not None:
+        return column_from_values(column.to_pylist(), missing)
+
+    if types.is_integer(kind) and not column.null_count:
+        return "number", column.to_numpy(zero_copy_only=False)
+
+    if types.is_floating(kind):
+        values = column.to_numpy(zero_copy_only=False)
+        cells = np.flatnonzero(~np.isfinite(values))
+        if len(cells):
+            values = values.copy()
+        return with_missing("number", values, cells, missing)
+
+    if types.is_timestamp(kind) or types.is_date(kind):
+        days = column.cast(pa.date32(), safe=False).cast(pa.string())
+        strings = days.to_pylist()
+        if not column.null_count:
+            return "date", strings
+        nulls = column.is_null().to_numpy(zero_copy_only=False)
+        return with_missing("date", strings, np.flatnonzero(nulls), missing)
+
+    return column_from_values(column.to_pylist(), missing)
+
+
+def expand_column(kind, values):
+    """Expands a column into think-cell cells.
+
+    Parameters
+    ----------
+    kind : str or list
+        The type of the column, or the type of each of its elements.
+    values : list or numpy.ndarray
+        The raw values of the column.
+
+    Returns
+    -------
+    list
+        A list of objects of type {"type": input}, or None for the empty
+        cells.
+    """
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+
+    if isinstance(kind, str):
+        return [{kind: value} for value in values]
+    return [
+        None if kind is None else {kind: value}
+        for kind, value in zip(kind, values)
+    ]
+
+
+class Table(object):
+    """A think-cell table stored column by column.
+
+    The cells are only expanded to think-cell objects by `to_json`.
+
+    Attributes
+    ----------
+    header : tuple or None
+        The type and values of the categories, or None for text fields.
+    columns : list
+        The type and values of every column. The first column contains the
+        name of each series.
+    fills : list, FillRules or None
+        The fill of every series, or the rules deciding the fill of every
+        cell.
+    cell_fills : tuple or None
+        The colours used by the rules, and the index of the colour of every
+        cell, see `FillRules.evaluate`.
+    """
+
+    __slots__ = ("header", "columns", "fills", "cell_fills")
+
+    def __init__(self, header, columns, fills=None):
+        self.header = header
+        self.columns = columns
+        self.cell_fills = None
+        if isinstance(fills, FillRules):
+            self.fills = fills
+            self.cell_fills = fills.evaluate(columns)
+        else:
+            self.fills = None if fills is None else list(fills)
+
+    @classmethod
+    def from_rows(cls, categories, data, fill=None, missing="empty"):
+        """Creates a chart table from the arguments of `add_chart`.
+
+        `categories` and `data` can also be NumPy arrays, in which case they
+        are converted column by column. `missing` is the policy for missing
+        values, see `with_missing`.
+        """
+        if hasattr(data, "shape"):
+            columns = [
+                column_from_array(data[:, j], missing)
+                for j in range(data.shape[1])
+            ]
+        else:
+            columns = [
+                column_from_values(column, missing) for column in zip(*data)
+            ]
+
+        if hasattr(categories, "dtype"):
+            header = column_from_array(categories, missing)
+        else:
+            header = column_from_values(categories, missing)
+        return cls(header, columns, fill)
+
+    @classmethod
+    def from_long(
+        cls,
+        dataframe,
+        series,
+        category,
+        value,
+        agg="sum",
+        categories=None,
+        top=None,
+        fill=None,
+        missing="empty",
+    ):
+        """Creates a chart table from a DataFrame in long format.
+
+        Every row of `dataframe` holds one value of one series in one
+        category. The series and categories are turned into integer codes
+        and the values are aggregated by a single group-by on the combined
+        code, so the wide table is never built as a DataFrame: the
+        aggregated values are scattered into one array of shape
+        `(categories, series)` whose rows become the columns of the table.
+
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            The data in long format.
+        series, category, value : str
+            The names of the columns holding the series, the categories and
+            the values.
+        agg : str or callable
+            The aggregation of the values of a series in a category, see
+            `pandas.core.groupby.SeriesGroupBy.agg`.
+        categories : list
+            The categories to keep, in order. Defaults to all the
+            categories, sorted.
+        top : int
+            Keeps the `top` series with the largest total, ordered by
+            decreasing total. Defaults to all the series, sorted.
+        fill : list
+            The fill of every series.
+        missing : str
+            The policy for the series that have no value in a category, and
+            for None, NaN and infinite values, see `with_missing`.
+
+        Raises
+        ------
+        ValueError
+            If `categories` contains duplicates, or `top` is not positive.
+        """
+        import numpy as np
+        import pandas as pd
+
+        series_codes, names = pd.factorize(dataframe[series], sort=True)
+        if categories is None:
+            category_codes, categories = pd.factorize(
+                dataframe[category], sort=True
+            )
+        else:
+            categories = pd.Index(categories)
+            if not categories.is_unique:
+                raise ValueError(
+                    f"The categories {categories.tolist()} contain duplicates."
+                )
+            category_codes = categories.get_indexer(dataframe[category])
+
+        kept = (series_codes >= 0) & (category_codes >= 0)
+        keys = series_codes[kept].astype(np.int64) * len(categories)
+        keys += category_codes[kept]
+        aggregated = dataframe[value][kept].groupby(keys, sort=True).agg(agg)
+        rows, cols = np.divmod(aggregated.index.to_numpy(), len(categories))
+        if isinstance(aggregated.dtype, np.dtype):
+            result = aggregated.to_numpy()
+        else:
+            result = aggregated.to_numpy(dtype=object, na_value=None)
+
+        if top is None:
+            order = np.unique(rows)
+        elif top < 1:
+            raise ValueError(
+                f"You need to keep at least one series, not {top}."
+            )
+        else:
+            totals = np.bincount(
+                rows,
+                weights=np.nan_to_num(
+                    pd.to_numeric(aggregated, errors="coerce").to_numpy(float)
+                ),
+                minlength=len(names),
+            )
+            totals[np.bincount(rows, minlength=len(names)) == 0] = -np.inf
+            order = np.argsort(-totals, kind="stable")[:top]
+            order = order[np.isfinite(totals[order])]
+        position = np.full(len(names), -1)
+        position[order] = np.arange(len(order))
+        rows = position[rows]
+        shown = rows >= 0
+
+        if result.dtype.kind in "biuf":
+            matrix = np.zeros((len(categories), len(order)), result.dtype)
+            present = np.zeros(matrix.shape, bool)
+            present[cols[shown], rows[shown]] = True
+            if result.dtype.kind == "f":
+                present[cols[shown], rows[shown]] = np.isfinite(result[shown])
+            matrix[cols[shown], rows[shown]] = result[shown]
+            columns = [
+                with_missing(
+                    "number", matrix[j], np.flatnonzero(~present[j]), missing
+                )
+                for j in range(len(categories))
+            ]
+        else:
+            matrix = np.full((len(categories), len(order)), None, object)
+            matrix[cols[shown], rows[shown]] = result[shown]
+            columns = [
+                column_from_values(matrix[j].tolist(), missing)
+                for j in range(len(categories))
+            ]
+
+        header = column_from_series(pd.Series(categories), missing)
+        names = column_from_series(pd.Series(names.take(order)), missing)
+        return cls(header, [names] + columns, fill)
+
+    @classmethod
+    def from_text(cls, text):
+        """Creates the table of a text field."""
+        return cls(None, [column_from_values([text])])
+
+    def __len__(self):
+        """The number of series in the table."""
+        return len(self.columns[0][1]) if self.columns else 0
+
+    def to_json(self):
+        """Expands the table into the think-cell `table` object.
+
+        Returns
+        -------
+        list
+            A list of rows, each row being a list of cells.
+        """
+        table = []
+        if self.header is not None:
+            table.append([None] + expand_column(*self.header))
+            table.append([])
+
+        if self.cell_fills is not None:
+            palette, codes = self.cell_fills
+            columns = [expand_column(*self.columns[0])]
+            for (kind, values), column_codes in zip(
+                self.columns[1:], codes.T.tolist()
+            ):
+                kinds = repeat(kind) if isinstance(kind, str) else kind
+                if hasattr(values, "tolist"):
+                    values = values.tolist()
+                cells = []
+                for kind, value, code in zip(kinds, values, column_codes):
+                    if kind is None:
+                        cells.append(None)
+                    elif code < 0:
+                        cells.append({kind: value})
+                    else:
+                        cells.append({kind: value, "fill": palette[code]})
+                columns.append(cells)
+            table.extend(list(row) for row in zip(*columns))
+            return table
+
+        if self.fills is None:
+            columns = [expand_column(*column) for column in self.columns]
+            table.extend(list(row) for row in zip(*columns))
+            return table
+
+        columns = [
+            (
+                repeat(kind) if isinstance(kind, str) else kind,
+                values.tolist() if hasattr(values, "tolist") else values,
+            )
+            for kind, values in self.columns
+        ]
+        rows = zip(*[zip(kinds, values) for kinds, values in columns])
+        for row, color in zip(rows, self.fills):
+            if color is None:
+                table.append(
+                    [
+                        None if kind is None else {kind: value}
+                        for kind, value in row
+                    ]
+                )
+            else:
+                table.append(
+                    [
+                        None if kind is None else {kind: value, "fill": color}
+                        for kind, value in row
+                    ]
+                )
+        return table
+
+
+def is_lazy(source):
+    """Tells whether `categories` or `data` must be read at save time.
+
+    Callables, iterators, generators and database cursors are lazy.
+    """
+    return callable(source) or hasattr(source, "__next__")
+
+
+def _read_source(source):
+    if callable(source):
+        source = source()
+    if hasattr(source, "__next__"):
+        source = list(source)
+    return source
+
+
+class LazyTable(object):
+    """A chart table whose data is only read when the chart is written.
+
+    The categories and data can be callables, called every time the chart
+    is written, or iterators and cursors, which can only be read once. The
+    table built from them is dropped once it has been expanded, so that only
+    the data of the chart being written is kept in memory.
+
+    Attributes
+    ----------
+    name : str
+        The name of the chart, used in error messages.
+    categories : object
+        The categories of the chart, or their source.
+    data : object
+        The data lists of the chart, or their source.
+    fills : list, FillRules or None
+        The fill of every series, or the rules deciding the fill of every
+        cell.
+    missing : str
+        The policy for missing values, see `with_missing`.
+    check : callable or None
+        Called as `check(n_series, fills, categories, data)` to verify the
+        data once it has been read.
+    """
+
+    __slots__ = (
+        "name",
+        "categories",
+        "data",
+        "fills",
+        "missing",
+        "check",
+        "_read",
+    )
+
+    def __init__(
+        self, name, categories, data, fills=None, missing="empty", check=None
+    ):
+        self.name = name
+        self.categories = categories
+        self.data = data
+        self.fills = fills
+        if fills is not None and not isinstance(fills, FillRules):
+            self.fills = list(fills)
+        self.missing = missing
+        self.check = check
+        self._read = False
+
+    def table(self):
+        """Reads the sources and builds the table of the chart.
+
+        Returns
+        -------
+        Table
+            The table of the chart.
+
+        Raises
+        ------
+        ValueError
+            If a source was already read, cannot be read, or does not
+            contain valid data. The message names the chart.
+        """
+        once = not callable(self.categories) and is_lazy(self.categories)
+        once = once or not callable(self.data) and is_lazy(self.data)
+        if once and self._read:
+            raise ValueError(
+                f"The data of chart '{self.name}' was already read by a previous save, pass a callable to save it several times."
+            )
+        self._read = True
+
+        try:
+            categories = _read_source(self.categories)
+            data = _read_source(self.data)
+            if self.check is not None:
+                self.check(len(data), self.fills, categories, data)
+            return Table.from_rows(categories, data, self.fills, self.missing)
+        except Exception as error:
+            raise ValueError(
+                f"The data of chart '{self.name}' is not valid: {error}"
+            ) from error
+
+    def to_json(self):
+        """Reads the sources and expands them, see `Table.to_json`."""
+        return self.table().to_json()
+
+
+class Entry(object):
+    """A named chart or text field of a template.
+
+    Attributes
+    ----------
+    name : str
+        The name of the chart or text field in the template.
+    table : Table or LazyTable
+        Its data.
+    """
+
+    __slots__ = ("name", "table", "_encoded")
+
+    def __init__(self, name, table):
+        self.name = name
+        self.table = table
+        self._encoded = None
+
+    def to_json(self):
+        """Expands the entry into the think-cell `data` object."""
+        return {"name": self.name, "table": self.table.to_json()}
+
+    def encode(self, backend):
+        """Encodes the entry, reusing the result of the previous call.
+
+        The data of a `LazyTable` is read again at every call, so its entry
+        is never reused.
+
+        Parameters
+        ----------
+        backend : Backend
+            The JSON encoder.
+
+        Returns
+        -------
+        bytes
+            The encoded `data` object.
+        """
+        if isinstance(self.table, LazyTable):
+            return backend.dumps(self.to_json())
+        if self._encoded is None or self._encoded[0] is not backend:
+            self._encoded = (backend, backend.dumps(self.to_json()))
+        return self._encoded[1]
@@ -0,0 +1,454 @@
+"""Reads the names of the think-cell elements of a template, offline.
+
+think-cell stores every chart of a slide in an OLE object embedded in the
+`.pptx` file, whose `think-cellXML` stream describes the charts and their
+data sheets, and every text field in a field of the slide XML. Reading them
+only needs the standard library. The result is a `TemplateIndex`, which
+`TemplateInspector` keeps on disk so that unchanged templates are only read
+once::
+
+    tc = Thinkcell(inspector=True)
+    tc.add_template("template.pptx")
+    tc.add_chart("template.pptx", "Chrat1", ...)  # Did you mean 'Chart1'?
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import posixpath
+import re
+import struct
+import uuid
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
+
+INDEX_VERSION = 1
+
+_NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": (
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    ),
+}
+_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_FIELD_NAME = re.compile(r"<m_strName>(.*?)</m_strName>", re.S)
+_END_OF_CHAIN = 0xFFFFFFFA
+
+
+class Element(object):
+    """A named think-cell element of a template.
+
+    Attributes
+    ----------
+    name : str
+        The name given to the element in think-cell.
+    kind : str
+        "chart" or "textfield".
+    slide : int
+        The number of the slide of the element, starting at 1.
+    series : int or None
+        The number of series of the data sheet of a chart.
+    categories : int or None
+        The number of categories of the data sheet of a chart.
+    """
+
+    __slots__ = ("name", "kind", "slide", "series", "categories")
+
+    def __init__(self, name, kind, slide, series=None, categories=None):
+        self.name = name
+        self.kind = kind
+        self.slide = slide
+        self.series = series
+        self.categories = categories
+
+    def __repr__(self):
+        return (
+            f"Element({self.name!r}, {self.kind!r}, slide={self.slide}, "
+            f"series={self.series}, categories={self.categories})"
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Element) and self.to_json() == other.to_json()
+
+    def to_json(self):
+        return [self.name, self.kind, self.slide, self.series, self.categories]
+
+
+class TemplateIndex(object):
+    """The think-cell elements of a template, indexed by name.
+
+    Attributes
+    ----------
+    filename : str
+        The name of the template.
+    elements : list
+        The `Element` objects of the template, slide by slide.
+    """
+
+    def __init__(self, filename, elements):
+        self.filename = filename
+        self.elements = list(elements)
+        self._kinds = {}
+        for element in self.elements:
+            self._kinds.setdefault(element.name, set()).add(element.kind)
+
+    def __contains__(self, name):
+        return name in self._kinds
+
+    def __len__(self):
+        return len(self.elements)
+
+    @property
+    def charts(self):
+        """set: The names of the charts."""
+        return {e.name for e in self.elements if e.kind == "chart"}
+
+    @property
+    def textfields(self):
+        """set: The names of the text fields."""
+        return {e.name for e in self.elements if e.kind == "textfield"}
+
+    def check(self, name, kind):
+        """Checks that the template has an element `name` of type `kind`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the chart or text field.
+        kind : str
+            "chart" or "textfield".
+
+        Raises
+        ------
+        ValueError
+            If the template has no such element, with the closest names.
+        """
+        name = str(name)
+        if kind in self._kinds.get(name, ()):
+            return
+
+        label = "text field" if kind == "textfield" else kind
+        if name in self._kinds:
+            raise ValueError(
+                f"'{name}' is not a {label} of the template '{self.filename}', it is a {' and a '.join(sorted(self._kinds[name]))}."
+            )
+        names = [e.name for e in self.elements if e.kind == kind]
+        close = difflib.get_close_matches(name, names, n=3)
+        hint = f" Did you mean {', '.join(map(repr, close))}?" if close else ""
+        raise ValueError(
+            f"The template '{self.filename}' has no {label} named '{name}'.{hint}"
+        )
+
+    def to_json(self):
+        return [element.to_json() for element in self.elements]
+
+    @classmethod
+    def from_json(cls, filename, elements):
+        return cls(filename, [Element(*element) for element in elements])
+
+
+def read_template(filename):
+    """Reads the think-cell elements of a `.pptx` file.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the template.
+
+    Returns
+    -------
+    TemplateIndex
+        The charts and text fields of the template.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a PowerPoint file that can be read.
+    """
+    try:
+        with zipfile.ZipFile(filename) as package:
+            elements = []
+            for number, slide in enumerate(_slides(package), start=1):
+                elements.extend(_slide_elements(package, slide, number))
+    except (
+        OSError,
+        KeyError,
+        zipfile.BadZipFile,
+        ElementTree.ParseError,
+    ) as e:
+        raise ValueError(
+            f"The template '{filename}' could not be read: {e}"
+        ) from e
+    return TemplateIndex(filename, elements)
+
+
+def _relationships(package, part):
+    """Returns the targets of the relationships of a part, by id."""
+    folder, name = posixpath.split(part)
+    rels = posixpath.join(folder, "_rels", name + ".rels")
+    if rels not in package.namelist():
+        return {}
+    root = ElementTree.fromstring(package.read(rels))
+    return {
+        rel.get("Id"): posixpath.normpath(
+            posixpath.join(folder, rel.get("Target"))
+        )
+        for rel in root.iter(f"{{{_RELS}}}Relationship")
+        if rel.get("TargetMode") != "External"
+    }
+
+
+def _slides(package):
+    """Returns the slide parts of a presentation, in order."""
+    targets = _relationships(package, "ppt/presentation.xml")
+    root = ElementTree.fromstring(package.read("ppt/presentation.xml"))
+    return [
+        targets[slide.get(f"{{{_NS['r']}}}id")]
+        for slide in root.iterfind("p:sldIdLst/p:sldId", _NS)
+    ]
+
+
+def _slide_elements(package, slide, number):
+    root = ElementTree.fromstring(package.read(slide))
+    for field in root.iter(f"{{{_NS['a']}}}fld"):
+        kind = field.get("type", "")
+        if kind.startswith("thinkcell"):
+            for name in _FIELD_NAME.findall(kind):
+                yield Element(unescape(name), "textfield", number)
+
+    for target in sorted(_relationships(package, slide).values()):
+        if target.startswith("ppt/embeddings/") and target.endswith(".bin"):
+            for stream in _compound_streams(package.read(target)):
+                if stream[0] == "think-cellXML":
+                    yield from _chart_elements(stream[1], number)
+
+
+def _chart_elements(xml, number):
+    """Yields the named charts of a `think-cellXML` stream."""
+    objects = {}
+    for element in ElementTree.fromstring(xml):
+        if element.get("id") is not None:
+            objects[element.get("id")] = element
+
+    for element in objects.values():
+        name = element.findtext("m_strName")
+        if name is None:
+            continue
+        series = categories = None
+        table = element.find("m_dtable")
+        if table is not None and table.get("idref") in objects:
+            table = objects[table.get("idref")]
+            series = _length(table.find("m_cscdser"))
+            categories = _length(table.find("ocol"))
+        yield Element(name, "chart", number, series, categories)
+
+
+def _length(element):
+    if element is None or element.get("length") is None:
+        return None
+    return int(element.get("length"))
+
+
+def _compound_streams(data):
+    """Yields the name and content of every stream of an OLE compound file.
+
+    Only what is needed to read the streams is implemented: the file
+    allocation table, including its extension sectors, the directory, and
+    the mini stream that holds the small streams.
+    """
+    if data[:8] != b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1":
+        return
+    sector_size = 1 << struct.unpack_from("<H", data, 30)[0]
+    mini_size = 1 << struct.unpack_from("<H", data, 32)[0]
+    (directory_start,) = struct.unpack_from("<I", data, 48)
+    cutoff, mini_fat_start = struct.unpack_from("<II", data, 56)
+    (difat_next,) = struct.unpack_from("<I", data, 68)
+    fat_sectors = list(struct.unpack_from("<109I", data, 76))
+    words = f"<{sector_size // 4}I"
+
+    def sector(index):
+        start = sector_size * (index + 1)
+        return data[start : start + sector_size]
+
+    def sectors(table, first):
+        index, seen = first, set()
+        while (
+            index < _END_OF_CHAIN and index < len(table) and index not in seen
+        ):
+            seen.add(index)
+            yield index
+            index = table[index]
+
+    while difat_next < _END_OF_CHAIN:
+        block = struct.unpack(words, sector(difat_next))
+        fat_sectors.extend(block[:-1])
+        difat_next = block[-1]
+    fat = []
+    for index in fat_sectors:
+        if index < _END_OF_CHAIN:
+            fat.extend(struct.unpack(words, sector(index)))
+
+    directory = b"".join(map(sector, sectors(fat, directory_start)))
+    mini_fat = []
+    for index in sectors(fat, mini_fat_start):
+        mini_fat.extend(struct.unpack(words, sector(index)))
+    mini_stream = None
+
+    for offset in range(0, len(directory) - 127, 128):
+        entry = directory[offset : offset + 128]
+        length, kind = struct.unpack_from("<HB", entry, 64)
+        start, size = struct.unpack_from("<IQ", entry, 116)
+        if kind == 5:
+            mini_stream = b"".join(map(sector, sectors(fat, start)))
+        if kind != 2:
+            continue
+        name = entry[: max(length - 2, 0)].decode("utf-16-le", "replace")
+        if size >= cutoff:
+            content = b"".join(map(sector, sectors(fat, start)))
+        else:
+            content = b"".join(
+                mini_stream[i * mini_size : (i + 1) * mini_size]
+                for i in sectors(mini_fat, start)
+            )
+        yield name, content[:size]
+
+
+def default_directory():
+    """Returns the directory of the index cache of `TemplateInspector`.
+
+    It is `$THINKCELL_CACHE_DIR` if set, and the `thinkcell` folder of the
+    user cache directory otherwise.
+    """
+    directory = os.environ.get("THINKCELL_CACHE_DIR")
+    if directory:
+        return directory
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache, "thinkcell", "templates")
+
+
+class TemplateInspector(object):
+    """Reads template indexes, with a cache in memory and on disk.
+
+    An index is kept under the absolute path of its template, with the
+    modification time, size and SHA-256 hash of the file. A template whose
+    time and size did not change is not opened again. One that was only
+    touched is hashed but not parsed.
+
+    Attributes
+    ----------
+    directory : str or None
+        Where the indexes are kept on disk. None keeps them in memory only.
+    parsed : int
+        The number of templates that had to be parsed.
+    """
+
+    def __init__(self, directory=None, persist=True):
+        """Initializes the inspector.
+
+        Parameters
+        ----------
+        directory : str
+            Where the indexes are kept. Defaults to `default_directory()`.
+        persist : bool
+            Keeps the indexes on disk. If False, they are only kept for the
+            lifetime of the inspector.
+        """
+        if persist:
+            self.directory = directory or default_directory()
+        else:
+            self.directory = None
+        self.parsed = 0
+        self._memory = {}
+
+    def inspect(self, filename):
+        """Returns the index of a template, reading it only if it changed.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the template.
+
+        Returns
+        -------
+        TemplateIndex
+            The charts and text fields of the template.
+
+        Raises
+        ------
+        ValueError
+            If the template cannot be read.
+        """
+        path = os.path.abspath(filename)
+        try:
+            status = os.stat(path)
+        except OSError as e:
+            raise ValueError(
+                f"The template '{filename}' could not be read: {e}"
+            ) from e
+        stamp = [status.st_mtime_ns, status.st_size]
+
+        cached = self._memory.get(path)
+        if cached is None:
+            cached = self._load(path)
+        if cached is not None and cached["stamp"] == stamp:
+            self._memory[path] = cached
+            return cached["index"]
+
+        with open(path, "rb") as infile:
+            digest = hashlib.sha256(infile.read()).hexdigest()
+        if cached is not None and cached["sha256"] == digest:
+            index = cached["index"]
+        else:
+            index = read_template(path)
+            self.parsed += 1
+
+        entry = {"stamp": stamp, "sha256": digest, "index": index}
+        self._memory[path] = entry
+        self._store(path, entry)
+        return index
+
+    def _cache_file(self, path):
+        name = hashlib.sha256(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def _load(self, path):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._cache_file(path), encoding="utf-8") as infile:
+                cached = json.load(infile)
+            if cached["version"] != INDEX_VERSION or cached["path"] != path:
+                return None
+            return {
+                "stamp": cached["stamp"],
+                "sha256": cached["sha256"],
+                "index": TemplateIndex.from_json(path, cached["elements"]),
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, path, entry):
+        if self.directory is None:
+            return
+        content = {
+            "version": INDEX_VERSION,
+            "path": path,
+            "stamp": entry["stamp"],
+            "sha256": entry["sha256"],
+            "elements": entry["index"].to_json(),
+        }
+        cache_file = self._cache_file(path)
+        temporary = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "w", encoding="utf-8") as outfile:
+                json.dump(content, outfile)
+            os.replace(temporary, cache_file)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
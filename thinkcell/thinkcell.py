@@ -1,8 +1,48 @@
+import functools
+import hashlib
 import json
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    ThreadPoolExecutor,
+    wait,
+)
+import threading
+import time
+import uuid
 import warnings
-from datetime import datetime
 from pprint import pprint
 
+from thinkcell.backends import get_backend
+from thinkcell.fills import FillRules
+from thinkcell.cache import (
+    TableCache,
+    dataframe_key,
+    long_dataframe_key,
+    rows_key,
+)
+from thinkcell.stats import NULL_TIMER, Stats
+from thinkcell.table import (
+    MISSING_POLICIES,
+    Entry,
+    LazyTable,
+    Table,
+    cell_value,
+    column_from_arrow,
+    column_from_series,
+    column_from_values,
+    expand_column,
+    is_lazy,
+)
+
+
+VALIDATION_LEVELS = ("strict", "deferred", "off")
+
+# DataFrames with fewer cells are converted row by row: building a Series
+# for every column costs more than converting their few cells one by one.
+SMALL_DATAFRAME = 1000
+
 
 class DataFrameError(Exception):
     pass
@@ -18,18 +58,123 @@ class Thinkcell(object):
         contains two objects, `template` and `data`.
         The `data` object contains itself two keys: `name` (the name of the chart) and 
         `table` (the actual data). 
+        The list is computed from the compact tables stored by the object every
+        time it is accessed.
+    backend : Backend
+        The JSON encoder used to write the `.ppttc` file.
+    cache : TableCache or None
+        The cache of chart tables, if enabled.
+    fragment_cache : bool
+        Whether the encoded JSON of every chart and text field is kept
+        between saves.
+    stats : Stats or None
+        The timers, counters and hooks of the object, if enabled.
+    validation : str
+        When the charts and text fields are verified, see `__init__`.
+    missing : str
+        How missing values are written, see `__init__`.
+    inspector : TemplateInspector or None
+        Reads the names of the charts and text fields of the templates, if
+        enabled.
     """
 
-    def __init__(self):
-        """Initializes the Thinkcell object. Takes no arguments.
+    def __init__(
+        self,
+        backend="auto",
+        cache=None,
+        fragment_cache=False,
+        stats=None,
+        validation="strict",
+        missing="empty",
+        inspector=None,
+    ):
+        """Initializes the Thinkcell object.
+
+        Parameters
+        ----------
+        backend : str or Backend
+            The JSON encoder: "orjson", "ujson", "json" for the standard
+            library, or "auto" (default) to use the fastest one installed.
+        cache : bool, int or TableCache
+            Enables the reuse of the tables of identical charts. Either the
+            number of tables to keep, True for the default size of
+            `TableCache`, or a `TableCache` that can be shared with other
+            Thinkcell objects. Disabled by default.
+        fragment_cache : bool
+            Keeps the encoded JSON of every chart and text field, so that
+            saving the object again only encodes the charts that were added,
+            replaced or updated since, and the charts with lazy data. Disabled
+            by default.
+        stats : bool or Stats
+            Enables the timing of every stage of the build and save, the
+            counters and the hooks, see `Stats`. Pass a `Stats` object to set
+            hooks or to share it with other Thinkcell objects. Disabled by
+            default.
+        validation : str
+            "strict" (default) verifies the size of the data, the fill and
+            the names of every chart and text field when they are added.
+            "deferred" runs the same checks all at once when the object is
+            saved, and "off" skips them, for data that is known to be valid.
+            The templates are always verified.
+        missing : str
+            How None, NaN, NaT and infinite values are written: "empty"
+            (default) as empty cells, "null" as numbers without a value,
+            "zero" as 0, or "raise" to raise a ValueError.
+        inspector : bool or TemplateInspector
+            Opens every template when it is added, and verifies the names of
+            its charts and text fields according to `validation`. Pass True
+            to keep the names of the templates in the default cache
+            directory, or a `TemplateInspector`. Disabled by default.
         """
-        self.charts = []
+        if validation not in VALIDATION_LEVELS:
+            raise ValueError(
+                f"'{validation}' is not a valid validation level, choose one of {VALIDATION_LEVELS}."
+            )
+        if missing not in MISSING_POLICIES:
+            raise ValueError(
+                f"'{missing}' is not a valid missing value policy, choose one of {MISSING_POLICIES}."
+            )
+        self.validation = validation
+        self.missing = missing
+        self._deferred = []
+        if inspector is True:
+            from thinkcell.templates import TemplateInspector
+
+            inspector = TemplateInspector()
+        self.inspector = inspector or None
+        self._indexes = {}
+        self.backend = get_backend(backend)
+        if cache is True:
+            cache = TableCache()
+        elif cache is False:
+            cache = None
+        elif isinstance(cache, int):
+            cache = TableCache(cache)
+        self.cache = cache
+        self.fragment_cache = fragment_cache
+        if stats is True:
+            stats = Stats()
+        self.stats = stats or None
+        self._pages = []
+        self._templates = {}
+        self._lock = threading.Lock()
 
     def __str__(self):
         """Prints the data inside of the Thinkcell object.
         """
         return str(self.charts)
 
+    @property
+    def charts(self):
+        """list: The templates and their data, as written to the `.ppttc`."""
+        return [
+            {
+                "template": page["template"],
+                "data": [entry.to_json() for entry in page["data"]],
+            }
+            for page in self._pages
+        ]
+
     @staticmethod
     def verify_template(template_name):
         """Function that verifies the validity of a template.
@@ -99,19 +244,94 @@ class Thinkcell(object):
         if color is not None:
             fill = {"fill": color}
 
-        if isinstance(data_element, datetime):
-            return {"date": data_element.strftime("%Y-%m-%d"), **fill}
+        kind, value = cell_value(data_element)
+        return {kind: value, **fill}
 
-        if isinstance(data_element, str):
-            return {"string": data_element, **fill}
+    @classmethod
+    def open_stream(
+        cls,
+        filename,
+        backend="auto",
+        validation="strict",
+        missing="empty",
+        inspector=None,
+        stats=None,
+    ):
+        """Opens a `.ppttc` file for streaming.
 
-        if isinstance(data_element, (int, float)):
-            return {"number": data_element, **fill}
-        else:
+        Every template, chart and text field added to the returned object is
+        written straight to `filename` and dropped from memory. The resulting
+        file is identical to the one `save_ppttc` would have written.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file to be written.
+        backend : str or Backend
+            The JSON encoder, see `Thinkcell`.
+        validation : str
+            The validation level, see `Thinkcell`. Deferred checks run when
+            the stream is closed.
+        missing : str
+            How missing values are written, see `Thinkcell`.
+        inspector : bool or TemplateInspector
+            Verifies the names of the charts and text fields against the
+            templates, see `Thinkcell`.
+        stats : bool or Stats
+            Times the stages of the build, see `Thinkcell`.
+
+        Returns
+        -------
+        ThinkcellStream
+            A context manager that finishes the file on exit.
+
+        Examples
+        --------
+        >>> with Thinkcell.open_stream("deck.ppttc") as tc:
+        ...     tc.add_template("template.pptx")
+        ...     tc.add_textfield("template.pptx", "Title", "A great slide")
+        """
+        from thinkcell.stream import ThinkcellStream
+
+        return ThinkcellStream(
+            filename,
+            backend=backend,
+            validation=validation,
+            missing=missing,
+            inspector=inspector,
+            stats=stats,
+        )
+
+    @staticmethod
+    def verify_filename(filename):
+        """Function that verifies the validity of a `.ppttc` filename.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file to be saved.
+
+        Returns
+        -------
+        filename: str
+            Returns the filename if exceptions are not raised.
+
+        Raises
+        ------
+        ValueError
+            If the filename specified is not a string or does
+            not end in `.ppttc`.
+        """
+        if not isinstance(filename, str):
+            raise ValueError(f"A filename is normally a string, yours is not.")
+
+        if not filename.endswith(".ppttc"):
             raise ValueError(
-                f"{data_element} of type {type(data_element)} is not acceptable."
+                f"You want to save your file as a '.ppttc' file, not a '{filename}'. Visit https://www.think-cell.com/en/support/manual/jsondataautomation.shtml for more information."
             )
 
+        return filename
+
     def add_template(self, template_name):
         """Adds a template to the Thinkcell object.
 
@@ -119,9 +339,120 @@ class Thinkcell(object):
         ----------
         template_name : str
             The name of the template to be added. 
+
+        Returns
+        -------
+        int
+            The handle of the added template. Pass it as `template_name` to
+            add charts or text fields to this specific slide, even if the
+            same template was added again afterwards.
         """
         self.verify_template(template_name)
-        self.charts.append({"template": template_name, "data": []})
+        self._inspect_template(template_name)
+        if self.stats is not None:
+            self.stats.count("templates")
+        page = {"template": template_name, "data": []}
+        with self._lock:
+            self._pages.append(page)
+            self._templates[template_name] = page["data"]
+            return len(self._pages) - 1
+
+    def add_slide(self, template_name):
+        """Adds a template and returns a builder for its charts.
+
+        Every builder only writes to its own slide, so several threads can
+        fill different slides at once. The slides keep the order in which
+        `add_slide` was called, whatever the order in which they are filled,
+        so create the builders before handing them to the threads and save
+        the deck once every thread is done.
+
+        Parameters
+        ----------
+        template_name : str
+            The name of the template to be added.
+
+        Returns
+        -------
+        SlideBuilder
+            The builder of the slide.
+
+        Examples
+        --------
+        >>> slides = [tc.add_slide("template.pptx") for region in regions]
+        >>> with ThreadPoolExecutor() as executor:
+        ...     list(executor.map(fill_slide, slides, regions))
+        >>> tc.save_ppttc("deck.ppttc")
+        """
+        from thinkcell.builder import SlideBuilder
+
+        return SlideBuilder(self, self.add_template(template_name))
+
+    def _inspect_template(self, template_name):
+        """Reads the names of the elements of a template, if enabled.
+
+        Raises
+        ------
+        ValueError
+            If the template cannot be read.
+        """
+        if self.inspector is not None:
+            with self._timer("validate"):
+                index = self.inspector.inspect(template_name)
+            self._indexes[template_name] = index
+
+    def _check_name(self, template_name, name, kind):
+        """Checks the name of a chart or text field against its template.
+
+        Does nothing if the template was not inspected. Otherwise the check
+        runs according to the validation level.
+        """
+        if self.validation == "off" or not self._indexes:
+            return
+
+        if not isinstance(template_name, str):
+            template_name = self._template_name(template_name)
+        index = self._indexes[template_name]
+        if self.validation == "strict":
+            index.check(name, kind)
+        else:
+            self._deferred.append(functools.partial(index.check, name, kind))
+
+    def _template_name(self, handle):
+        """Returns the name of the template added with `handle`."""
+        return self._pages[handle]["template"]
+
+    def _template_data(self, template_name):
+        """Returns the `data` list of a template.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name of the template, in which case the template that was
+            added last under that name is used, or a handle returned by
+            `add_template`.
+
+        Returns
+        -------
+        list
+            The `data` list of the template.
+
+        Raises
+        ------
+        ValueError
+            If template does not exist.
+        """
+        if isinstance(template_name, str):
+            if template_name in self._templates:
+                return self._templates[template_name]
+        elif isinstance(template_name, int) and not isinstance(
+            template_name, bool
+        ):
+            if 0 <= template_name < len(self._pages):
+                return self._pages[template_name]["data"]
+
+        raise ValueError(
+            f"{template_name} does not exist, please create one first."
+        )
 
     def add_chart(
         self, template_name, chart_name, categories, data, fill=None
@@ -130,21 +461,28 @@ class Thinkcell(object):
 
         Parameters
         ----------
-        template_name : str
-            The name of the template where the chart will be added
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
         chart_name : str
             The name of the chart in the specified template
-        categories : list
+        categories : list or numpy.ndarray
             A list containing the header of the chart. Headers can 
             be categories, years, companies, etc.
-        data : list
+        data : list or numpy.ndarray
             A list of lists. Each list contains the row of data to be added. Be
             aware that the first element of each of these lists should be a 
-            category as well.
-        fill : list
+            category as well. A two-dimensional array with one row per series
+            is converted column by column, without going through Python lists.
+            `categories` and `data` can also be lazy: a callable returning
+            them, or an iterator, generator or database cursor yielding them.
+            Lazy data is only read when the chart is written, and checked
+            then.
+        fill : list or FillRules
             A list containing strings of either the hex or rgb values for fill
             for each series. Must match the length of the series. Can specify None
-            to use no fill.
+            to use no fill. `FillRules` (from `thinkcell.fills`) decide the
+            fill of every cell from its value instead.
 
         Raises
         ------
@@ -152,45 +490,198 @@ class Thinkcell(object):
             If template does not exist, if the length of the categories does not
             make sense reltively to the header data. 
         """
-        available_templates = [page["template"] for page in self.charts]
+        entry = self._chart_entry(
+            template_name, chart_name, categories, data, fill
+        )
+        self._append_data(template_name, entry)
 
-        if template_name not in available_templates:
-            raise ValueError(
-                f"{template_name} does not exist, please create one first."
+    def _chart_entry(self, template_name, chart_name, categories, data, fill):
+        """Verifies the arguments of `add_chart` and builds the chart."""
+        if is_lazy(categories) or is_lazy(data):
+            return self._lazy_entry(
+                template_name, chart_name, categories, data, fill
+            )
+
+        with self._timer("validate"):
+            self._verify_chart(
+                template_name, chart_name, len(data), fill, categories, data
+            )
+
+        with self._timer("transform"):
+            table = self._cached_table(
+                lambda: rows_key(categories, data, fill, self.missing),
+                lambda: Table.from_rows(categories, data, fill, self.missing),
+            )
+        return Entry(str(chart_name), table)
+
+    def _lazy_entry(self, template_name, chart_name, categories, data, fill):
+        """Builds a chart whose data is read and checked when it is written."""
+        with self._timer("validate"):
+            self._verify_chart(template_name, chart_name, None, None)
+
+        check = None
+        if self.validation != "off":
+            check = functools.partial(self._check_chart, chart_name)
+        table = LazyTable(
+            str(chart_name), categories, data, fill, self.missing, check
+        )
+        return Entry(str(chart_name), table)
+
+    def _timer(self, stage):
+        """Returns a context manager timing `stage` when stats are enabled."""
+        if self.stats is None:
+            return NULL_TIMER
+        return self.stats.timer(stage)
+
+    def _cached_table(self, key, build):
+        """Returns the table of a chart, from the cache when it is enabled.
+
+        Parameters
+        ----------
+        key : callable
+            Computes the key of the table in the cache.
+        build : callable
+            Builds the table.
+
+        Returns
+        -------
+        Table
+            The table of the chart.
+        """
+        if self.cache is None:
+            return build()
+        return self.cache.get(key(), build)
+
+    def _verify_chart(
+        self,
+        template_name,
+        chart_name,
+        n_series,
+        fill,
+        categories=None,
+        data=None,
+    ):
+        """Verifies the arguments shared by every `add_chart` method.
+
+        The template is always verified, the rest according to the
+        validation level of the object.
+
+        Raises
+        ------
+        ValueError
+            If template does not exist, if the length of the fill does not
+            match the number of series, if the length of the data lists
+            does not match the categories, or if the template was inspected
+            and has no chart named `chart_name`.
+        """
+        self._template_data(template_name)
+        self._check_name(template_name, chart_name, "chart")
+
+        if self.validation == "strict":
+            self._check_chart(chart_name, n_series, fill, categories, data)
+        elif self.validation == "deferred":
+            n_categories = None if categories is None else len(categories)
+            lengths = None if data is None else _row_lengths(data)
+            if fill is not None and not isinstance(fill, FillRules):
+                fill = list(fill)
+            self._deferred.append(
+                functools.partial(
+                    self._check_chart,
+                    chart_name,
+                    n_series,
+                    fill,
+                    n_categories,
+                    lengths,
+                )
             )
 
+    @staticmethod
+    def _check_chart(chart_name, n_series, fill, categories, data):
+        """Checks the name, fill and data lists of a chart.
+
+        Parameters
+        ----------
+        chart_name : str
+            The name of the chart.
+        n_series : int
+            The number of series of the chart.
+        fill : list, FillRules or None
+            The fill of the chart.
+        categories : list, int or None
+            The categories of the chart, or their number.
+        data : list, set or None
+            The data lists of the chart, or the set of their lengths.
+        """
         if not isinstance(chart_name, str):
             warnings.warn(
                 f"Your chart name is not a string, we will convert it into one. But wanted to make sure you were aware.",
                 UserWarning,
             )
 
-        for data_list in data:
-            if len(data_list) != len(categories) + 1:
-                raise ValueError(
-                    f"Your categories should be the equal to the length of your data lists - 1. Your data element {data_list} is of size {len(data_list)} but should be of size {len(categories) + 1}."
-                )
-        if fill is not None and len(fill) != len(data):
+        if (
+            fill is not None
+            and not isinstance(fill, FillRules)
+            and len(fill) != n_series
+        ):
             raise ValueError(
-                f"Your fill colors should be the equal to the length of your data (the number of series). Your fill element {fill} is of size {len(fill)} but should be of size {len(data)}."
+                f"Your fill colors should be the equal to the length of your data (the number of series). Your fill element {fill} is of size {len(fill)} but should be of size {n_series}."
             )
 
-        if fill is None:
-            fill = [None for _ in data]
+        if data is None:
+            return
 
-        chart_dict = {}
-        chart_dict["name"] = str(chart_name)
-        chart_categories = [None] + [
-            self.transform_input(element) for element in categories
-        ]
-        chart_dict["table"] = [chart_categories, []]
+        if not isinstance(categories, int):
+            categories = len(categories)
 
-        for data_list, color in zip(data, fill):
-            chart_dict["table"].append(
-                [self.transform_input(el, color) for el in data_list]
+        lengths = data if isinstance(data, set) else _row_lengths(data)
+        if lengths <= {categories + 1}:
+            return
+
+        if isinstance(data, set):
+            raise ValueError(
+                f"Your categories should be the equal to the length of your data lists - 1. The data lists of chart '{chart_name}' are of sizes {sorted(data)} but should be of size {categories + 1}."
             )
-        if self.charts[-1]["template"] == template_name:
-            self.charts[-1]["data"].append(chart_dict)
+
+        for data_list in data:
+            if len(data_list) != categories + 1:
+                raise ValueError(
+                    f"Your categories should be the equal to the length of your data lists - 1. Your data element {data_list} is of size {len(data_list)} but should be of size {categories + 1}."
+                )
+
+    def _run_deferred_checks(self):
+        """Runs the checks postponed by the "deferred" validation level.
+
+        The checks are kept until they all pass, so that an invalid chart is
+        reported by every save.
+        """
+        for check in self._deferred:
+            check()
+        self._deferred = []
+
+    @staticmethod
+    def transform_column(column):
+        """Transforms a `pandas.Series` into a list of think-cell cells.
+
+        The type of the cells is decided once for the whole column based on
+        its dtype, which avoids inspecting every element. Columns of type
+        object fall back to `transform_input` for every element.
+
+        Parameters
+        ----------
+        column : pandas.Series
+            The column to be transformed.
+
+        Returns
+        -------
+        list
+            A list of objects of type {"type": input}
+
+        Raises
+        ------
+        ValueError
+            Raises if an element is not of type int, float, str, or datetime.
+        """
+        return expand_column(*column_from_series(column))
 
     def add_chart_from_dataframe(
         self, template_name, chart_name, dataframe, fill=None
@@ -199,46 +690,358 @@ class Thinkcell(object):
 
         Parameters
         ----------
-        template_name : str
-            The name of the template where the chart will be added
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
         chart_name : str
             The name of the chart in the specified template
         dataframe : pandas.DataFrame
             A dictionary of Pandas dataframes
-        fill : list
+        fill : list or FillRules
             A list of strings the length of the number of series for specifying
-            the fill colors with the hex or rgb
+            the fill colors with the hex or rgb, or the rules deciding the fill
+            of every cell, see `add_chart`. The columns read by the rules are
+            not categories of the chart.
 
         Raises
         ------
         DataFrameError
             If an invalid or empty DataFrame is passed
         """
-        try:
-            categories = dataframe.columns.to_list()[1:]
-            assert isinstance(categories, list)
-            data = dataframe.values.tolist()
-            assert isinstance(data, list)
-        except (AttributeError, AssertionError):
-            raise DataFrameError("You did not pass a valid Pandas DataFrame")
+        entry = self._dataframe_entry(
+            template_name, chart_name, dataframe, fill
+        )
+        self._append_data(template_name, entry)
 
-        try:
-            assert len(categories) >= 1
-            assert len(data)
-        except AssertionError:
-            raise DataFrameError(
-                "The DataFrame you passed does not contain data"
+    def _dataframe_entry(self, template_name, chart_name, dataframe, fill):
+        """Verifies the dataframe of `add_chart_from_dataframe` and builds
+        the chart.
+        """
+        with self._timer("validate"):
+            try:
+                if isinstance(fill, FillRules):
+                    fill, dataframe = fill.bind(dataframe)
+                categories = dataframe.columns.to_list()[1:]
+                assert isinstance(categories, list)
+                n_series = len(dataframe.index)
+            except (AttributeError, AssertionError):
+                raise DataFrameError(
+                    "You did not pass a valid Pandas DataFrame"
+                )
+
+            try:
+                assert len(categories) >= 1
+                assert n_series
+            except AssertionError:
+                raise DataFrameError(
+                    "The DataFrame you passed does not contain data"
+                )
+
+            self._verify_chart(template_name, chart_name, n_series, fill)
+
+        with self._timer("dataframe"):
+            table = self._cached_table(
+                lambda: dataframe_key(dataframe, fill, self.missing),
+                lambda: self._dataframe_table(dataframe, categories, fill),
+            )
+        return Entry(str(chart_name), table)
+
+    def _dataframe_table(self, dataframe, categories, fill):
+        """Converts a DataFrame into a table, column by column unless it is
+        smaller than `SMALL_DATAFRAME` cells.
+        """
+        if len(dataframe.index) * (len(categories) + 1) < SMALL_DATAFRAME:
+            rows = dataframe.to_numpy(dtype=object, na_value=None).tolist()
+            return Table.from_rows(categories, rows, fill, self.missing)
+
+        return Table(
+            column_from_values(categories, self.missing),
+            [
+                column_from_series(column, self.missing)
+                for _, column in dataframe.items()
+            ],
+            fill,
+        )
+
+    def add_chart_from_long_dataframe(
+        self,
+        template_name,
+        chart_name,
+        dataframe,
+        series,
+        category,
+        value,
+        agg="sum",
+        categories=None,
+        top=None,
+        fill=None,
+    ):
+        """Adds a chart based on a dataframe in long format.
+
+        Every row of the dataframe holds one value of one series in one
+        category, as in the output of a database query or of
+        `pandas.DataFrame.melt`. The values of each series and category are
+        aggregated, and the series and categories are ordered, without
+        building a wide DataFrame first.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
+        chart_name : str
+            The name of the chart in the specified template
+        dataframe : pandas.DataFrame
+            The data, with one row per value
+        series : str
+            The column holding the name of the series of each value
+        category : str
+            The column holding the category of each value
+        value : str
+            The column holding the values
+        agg : str or callable
+            How the values of a series in a category are aggregated, such as
+            "sum", "mean", "max", "count" or "first"
+        categories : list
+            The categories of the chart, in order. Rows with other categories
+            are left out. Defaults to all the categories, sorted.
+        top : int
+            Only keeps the `top` series with the largest total, ordered by
+            decreasing total. Defaults to all the series, sorted.
+        fill : list or FillRules
+            The fill colors of the series, or the rules deciding the fill of
+            every cell, see `add_chart`.
+
+        Raises
+        ------
+        DataFrameError
+            If an invalid or empty DataFrame is passed, or one of the columns
+            does not exist
+        ValueError
+            If `categories` contains duplicates, or `top` is not positive
+
+        Examples
+        --------
+        >>> tc.add_chart_from_long_dataframe(
+        ...     "template.pptx", "Sales", sales,
+        ...     series="region", category="month", value="revenue", top=5,
+        ... )
+        """
+        entry = self._long_dataframe_entry(
+            template_name,
+            chart_name,
+            dataframe,
+            (series, category, value),
+            (agg, categories, top),
+            fill,
+        )
+        self._append_data(template_name, entry)
+
+    def _long_dataframe_entry(
+        self, template_name, chart_name, dataframe, columns, options, fill
+    ):
+        """Verifies the dataframe of `add_chart_from_long_dataframe` and
+        builds the chart.
+        """
+        agg, categories, top = options
+        if categories is not None:
+            categories = list(categories)
+            options = (agg, categories, top)
+
+        with self._timer("validate"):
+            self._template_data(template_name)
+            try:
+                names = set(dataframe.columns)
+            except AttributeError:
+                raise DataFrameError(
+                    "You did not pass a valid Pandas DataFrame"
+                )
+            for column in columns:
+                if column not in names:
+                    raise DataFrameError(
+                        f"The DataFrame you passed has no column {column!r}"
+                    )
+
+        with self._timer("dataframe"):
+            table = self._cached_table(
+                lambda: long_dataframe_key(
+                    dataframe, columns, options, fill, self.missing
+                ),
+                lambda: Table.from_long(
+                    dataframe,
+                    *columns,
+                    agg,
+                    categories,
+                    top,
+                    fill,
+                    self.missing,
+                ),
             )
 
-        self.add_chart(template_name, chart_name, categories, data, fill=fill)
+        with self._timer("validate"):
+            if not len(table) or len(table.columns) < 2:
+                raise DataFrameError(
+                    "The DataFrame you passed does not contain data"
+                )
+            self._verify_chart(template_name, chart_name, len(table), fill)
+        return Entry(str(chart_name), table)
+
+    def add_chart_from_csv(
+        self,
+        template_name,
+        chart_name,
+        filename,
+        fill=None,
+        encoding="utf-8",
+        **fmtparams,
+    ):
+        """Adds a chart based on a CSV file to the template object.
+
+        The file is laid out like the DataFrames of
+        `add_chart_from_dataframe`: the first row contains the categories
+        after a first cell that is ignored, and every other row contains the
+        name of a series followed by its values. The file is read in chunks
+        with the `csv` module, without going through pandas, and the type
+        of every column is inferred from its values, see
+        `thinkcell.readers.read_csv`.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
+        chart_name : str
+            The name of the chart in the specified template
+        filename : str
+            The name of the CSV file.
+        fill : list
+            The fill colors of the series, see `add_chart`.
+        encoding : str
+            The encoding of the file.
+        **fmtparams
+            The format of the file, such as `delimiter`, see `csv.reader`.
+
+        Raises
+        ------
+        ValueError
+            If the template does not exist, or if the file does not contain
+            data or has rows of different lengths.
+        """
+        entry = self._csv_entry(
+            template_name, chart_name, filename, fill, encoding, fmtparams
+        )
+        self._append_data(template_name, entry)
+
+    def _csv_entry(
+        self, template_name, chart_name, filename, fill, encoding, fmtparams
+    ):
+        """Reads a CSV file and builds the chart."""
+        from thinkcell.readers import read_csv
+
+        self._template_data(template_name)
+        with self._timer("transform"):
+            header, columns, lengths = read_csv(
+                filename, self.missing, encoding, **fmtparams
+            )
+
+        with self._timer("validate"):
+            self._verify_chart(
+                template_name,
+                chart_name,
+                len(columns[0][1]),
+                fill,
+                header[1],
+                lengths,
+            )
+        return Entry(str(chart_name), Table(header, columns, fill))
+
+    def add_chart_from_arrow(
+        self, template_name, chart_name, table, fill=None
+    ):
+        """Adds a chart based on an Arrow table to the template object.
+
+        The table is laid out like the DataFrames of
+        `add_chart_from_dataframe`. Requires `pyarrow`.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
+        chart_name : str
+            The name of the chart in the specified template
+        table : pyarrow.Table or pyarrow.RecordBatch
+            The data of the chart.
+        fill : list
+            The fill colors of the series, see `add_chart`.
+
+        Raises
+        ------
+        ValueError
+            If the template does not exist or the table does not contain
+            data.
+        """
+        entry = self._arrow_entry(template_name, chart_name, table, fill)
+        self._append_data(template_name, entry)
+
+    def add_chart_from_parquet(
+        self, template_name, chart_name, filename, fill=None
+    ):
+        """Adds a chart based on a Parquet file to the template object.
+
+        The file is read with `pyarrow` and added with
+        `add_chart_from_arrow`.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name of the template where the chart will be added, or the
+            handle returned by `add_template`
+        chart_name : str
+            The name of the chart in the specified template
+        filename : str
+            The name of the Parquet file.
+        fill : list
+            The fill colors of the series, see `add_chart`.
+
+        Raises
+        ------
+        ImportError
+            If `pyarrow` is not installed.
+        """
+        import pyarrow.parquet
+
+        with self._timer("transform"):
+            table = pyarrow.parquet.read_table(filename)
+        self.add_chart_from_arrow(template_name, chart_name, table, fill)
+
+    def _arrow_entry(self, template_name, chart_name, table, fill):
+        """Verifies an Arrow table and builds the chart."""
+        if table.num_columns < 2 or not table.num_rows:
+            raise ValueError("The table you passed does not contain data.")
+
+        with self._timer("validate"):
+            self._verify_chart(template_name, chart_name, table.num_rows, fill)
+
+        with self._timer("transform"):
+            table = Table(
+                column_from_values(table.column_names[1:], self.missing),
+                [
+                    column_from_arrow(column, self.missing)
+                    for column in table.columns
+                ],
+                fill,
+            )
+        return Entry(str(chart_name), table)
 
     def add_textfield(self, template_name, field_name, text):
         """Adds a text field to the template object.
 
         Parameters
         ----------
-        template_name : str
-            The name of the template where the text field will be added
+        template_name : str or int
+            The name of the template where the text field will be added, or
+            the handle returned by `add_template`
         field_name : str
             The name of the text field in the specified template
         text : str
@@ -247,57 +1050,766 @@ class Thinkcell(object):
         Raises
         ------
         ValueError
-            If template does not exist
+            If template does not exist, or if the template was inspected and
+            has no text field named `field_name`
         """
-        available_templates = [page["template"] for page in self.charts]
+        entry = self._textfield_entry(template_name, field_name, text)
+        self._append_data(template_name, entry)
 
-        if template_name not in available_templates:
-            raise ValueError(
-                f"{template_name} does not exist, please create one first."
-            )
+    def _textfield_entry(self, template_name, field_name, text):
+        """Verifies the arguments of `add_textfield` and builds the field."""
+        with self._timer("validate"):
+            self._template_data(template_name)
+            self._check_name(template_name, field_name, "textfield")
 
+            if self.validation == "strict":
+                self._check_field(field_name)
+            elif self.validation == "deferred":
+                self._deferred.append(
+                    functools.partial(self._check_field, field_name)
+                )
+
+        with self._timer("transform"):
+            table = Table.from_text(text)
+        return Entry(str(field_name), table)
+
+    @staticmethod
+    def _check_field(field_name):
+        """Checks the name of a text field."""
         if not isinstance(field_name, str):
             warnings.warn(
                 f"Your field name is not a string, we will convert it into one. But wanted to make sure you were aware.",
                 UserWarning,
             )
 
-        field_dict = {}
-        field_dict["name"] = str(field_name)
-        field_text = [self.transform_input(text)]
-        field_dict["table"] = [field_text]
+    def replace_chart(
+        self, template_name, chart_name, categories, data, fill=None
+    ):
+        """Replaces a chart of the template object.
 
-        if self.charts[-1]["template"] == template_name:
-            self.charts[-1]["data"].append(field_dict)
+        Takes the same arguments as `add_chart`. Only the replaced chart has
+        to be encoded again by the next `save_ppttc`.
 
-    def save_ppttc(self, filename):
-        """Saves the Thinkcell object as a `.ppttc` file.
+        Raises
+        ------
+        ValueError
+            If the template or the chart does not exist, or if the arguments
+            are not valid for `add_chart`.
+        """
+        entry = self._chart_entry(
+            template_name, chart_name, categories, data, fill
+        )
+        self._replace_data(template_name, entry)
+
+    def replace_chart_from_dataframe(
+        self, template_name, chart_name, dataframe, fill=None
+    ):
+        """Replaces a chart of the template object with a dataframe.
+
+        Takes the same arguments as `add_chart_from_dataframe`.
+
+        Raises
+        ------
+        ValueError
+            If the template or the chart does not exist.
+        DataFrameError
+            If an invalid or empty DataFrame is passed
+        """
+        entry = self._dataframe_entry(
+            template_name, chart_name, dataframe, fill
+        )
+        self._replace_data(template_name, entry)
+
+    def replace_textfield(self, template_name, field_name, text):
+        """Replaces the text of a text field of the template object.
+
+        Takes the same arguments as `add_textfield`.
+
+        Raises
+        ------
+        ValueError
+            If the template or the text field does not exist.
+        """
+        entry = self._textfield_entry(template_name, field_name, text)
+        self._replace_data(template_name, entry)
+
+    def update_chart(
+        self, template_name, chart_name, categories=None, data=None, fill=None
+    ):
+        """Changes part of a chart of the template object.
+
+        Whatever is not passed is kept from the current chart.
 
         Parameters
         ----------
-        filename : str
-            The name of the file to be saved.
+        template_name : str or int
+            The name of the template of the chart, or the handle returned by
+            `add_template`
+        chart_name : str
+            The name of the chart in the specified template
+        categories : list
+            The new header of the chart, of the same length as the current one.
+        data : list
+            The new rows of the chart, see `add_chart`.
+        fill : list or FillRules
+            The new fill of each series, or the rules deciding the fill of
+            every cell, see `add_chart`. Rules are evaluated again on the new
+            data.
 
         Raises
         ------
         ValueError
-            If the filename specified is not a string or does 
-            not end in `.ppttc`.
+            If the template or the chart does not exist, or if the new parts
+            do not match the rest of the chart.
         """
-        if not isinstance(filename, str):
-            raise ValueError(f"A filename is normally a string, yours is not.")
+        table = self._find_data(template_name, str(chart_name))[1].table
+        if isinstance(table, LazyTable):
+            raise ValueError(
+                f"{chart_name} has lazy data, use 'replace_chart' to change it."
+            )
+        if table.header is None:
+            raise ValueError(f"{chart_name} is a text field, not a chart.")
 
-        if not filename.endswith(".ppttc"):
+        header, columns = table.header, table.columns
+        fills = table.fills if fill is None else fill
+        if categories is not None:
+            if len(categories) != len(header[1]):
+                raise ValueError(
+                    f"Your categories should be the same length as the current ones. Your categories {categories} are of size {len(categories)} but should be of size {len(header[1])}."
+                )
+            header = column_from_values(categories, self.missing)
+        if data is not None:
+            for data_list in data:
+                if len(data_list) != len(header[1]) + 1:
+                    raise ValueError(
+                        f"Your categories should be the equal to the length of your data lists - 1. Your data element {data_list} is of size {len(data_list)} but should be of size {len(header[1]) + 1}."
+                    )
+            columns = Table.from_rows([], data, missing=self.missing).columns
+
+        n_series = len(data) if data is not None else len(table)
+        if (
+            fills is not None
+            and not isinstance(fills, FillRules)
+            and len(fills) != n_series
+        ):
             raise ValueError(
-                f"You want to save your file as a '.ppttc' file, not a '{filename}'. Visit https://www.think-cell.com/en/support/manual/jsondataautomation.shtml for more information."
+                f"Your fill colors should be the equal to the length of your data (the number of series). Your fill element {fills} is of size {len(fills)} but should be of size {n_series}."
             )
 
-        if not self.charts:
+        entry = Entry(str(chart_name), Table(header, columns, fills))
+        self._replace_data(template_name, entry)
+
+    def _find_data(self, template_name, name):
+        """Finds a chart or text field by name.
+
+        Returns
+        -------
+        tuple
+            The position of the chart or text field in the `data` list of its
+            template, and its `Entry`.
+
+        Raises
+        ------
+        ValueError
+            If the template or the chart does not exist.
+        """
+        for i, entry in enumerate(self._template_data(template_name)):
+            if entry.name == name:
+                return i, entry
+
+        raise ValueError(
+            f"{name} does not exist in {template_name}, please add it first."
+        )
+
+    def _replace_data(self, template_name, entry):
+        """Replaces the chart or text field that has the name of `entry`.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name or handle of the template of the chart
+        entry : Entry
+            The new chart or text field
+        """
+        i, _ = self._find_data(template_name, entry.name)
+        self._template_data(template_name)[i] = entry
+
+    def _append_data(self, template_name, entry):
+        """Appends a chart or text field to a template.
+
+        Parameters
+        ----------
+        template_name : str or int
+            The name or handle of the template where the data will be added
+        entry : Entry
+            The chart or text field
+        """
+        self._template_data(template_name).append(entry)
+        if self.stats is not None:
+            self._record_entry(template_name, entry)
+
+    def _record_entry(self, template_name, entry):
+        """Counts an added chart or text field and calls the hook.
+
+        The cells of lazy charts are not counted, since their data is only
+        read when they are written.
+        """
+        table = entry.table
+        if isinstance(table, LazyTable):
+            self.stats.count("charts")
+        else:
+            cells = sum(len(values) for _, values in table.columns)
+            if table.header is None:
+                self.stats.count("textfields")
+            else:
+                self.stats.count("charts")
+                cells += len(table.header[1])
+            self.stats.count("cells", cells)
+        if self.stats.on_chart_added is not None:
+            self.stats.on_chart_added(self, template_name, entry)
+
+    def _encode(self, entry):
+        """Encodes a chart or text field with the backend."""
+        with self._timer("encode"):
+            if self.fragment_cache:
+                fragment = entry.encode(self.backend)
+            else:
+                fragment = self.backend.dumps(entry.to_json())
+        if self.stats is not None:
+            self.stats.count("bytes", len(fragment))
+        return fragment
+
+    def _iter_json(self):
+        """Encodes the Thinkcell object one chart or text field at a time.
+
+        Yields
+        ------
+        bytes
+            Consecutive pieces of the JSON document, which put together are
+            identical to `self.charts` encoded by the backend.
+        """
+        separator = self.backend.separator
+        yield b"["
+        for i, page in enumerate(self._pages):
+            if i:
+                yield separator
+            yield self.backend.template_start(page["template"])
+            for j, entry in enumerate(page["data"]):
+                if j:
+                    yield separator
+                yield self._encode(entry)
+            yield b"]}"
+        yield b"]"
+
+    def to_bytes(self):
+        """Encodes the Thinkcell object as the content of a `.ppttc` file.
+
+        Returns
+        -------
+        bytes
+            The JSON document.
+
+        Raises
+        ------
+        ValueError
+            If no template was added.
+        """
+        self._verify_data()
+        return b"".join(self._iter_json())
+
+    def compile(self):
+        """Compiles the deck into a skeleton that can be rendered with new data.
+
+        The templates, names, categories, series names and fills of the
+        charts are encoded once. Only the values of the charts and the text
+        of the text fields can be changed by `Skeleton.render`, which skips
+        every check and conversion of `add_chart` for numbers, so that the
+        same deck can be rendered many times with different data.
+
+        Returns
+        -------
+        Skeleton
+            The compiled deck.
+
+        Raises
+        ------
+        ValueError
+            If no template was added, or if the deferred checks fail.
+
+        Examples
+        --------
+        >>> skeleton = tc.compile()
+        >>> content = skeleton.render({"Chart1": [[1, 2], [3, 4]]})
+        """
+        from thinkcell.skeleton import Skeleton
+
+        self._verify_data()
+        return Skeleton(self._pages, self.backend, self.missing)
+
+    def _verify_data(self):
+        if not self._pages:
             raise ValueError(
                 f"Please add data before saving to a template file by using 'add_template' and then 'add_chart'."
             )
+        if self._deferred:
+            with self._timer("validate"):
+                self._run_deferred_checks()
 
-        else:
-            with open(filename, "w") as outfile:
-                json.dump(self.charts, outfile)
-                return True
+    def content_hash(self):
+        """Computes the SHA-256 hash of the `.ppttc` content.
+
+        The encoding is deterministic, so the same data saved with the same
+        backend always has the same hash.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of `to_bytes()`.
+        """
+        return hashlib.sha256(self.to_bytes()).hexdigest()
+
+    def save_ppttc(self, filename, skip_unchanged=False):
+        """Saves the Thinkcell object as a `.ppttc` file.
+
+        Parameters
+        ----------
+        filename : str or file object
+            The name of the file to be saved, or a binary file object (such
+            as `io.BytesIO`) to write to.
+        skip_unchanged : bool
+            If True, the file is left untouched when it already has the same
+            content. The hash of the content is stored next to the file, in
+            `filename + ".sha256"`, and the file is replaced atomically when
+            it changed.
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was unchanged.
+
+        Raises
+        ------
+        ValueError
+            If the filename specified is not a string or does 
+            not end in `.ppttc`.
+        """
+        return self._save_ppttc(filename, skip_unchanged)
+
+    async def save_ppttc_async(
+        self, filename, skip_unchanged=False, runner=None
+    ):
+        """Saves the Thinkcell object without blocking the event loop.
+
+        The object is encoded and written by a thread of `runner`, which
+        bounds the number of saves running at once. If the calling task is
+        cancelled, the save stops and no partial file is left behind.
+
+        Parameters
+        ----------
+        filename : str or file object
+            The name of the file to be saved, or a binary file object, see
+            `save_ppttc`.
+        skip_unchanged : bool
+            Leaves the file untouched if its content did not change, see
+            `save_ppttc`.
+        runner : AsyncRunner
+            The executor of the save, see `thinkcell.aio`. Defaults to one
+            shared by the whole process.
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was unchanged.
+
+        Examples
+        --------
+        >>> await tc.save_ppttc_async("deck.ppttc")
+        """
+        from thinkcell.aio import default_runner
+
+        runner = runner or default_runner()
+        return await runner.run(self._save_ppttc, filename, skip_unchanged)
+
+    def _save_ppttc(self, filename, skip_unchanged, cancel=None):
+        if not hasattr(filename, "write"):
+            self.verify_filename(filename)
+        self._verify_data()
+
+        if self.stats is None:
+            return self._save(filename, skip_unchanged, cancel)
+
+        stats = self.stats
+        if stats.on_save_start is not None:
+            stats.on_save_start(self, filename)
+        encoded, size = stats.timers["encode"], stats.counters["bytes"]
+        start = time.perf_counter()
+
+        written = self._save(filename, skip_unchanged, cancel)
+
+        elapsed = time.perf_counter() - start
+        stats.add_time("write", elapsed - (stats.timers["encode"] - encoded))
+        stats.count("saves")
+        if stats.on_save_end is not None:
+            stats.on_save_end(self, filename, stats.counters["bytes"] - size)
+        return written
+
+    def _save(self, filename, skip_unchanged, cancel=None):
+        """Writes the encoded object.
+
+        When a `cancel` event is given, the encoding stops as soon as it is
+        set and files are written atomically, so that a cancelled save
+        leaves no partial file behind.
+        """
+        chunks = self._iter_json()
+        if cancel is not None:
+            chunks = _until_cancelled(chunks, cancel)
+
+        if hasattr(filename, "write"):
+            filename.writelines(chunks)
+            return True
+
+        if skip_unchanged:
+            return self._save_if_changed(filename, chunks)
+
+        if cancel is not None:
+            _write_atomic(filename, chunks)
+            return True
+
+        with open(filename, "wb") as outfile:
+            outfile.writelines(chunks)
+            return True
+
+    def save_sharded(
+        self,
+        filename,
+        max_slides=None,
+        max_bytes=None,
+        workers=4,
+        skip_unchanged=False,
+    ):
+        """Saves the Thinkcell object as several `.ppttc` files.
+
+        The templates are split, in order, into shards of at most
+        `max_slides` templates and `max_bytes` bytes, and a shard only ends
+        between two templates: a template larger than `max_bytes` gets a
+        shard of its own. `deck.ppttc` is saved as `deck-001.ppttc`,
+        `deck-002.ppttc`... and an index, `deck.index.json`, listing every
+        shard with its templates, size and SHA-256 hash. The templates are
+        encoded one after the other while the finished shards are written
+        to temporary files by `workers` threads. The shards are only moved
+        into place once every template has been encoded and written, and
+        the index last, so the index only lists complete files and a failed
+        save leaves the previous shards and index untouched. Shards of a
+        previous save that are no longer needed are removed.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the deck, which must end in `.ppttc`. It is only used
+            to name the shards and the index.
+        max_slides : int
+            The maximum number of templates of a shard.
+        max_bytes : int
+            The maximum size of a shard.
+        workers : int
+            The number of threads writing shards.
+        skip_unchanged : bool
+            Leaves the shards whose content did not change untouched, see
+            `save_ppttc`.
+
+        Returns
+        -------
+        dict
+            The content of the index.
+
+        Raises
+        ------
+        ValueError
+            If the filename does not end in `.ppttc`, or if neither
+            `max_slides` nor `max_bytes` is a positive number.
+
+        Examples
+        --------
+        >>> index = tc.save_sharded("deck.ppttc", max_slides=50)
+        >>> [shard["filename"] for shard in index["shards"]]
+        ['deck-001.ppttc', 'deck-002.ppttc', 'deck-003.ppttc']
+        """
+        self.verify_filename(filename)
+        if max_slides is None and max_bytes is None:
+            raise ValueError("Pass 'max_slides', 'max_bytes' or both.")
+        for name, value in (
+            ("max_slides", max_slides),
+            ("max_bytes", max_bytes),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"'{name}' should be positive, not {value}.")
+        if workers < 1:
+            raise ValueError(f"You need at least one worker, not {workers}.")
+        self._verify_data()
+
+        stem = filename[: -len(".ppttc")]
+        index_name = f"{stem}.index.json"
+        folder = os.path.dirname(filename)
+        shards, futures = [], []
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="thinkcell-shard"
+            ) as executor:
+                for pages, first in self._iter_shards(max_slides, max_bytes):
+                    shard = f"{stem}-{len(shards) + 1:03d}.ppttc"
+                    content = b"[" + self.backend.separator.join(pages) + b"]"
+                    digest = hashlib.sha256(content).hexdigest()
+                    shards.append(
+                        {
+                            "filename": os.path.basename(shard),
+                            "first": first,
+                            "templates": [
+                                page["template"]
+                                for page in self._pages[
+                                    first : first + len(pages)
+                                ]
+                            ],
+                            "bytes": len(content),
+                            "sha256": digest,
+                        }
+                    )
+                    futures.append(
+                        executor.submit(
+                            _write_shard,
+                            shard,
+                            content,
+                            digest,
+                            skip_unchanged,
+                        )
+                    )
+                    if len(futures) - sum(f.done() for f in futures) > workers:
+                        wait(futures, return_when=FIRST_COMPLETED)
+            # Leaving the executor waits for every write, so an error raised
+            # here is the first one and every temporary file exists.
+            moves = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    _remove_temporaries(future.result())
+            raise
+
+        written = 0
+        for i, shard_moves in enumerate(moves):
+            try:
+                for temporary, final in shard_moves:
+                    os.replace(temporary, final)
+            except BaseException:
+                for remaining in moves[i:]:
+                    _remove_temporaries(remaining)
+                raise
+            if shard_moves:
+                written += 1
+                if self.stats is not None:
+                    self.stats.count("saves")
+
+        previous = _read_index(index_name)
+        index = {
+            "filename": os.path.basename(filename),
+            "slides": len(self._pages),
+            "written": written,
+            "shards": shards,
+        }
+        _write_atomic(
+            index_name, json.dumps(index, indent=2).encode("utf-8") + b"\n"
+        )
+        current = {shard["filename"] for shard in shards}
+        for shard in previous.get("shards", []):
+            if shard.get("filename") not in current:
+                stale = os.path.join(folder, shard["filename"])
+                for name in (stale, stale + ".sha256"):
+                    if os.path.exists(name):
+                        os.remove(name)
+        return index
+
+    def _iter_shards(self, max_slides, max_bytes):
+        """Encodes the templates and groups them into shards.
+
+        Yields
+        ------
+        tuple
+            The encoded templates of a shard, and the index of its first
+            template.
+        """
+        separator = self.backend.separator
+        pages, size, first = [], 1, 0
+        for i, page in enumerate(self._pages):
+            chunks = [self.backend.template_start(page["template"])]
+            for j, entry in enumerate(page["data"]):
+                if j:
+                    chunks.append(separator)
+                chunks.append(self._encode(entry))
+            chunks.append(b"]}")
+            encoded = b"".join(chunks)
+
+            added = len(encoded) + (len(separator) if pages else 0)
+            if pages and (
+                (max_slides is not None and len(pages) >= max_slides)
+                or (max_bytes is not None and size + added + 1 > max_bytes)
+            ):
+                yield pages, first
+                pages, size, first = [], 1, i
+                added = len(encoded)
+            pages.append(encoded)
+            size += added
+        yield pages, first
+
+    def _save_if_changed(self, filename, chunks):
+        """Writes `filename` atomically, unless it has the same content.
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was unchanged.
+        """
+        content = b"".join(chunks)
+        digest = hashlib.sha256(content).hexdigest()
+        sidecar = filename + ".sha256"
+
+        if _stored_hash(filename, sidecar, len(content)) == digest:
+            return False
+
+        _write_atomic(filename, content)
+        _write_atomic(sidecar, f"{digest}\n".encode())
+        return True
+
+
+def _row_lengths(data):
+    """Returns the set of the lengths of the data lists of a chart."""
+    if isinstance(data, set):
+        return data
+    shape = getattr(data, "shape", None)
+    if shape is None:
+        return set(map(len, data))
+    if len(shape) != 2:
+        raise ValueError(
+            f"Your data should be a list of lists or a two-dimensional array, not an array of shape {shape}."
+        )
+    return {shape[1]}
+
+
+def _stored_hash(filename, sidecar, size):
+    """Returns the hash of the content of an existing `.ppttc` file.
+
+    The hash is read from the sidecar file when it is more recent than the
+    file, and computed from the file otherwise.
+
+    Returns
+    -------
+    str or None
+        The hexadecimal digest, or None if the file does not exist or does
+        not have the expected size.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+
+    if stat.st_size != size:
+        return None
+
+    try:
+        if os.stat(sidecar).st_mtime_ns >= stat.st_mtime_ns:
+            with open(sidecar) as infile:
+                return infile.read().strip()
+    except FileNotFoundError:
+        pass
+
+    with open(filename, "rb") as infile:
+        return hashlib.sha256(infile.read()).hexdigest()
+
+
+def _read_index(filename):
+    """Returns the content of a shard index, or an empty dict."""
+    try:
+        with open(filename, encoding="utf-8") as infile:
+            index = json.load(infile)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _until_cancelled(chunks, cancel):
+    """Yields the `chunks` until the `cancel` event is set."""
+    for chunk in chunks:
+        if cancel.is_set():
+            raise CancelledError("The save was cancelled.")
+        yield chunk
+
+
+def _write_temporary(filename, content):
+    """Writes `content` to a new temporary file next to `filename`.
+
+    `content` is either bytes or an iterable of bytes.
+
+    Returns
+    -------
+    str
+        The name of the temporary file.
+    """
+    temporary = f"{filename}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temporary, "xb") as outfile:
+            if isinstance(content, bytes):
+                outfile.write(content)
+            else:
+                outfile.writelines(content)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return temporary
+
+
+def _write_atomic(filename, content):
+    """Writes `content` to a temporary file, then moves it to `filename`.
+
+    `content` is either bytes or an iterable of bytes.
+    """
+    temporary = _write_temporary(filename, content)
+    try:
+        os.replace(temporary, filename)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _write_shard(filename, content, digest, skip_unchanged):
+    """Writes one shard of `save_sharded` to a temporary file.
+
+    With `skip_unchanged`, nothing is written if the shard on disk has the
+    same content, and the hash of a changed shard is written alongside it,
+    see `Thinkcell._save_if_changed`.
+
+    Returns
+    -------
+    list
+        The `(temporary, filename)` pairs of the files to move into place,
+        empty if the shard did not change.
+    """
+    sidecar = filename + ".sha256"
+    if skip_unchanged:
+        if _stored_hash(filename, sidecar, len(content)) == digest:
+            return []
+    moves = [(_write_temporary(filename, content), filename)]
+    if skip_unchanged:
+        try:
+            hashed = _write_temporary(sidecar, f"{digest}\n".encode())
+        except BaseException:
+            _remove_temporaries(moves)
+            raise
+        moves.append((hashed, sidecar))
+    return moves
+
+
+def _remove_temporaries(moves):
+    """Removes the temporary files of `_write_shard` that were not moved."""
+    for temporary, _ in moves:
+        if os.path.exists(temporary):
+            os.remove(temporary)